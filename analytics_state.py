@@ -0,0 +1,52 @@
+# analytics_state.py
+
+import json
+import os
+import pandas as pd
+
+# Remembers a fingerprint of every (Meet, Session, Level) group in session_raw_data.csv
+# so session_context_analytics only recomputes the sessions that changed since last run.
+STATE_FILE = "analytics_state.json"
+SESSION_KEYS = ['Meet', 'Session', 'Level']
+
+def session_fingerprints(df):
+    """
+    {(Meet, Session, Level): fingerprint} for every session group in df.
+    Each row is hashed once (vectorized) and the hashes are summed per group, so the
+    fingerprint doesn't care about row order but changes if any cell in the group does.
+    """
+    row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy().view('int64')
+    keyed = df[SESSION_KEYS].assign(_hash=row_hash, _rows=1)
+    sums = keyed.groupby(SESSION_KEYS, sort=True).agg(h=('_hash', 'sum'), n=('_rows', 'sum'))
+    return {key: f"{h & 0xFFFFFFFFFFFFFFFF:016x}-{n}" for key, h, n in
+            zip(sums.index, sums['h'].to_numpy().tolist(), sums['n'].to_numpy().tolist())}
+
+def load_state(path=STATE_FILE, version=1, settings=None):
+    """Loads the last run's fingerprints. A missing/corrupt file or changed settings starts fresh."""
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == version and state.get('settings') == settings:
+                state['sessions'] = {tuple(k): h for *k, h in state['sessions']}
+                return state
+            print("ℹ️ Analytics settings changed since last run. Recomputing everything.")
+        except (OSError, ValueError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable analytics state: {e}")
+    return {'version': version, 'settings': settings, 'sessions': {}}
+
+def save_state(state, fingerprints, path=STATE_FILE):
+    # Write to a temp file first so a crash never leaves half a state file behind
+    out = {'version': state['version'], 'settings': state['settings'],
+           'sessions': [[*key, h] for key, h in sorted(fingerprints.items())]}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(out, f, indent=1)
+    os.replace(tmp_path, path)
+
+def dirty_sessions(state, fingerprints):
+    """Session groups that are new, changed or gone since the state was saved"""
+    old = state['sessions']
+    changed = {key for key, h in fingerprints.items() if old.get(key) != h}
+    removed = set(old) - set(fingerprints)
+    return changed | removed
@@ -2,18 +2,43 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
+import dashboard_data
 
-def create_context_chart(row, theme_color="#FF4B4B"):
+# Figures are cached on the numbers they draw and the colour, so a rerun (or another
+# session looking at the same meet) reuses the built figure instead of re-validating
+# every trace. Cached figures are shared: draw them, never update them in place.
+FIGURE_CACHE_SIZE = 256
+# The bullet charts' score axis; AA totals don't fit it, so they keep their own card chart
+SCORE_RANGE = [7.0, 10.0]
+
+def fmt(value, spec, unit=""):
+    """value formatted with `spec` (plus `unit`), or "—" when it's missing (a session of one has no one else to compare against)"""
+    return "—" if pd.isna(value) else format(value, spec) + unit
+
+def chart_values(row):
+    """(score, session min, session max, division min, division max, division median) for one event row"""
+    # Older analytics files have no Min columns, so the bars start at the axis floor;
+    # without Division columns the session's numbers stand in
+    sess_min = row.get('Session_Min', SCORE_RANGE[0])
+    return tuple(float(v) for v in (
+        row['Score'], sess_min, row['Session_Max'],
+        row.get('Division_Min', sess_min), row.get('Division_Max', row['Session_Max']),
+        row.get('Division_Median', row['Session_Median'])))
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def bullet_chart(labels, values, theme_color):
     """
-    Creates the Layered Horizontal Bullet Chart for a gymnastics event.
+    Layered horizontal bullet charts, one row per label, on a single shared score axis.
     """
+    scores, sess_min, sess_max, div_min, div_max, median = (list(v) for v in zip(*values))
+    labels = list(labels)
     fig = go.Figure()
 
     # Layer 1: Session Range (The full competitive field)
     fig.add_trace(go.Bar(
-        y=["Score"], 
-        x=[row['Session_Max'] - 7.0], 
-        base=7.0,
+        y=labels, 
+        x=[hi - lo for lo, hi in zip(sess_min, sess_max)], 
+        base=sess_min,
         orientation='h', 
         marker_color='#E0E0E0', 
         name='Full Session Range',
@@ -22,12 +47,10 @@ def create_context_chart(row, theme_color="#FF4B4B"):
     ))
 
     # Layer 2: Division Range (The age group specific field)
-    # If Division_Max isn't in your CSV, it falls back to Session_Max
-    div_max = row.get('Division_Max', row['Session_Max'])
     fig.add_trace(go.Bar(
-        y=["Score"], 
-        x=[div_max - 7.0], 
-        base=7.0,
+        y=labels, 
+        x=[hi - lo for lo, hi in zip(div_min, div_max)], 
+        base=div_min,
         orientation='h', 
         marker_color=theme_color, 
         name='Age Division Range',
@@ -36,8 +59,8 @@ def create_context_chart(row, theme_color="#FF4B4B"):
 
     # Marker 1: The Child's Score (The Gold Star)
     fig.add_trace(go.Scatter(
-        x=[row['Score']], 
-        y=["Score"], 
+        x=scores, 
+        y=labels, 
         mode='markers',
         marker=dict(symbol='star', size=18, color='gold', line=dict(width=2, color='DarkSlateGrey')),
         name='Score'
@@ -45,47 +68,74 @@ def create_context_chart(row, theme_color="#FF4B4B"):
 
     # Marker 2: The Division Median (The White Line)
     fig.add_trace(go.Scatter(
-        x=[row['Session_Median']], 
-        y=["Score"], 
+        x=median, 
+        y=labels, 
         mode='markers',
         marker=dict(symbol='line-ns-open', size=25, color='white', line=dict(width=3)),
         name='Median'
     ))
 
     # Clean up the visual appearance
+    one_row = len(labels) == 1
     fig.update_layout(
         paper_bgcolor='rgba(0,0,0,0)', 
         plot_bgcolor='rgba(0,0,0,0)',
         showlegend=False, 
         margin=dict(l=0, r=0, t=0, b=0),
-        height=120, 
-        xaxis=dict(range=[7.0, 10.0], showgrid=False, zeroline=False),
-        yaxis=dict(showticklabels=False)
+        height=120 if one_row else 60 * len(labels) + 40, 
+        xaxis=dict(range=SCORE_RANGE, showgrid=False, zeroline=False),
+        yaxis=dict(showticklabels=not one_row, autorange='reversed')
     )
     return fig
 
+def create_context_chart(row, theme_color="#FF4B4B"):
+    """
+    Creates the Layered Horizontal Bullet Chart for a gymnastics event.
+    """
+    return bullet_chart(("Score",), (chart_values(row),), theme_color)
+
+def create_meet_chart(meet_rows, theme_color="#FF4B4B"):
+    """
+    Every event of a meet as one figure: a bullet chart per event, sharing one score axis
+    and one layout, so the page carries a single figure instead of one per card.
+    """
+    events = meet_rows[meet_rows['Event'] != 'AA']
+    if events.empty:
+        return None
+    return bullet_chart(tuple(events['Event']), tuple(chart_values(row) for _, row in events.iterrows()), theme_color)
+
 def show_athlete_history(gymnast_name):
     """
     Renders the meet history and the interactive context cards for a child.
     """
-    # Load the analytics data we generated
-    try:
-        df = pd.read_csv("session_context_analytics.csv")
-    except FileNotFoundError:
+    # Load the analytics data we generated (cached until the file changes, see dashboard_data.py)
+    df = dashboard_data.load('analytics')
+    if df is None:
         st.error("Missing 'session_context_analytics.csv'. Please ensure the file is in your folder.")
         return
+    st.caption(dashboard_data.refreshed_caption('analytics'))
 
-    # Filter for the specific child
-    # Note: We use a 'contains' check to handle names like 'Ansel Sheehy'
-    child_data = df[df['Gymnast'].str.contains(gymnast_name.split()[0], case=False)].copy()
-    
-    if child_data.empty:
+    if dashboard_data.athlete(gymnast_name, 'analytics') is None:
         st.warning(f"No 2026 data found for {gymnast_name}.")
         return
+    meet_explorer(gymnast_name)
+
+# Fragments: picking a meet reruns meet_explorer alone, and flipping a card reruns that
+# one card, instead of the whole app (every tab, metric and chart) each time
+@st.fragment
+def meet_explorer(gymnast_name):
+    """
+    The meet selector, judge mood and the grid of cards for the chosen meet.
+    """
+    # The child's rows, looked up by canonical id ('Ansel' and 'Ansel Sheehy' are the same athlete)
+    view = dashboard_data.athlete(gymnast_name, 'analytics')
+    if view is None:
+        return
+    child_data = view.rows
 
     # 1. Navigation: Select Meet
-    all_meets = child_data['Meet'].unique()
-    selected_meet = st.selectbox("📅 Which meet would you like to explore?", all_meets)
+    all_meets = view.meets
+    selected_meet = st.selectbox("📅 Which meet would you like to explore?", all_meets, key=f"meet_{gymnast_name}", persist_state="page")
     
     meet_rows = child_data[child_data['Meet'] == selected_meet]
     
@@ -96,35 +146,63 @@ def show_athlete_history(gymnast_name):
     elif avg_jsi >= 0.15:
         st.success(f"☀️ **Judge Mood:** Significantly Looser than Average (JSI: {avg_jsi:.2f})")
     else:
-        st.info(f"☁️ **Judge Mood:** Typical Scoring Environment (JSI: {avg_jsi:.2f})")
+        st.info(f"☁️ **Judge Mood:** Typical Scoring Environment (JSI: {fmt(avg_jsi, '.2f')})")
+
+    # All events at a glance: one figure for the meet, and the cards skip their own charts
+    batched = st.toggle("📊 All events in one chart", key=f"batch_{gymnast_name}", persist_state="page")
+    if batched:
+        chart = create_meet_chart(meet_rows)
+        if chart is not None:
+            st.plotly_chart(chart, width='stretch', config={'displayModeBar': False})
 
     # 3. Build the Grid of Cards
     # On an iPhone, this will stack vertically
-    for idx, (index, row) in enumerate(meet_rows.iterrows()):
-        state_key = f"flip_{gymnast_name}_{selected_meet}_{row['Event']}"
-        if state_key not in st.session_state:
-            st.session_state[state_key] = False
+    for _, row in meet_rows.iterrows():
+        context_card(gymnast_name, row, show_chart=not batched or row['Event'] == 'AA')
+
+@st.fragment
+def context_card(gymnast_name, row, show_chart=True):
+    """
+    One event's card: the score on the front, and on the back the context chart, which
+    is only built once the card is flipped (and not at all when the meet chart shows it).
+    """
+    state_key = f"flip_{gymnast_name}_{row['Meet']}_{row['Event']}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = False
+
+    with st.container(border=True):
+        if not st.session_state[state_key]:
+            # FRONT OF CARD
+            c1, c2 = st.columns([2, 1])
+            with c1:
+                st.subheader(row['Event'])
+            with c2:
+                st.button("Context 🔍", key=f"btn_{state_key}", on_click=lambda k=state_key: st.session_state.update({k: True}))
+            
+            st.markdown(f"<h1 style='text-align: center; color: #FF4B4B;'>{row['Score']:.3f}</h1>", unsafe_allow_html=True)
+        else:
+            # BACK OF CARD (The Analysis)
+            st.subheader(f"{row['Event']} Performance Analysis")
             
-        with st.container(border=True):
-            if not st.session_state[state_key]:
-                # FRONT OF CARD
-                c1, c2 = st.columns([2, 1])
-                with c1:
-                    st.subheader(row['Event'])
-                with c2:
-                    st.button("Context 🔍", key=f"btn_{state_key}", on_click=lambda k=state_key: st.session_state.update({k: True}))
-                
-                st.markdown(f"<h1 style='text-align: center; color: #FF4B4B;'>{row['Score']:.3f}</h1>", unsafe_allow_name=True)
-            else:
-                # BACK OF CARD (The Analysis)
-                st.subheader(f"{row['Event']} Performance Analysis")
-                
-                # Show the chart
+            # Show the chart
+            if show_chart:
                 chart = create_context_chart(row)
-                st.plotly_chart(chart, use_container_width=True, config={'displayModeBar': False})
-                
-                # The Insight Sentence
-                st.write(f"**Insight:** Beating **{row['Percentile']:.0f}%** of the field.")
-                st.caption(f"Context: Session of {int(row['Count'])} Level {row['Level']} athletes.")
-                
-                st.button("Back to Score", key=f"back_{state_key}", on_click=lambda k=state_key: st.session_state.update({k: False}))
+                st.plotly_chart(chart, width='stretch', config={'displayModeBar': False})
+            
+            # The Insight Sentence
+            st.write(f"**Insight:** Beating **{fmt(row['Percentile'], '.0f', '%')}** of the field.")
+            st.caption(f"Context: Session of {int(row.get('Session_Count', row.get('Count')))} Level {row['Level']} athletes.")
+
+            # Dynamic Rank + what it takes to podium, straight from the sorted session index
+            index = dashboard_data.load('score_index') if 'Session' in row else None
+            if index is not None:
+                where = (row['Meet'], str(row['Session']), str(row['Level']), row['Event'])
+                placed = index.rank(*where, row['Score'])
+                if placed:
+                    rank, tied, field = placed
+                    st.write(f"**Session Rank:** {rank}{'T' if tied else ''} of {field}")
+                    podium = index.score_needed(*where, 3)
+                    if podium is not None and rank > 3:
+                        st.caption(f"Podium (3rd) took a {podium:.3f}.")
+            
+            st.button("Back to Score", key=f"back_{state_key}", on_click=lambda k=state_key: st.session_state.update({k: False}))
@@ -1,9 +1,9 @@
-import pandas as pd
-import cloudscraper
 from bs4 import BeautifulSoup
 import re
-import os
+import argparse
 from datetime import datetime
+import sqlite_store
+import http_client
 
 # URL for Ansel's specific session
 URL = "https://meetscoresonline.com/results/36104/1306508"
@@ -18,11 +18,10 @@ def clean_score(val):
 
 def scrape_ansel_direct():
     print(f"🚀 Attempting direct text scrape for Ansel...")
-    scraper = cloudscraper.create_scraper()
     
     try:
         # Get the full page HTML
-        response = scraper.get(URL)
+        response = http_client.get_client().get(URL)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # FIND ANSEL: Look for any HTML element containing "Ansel"
@@ -80,24 +79,16 @@ def scrape_ansel_direct():
         }
         new_record.update(scores)
         
-        # APPEND TO CSV
-        csv_file = "cleaned_gymnastics.csv"
-        if os.path.exists(csv_file):
-            history = pd.read_csv(csv_file)
-            new_df = pd.DataFrame([new_record])
-            
-            # Align columns
-            for col in history.columns:
-                if col not in new_df.columns:
-                    new_df[col] = 0.0 if 'Rank' not in col else ""
-            
-            # Save
-            updated = pd.concat([history, new_df], ignore_index=True)
-            updated.to_csv(csv_file, index=False)
-            print("✅ Ansel added to CSV!")
+        # SAVE (a re-run merges into the same row instead of appending another)
+        sqlite_store.upsert([new_record], 'cleaned')
+        sqlite_store.publish('cleaned')
+        print("✅ Ansel added to CSV!")
 
     except Exception as e:
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrapes Ansel's row from the MSO meet page text")
+    http_client.add_fetch_args(parser)
+    http_client.configure_from(parser.parse_args())
     scrape_ansel_direct()
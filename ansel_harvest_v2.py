@@ -1,7 +1,6 @@
 import pandas as pd
-from bs4 import BeautifulSoup
-import json
 import os
+from mso_json import session_rows
 
 # Configuration - Updated path to look in the subfolder
 FOLDER = "ansel_history"
@@ -24,34 +23,26 @@ def main():
         return
 
     print(f"🚀 Parsing {FULL_PATH}...")
-    with open(FULL_PATH, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
+    with open(FULL_PATH, "rb") as f:
+        raw = f.read()
 
     # MSO stores the full session data in a JSON blob inside a script tag
     found_data = False
-    for script in soup.find_all("script"):
-        if script.string and "wbt.MeetInfo.Session" in script.string:
-            try:
-                # Isolate the JSON data from the Javascript variable
-                start = script.string.find('wbt.MeetInfo.Session=') + len('wbt.MeetInfo.Session=')
-                end = script.string.find('};', start) + 1
-                json_data = json.loads(script.string[start:end])
-                
-                # Extract the row data
-                rows = json_data['result']['row']
-                df = pd.DataFrame(rows)
-                
-                # Filter specifically for Level 4D1
-                # (This ensures we get the 152 athletes you are expecting)
-                df_4d1 = df[df['level'] == '4D1'].copy()
-                
-                df_4d1.to_csv(OUTPUT_CSV, index=False)
-                print(f"✅ Success! Found {len(df_4d1)} athletes for Level 4D1.")
-                print(f"💾 Saved to {OUTPUT_CSV}")
-                found_data = True
-                break
-            except Exception as e:
-                print(f"⚠️ Extraction error: {e}")
+    try:
+        rows = session_rows(raw)
+        if rows:
+            df = pd.DataFrame(rows)
+            
+            # Filter specifically for Level 4D1
+            # (This ensures we get the 152 athletes you are expecting)
+            df_4d1 = df[df['level'] == '4D1'].copy()
+            
+            df_4d1.to_csv(OUTPUT_CSV, index=False)
+            print(f"✅ Success! Found {len(df_4d1)} athletes for Level 4D1.")
+            print(f"💾 Saved to {OUTPUT_CSV}")
+            found_data = True
+    except Exception as e:
+        print(f"⚠️ Extraction error: {e}")
 
     if not found_data:
         print("❌ Could not extract the session data from the file.")
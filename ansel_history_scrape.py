@@ -1,19 +1,19 @@
-import pandas as pd
-import cloudscraper
 from bs4 import BeautifulSoup
 import re
-import os
+import argparse
 from datetime import datetime
-import time
+from mso_page import parse_mso_page
+import sqlite_store
+import http_client
 
 # Ansel's Athlete ID
 ATHLETE_ID = "1306508"
 PROFILE_URL = f"https://www.meetscoresonline.com/Athlete.MyScores/{ATHLETE_ID}"
 
-def get_meet_links(scraper):
+def get_meet_links(client):
     """Scrapes the main profile to find all meet URLs"""
     print(f"🔍 Visiting Profile: {PROFILE_URL}")
-    response = scraper.get(PROFILE_URL)
+    response = client.get(PROFILE_URL)
     soup = BeautifulSoup(response.text, 'html.parser')
     
     meet_links = []
@@ -37,77 +37,25 @@ def clean_rank_text(text):
     match = re.search(r"(\d+)", str(text))
     return match.group(1) if match else ""
 
-def scrape_single_meet(scraper, url):
-    """Scrapes one specific meet page for scores AND Meet Rank"""
+def scrape_single_meet(url, response):
+    """Reads one fetched meet page for scores AND Meet Rank"""
     print(f"   👉 Scraping meet: {url}")
+    if response is None:
+        return None
     try:
-        response = scraper.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 1. EXTRACT SCORES (using the table logic we found earlier)
-        scores = {}
-        table = soup.find('table', class_='table-condensed')
-        if table:
-            for row in table.find_all('tr'):
-                th = row.find('th')
-                td = row.find('td')
-                if th and td:
-                    evt = th.get_text(strip=True)
-                    score_span = td.find('span', class_='score')
-                    rank_span = td.find('span', class_='place')
-                    
-                    if score_span:
-                        val = float(score_span.get_text(strip=True))
-                        rank = rank_span.get_text(strip=True) if rank_span else ""
-                        
-                        # Map standard men's events
-                        map_evt = {'Floor':'FX', 'Pommel':'PH', 'Rings':'SR', 'Vault':'VT', 'PBars':'PB', 'HiBar':'HB', 'AA':'AA'}
-                        if evt in map_evt:
-                            code = map_evt[evt]
-                            scores[code] = val
-                            scores[code+'_Rank'] = rank
-        
-        # 2. EXTRACT MEET RANKING ("36th out of 152")
-        # Look for: <li class="text-center">Meet Ranking <span class="bold fs-2">36<sup>th</sup></span>
-        meet_rank = ""
-        meet_total = ""
-        
-        # Find the list item containing "Meet Ranking"
-        for li in soup.find_all('li'):
-            if "Meet Ranking" in li.get_text():
-                # Get the rank (inside the span)
-                rank_span = li.find('span', class_='bold')
-                if rank_span:
-                    meet_rank = clean_rank_text(rank_span.get_text())
-                
-                # Get the total (inside the 'i' tag usually: "Out of 152")
-                italics = li.find('i')
-                if italics:
-                    total_text = italics.get_text() # "Out of 152 Level 4D1s"
-                    match_total = re.search(r"Out of (\d+)", total_text)
-                    if match_total:
-                        meet_total = match_total.group(1)
-                break
-
-        # 3. EXTRACT METADATA (Date, Meet Name)
-        meet_name = "Unknown Meet"
-        meet_date = datetime.now().strftime('%Y-%m-%d')
+        page = parse_mso_page(response.content)
         
-        # Try to find date/name in title or header
-        if soup.title:
-            # Title often: "Ansel Sheehy - 2026 Mas Watanabe, CA 02/13/2026 - ..."
-            title_text = soup.title.get_text()
-            parts = title_text.split(' - ')
-            if len(parts) >= 3:
-                meet_name = parts[1].split(',')[0].strip() # "2026 Mas Watanabe"
-                # Date extraction can be tricky, let's look for a date format
-                date_match = re.search(r"(\d{2}/\d{2}/\d{4})", title_text)
-                if date_match:
-                    meet_date = datetime.strptime(date_match.group(1), '%m/%d/%Y').strftime('%Y-%m-%d')
+        # 1. SCORES + 2. MEET RANKING ("36th out of 152") come from the shared MSO parser
+        # 3. METADATA (Date, Meet Name) from the title:
+        #    "Ansel Sheehy - 2026 Mas Watanabe, CA 02/13/2026 - ..."
+        meet_name = page['meet'] or "Unknown Meet"
+        meet_date = page['date'] or datetime.now().strftime('%Y-%m-%d')
 
         return {
-            'scores': scores,
-            'meta': {'Meet': meet_name, 'Date': meet_date, 'Meet_Rank': meet_rank, 'Meet_Rank_Total': meet_total}
+            'scores': page['scores'],
+            'meta': {'Meet': meet_name, 'Date': meet_date,
+                     'Meet_Rank': clean_rank_text(page['meet_rank']),
+                     'Meet_Rank_Total': page['meet_rank_total']}
         }
 
     except Exception as e:
@@ -115,10 +63,10 @@ def scrape_single_meet(scraper, url):
         return None
 
 def main():
-    scraper = cloudscraper.create_scraper()
+    client = http_client.get_client()
     
     # 1. Get List of Meets
-    links = get_meet_links(scraper)
+    links = get_meet_links(client)
     
     # MANUAL FALLBACK: If the profile scraper fails (returns 0 links), 
     # paste the URLs you know here.
@@ -132,17 +80,11 @@ def main():
 
     print(f"📋 Found {len(links)} meets to scrape.")
     
-    csv_file = "cleaned_gymnastics.csv"
-    if os.path.exists(csv_file):
-        history = pd.read_csv(csv_file)
-    else:
-        history = pd.DataFrame()
-
     new_rows = []
 
-    # 2. Loop through each meet
-    for link in links:
-        data = scrape_single_meet(scraper, link)
+    # 2. Fetch every meet at once (the client's rate limit keeps us polite to the server)
+    for link, response in zip(links, client.fetch_many(links)):
+        data = scrape_single_meet(link, response)
         if data and data['scores']:
             # Build the row
             record = {
@@ -156,26 +98,17 @@ def main():
             }
             record.update(data['scores'])
             new_rows.append(record)
-            time.sleep(2) # Be polite to the server
             
-    # 3. Save to CSV
+    # 3. Save (same gymnast, same meet merges into the old row), then refresh the CSV
     if new_rows:
-        new_df = pd.DataFrame(new_rows)
-        # Combine
-        updated_history = pd.concat([history, new_df], ignore_index=True)
-        
-        # Clean up duplicates (same gymnast, same meet)
-        updated_history.drop_duplicates(subset=['Gymnast', 'Meet', 'AA'], keep='last', inplace=True)
-        
-        # Ensure all columns exist
-        for col in updated_history.columns:
-            if col not in updated_history.columns:
-                updated_history[col] = 0.0
-
-        updated_history.to_csv(csv_file, index=False)
+        sqlite_store.upsert(new_rows, 'cleaned')
+        sqlite_store.publish('cleaned')
         print(f"🎉 Successfully scraped {len(new_rows)} meets for Ansel!")
     else:
         print("❌ No data scraped.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrapes Ansel's MSO meet history into the store")
+    http_client.add_fetch_args(parser)
+    http_client.configure_from(parser.parse_args())
     main()
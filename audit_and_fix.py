@@ -1,68 +1,51 @@
 import pandas as pd
-import cloudscraper
-from bs4 import BeautifulSoup
 import os
-import re
+import argparse
+from parallel_ingest import parse_files
+from mso_page import parse_mso_page, athlete_meta
+from dedup import canonical_athlete, canonical_meet
+import sqlite_store
+import http_client
 
 CSV_FILE = "cleaned_gymnastics.csv"
 HTML_FOLDER = "ansel_history"
 
 def get_rank_from_mso(url):
     """Attempts to scrape Meet Rank from a live MSO URL"""
-    scraper = cloudscraper.create_scraper()
     try:
         print(f"🌐 Scraping MSO: {url}")
-        response = scraper.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        meet_rank, meet_total = "", ""
-        for li in soup.find_all('li'):
-            if "Meet Ranking" in li.get_text():
-                rank_span = li.find('span', class_='bold')
-                if rank_span:
-                    meet_rank = re.sub(r'\D', '', rank_span.get_text())
-                italics = li.find('i')
-                if italics:
-                    match = re.search(r"Out of (\d+)", italics.get_text())
-                    if match:
-                        meet_total = match.group(1)
-                break
-        return meet_rank, meet_total
+        response = http_client.get_client().get(url)
+        page = parse_mso_page(response.content)
+        return page['meet_rank'], page['meet_rank_total']
     except Exception as e:
         print(f"   ⚠️ Scrape failed: {e}")
         return None, None
 
-def get_meta_from_html(folder):
+def get_meta_from_file(file_path):
+    """Parses one local HTML file. Returns ((athlete, meet) natural key, {Level, Div, Sess}) or None."""
+    with open(file_path, 'rb') as f:
+        page = parse_mso_page(f.read())
+
+    # Extract identity
+    gymnast = "Ansel" if "Ansel" in page['title'] else None
+    if not gymnast: return None
+
+    meet_name = page['meet']
+
+    # Extract Meta ("4D1" stays whole; blank where the page doesn't say)
+    return (canonical_athlete(gymnast), canonical_meet(meet_name)), athlete_meta(page['labels'])
+
+def get_meta_from_html(folder, workers=1):
     """Parses local HTML files to find Level, Div, Session for Ansel"""
-    meta_map = {} # Maps (Gymnast, Meet) -> {Level, Div, Sess}
-    for filename in os.listdir(folder):
-        if filename.endswith(".html"):
-            with open(os.path.join(folder, filename), 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
-                
-                # Extract identity
-                gymnast = "Ansel" if "Ansel" in soup.title.get_text() else None
-                if not gymnast: continue
-                
-                meet_name = soup.title.get_text().split(' - ')[1].split(',')[0].strip()
-                
-                # Extract Meta
-                level, division, session = "", "", ""
-                for li in soup.find_all('li'):
-                    text = li.get_text(strip=True)
-                    if "Level:" in text:
-                        val = text.replace("Level:", "").strip()
-                        if "D" in val:
-                            parts = val.split('D', 1)
-                            level, division = parts[0], "D" + parts[1]
-                        else: level = val
-                    if "Session:" in text: session = text.replace("Session:", "").strip()
-                    if "Division:" in text: division = text.replace("Division:", "").strip()
-                
-                meta_map[(gymnast, meet_name)] = {'Level': level, 'Division': division, 'Session': session}
+    meta_map = {} # Maps canonical (Gymnast, Meet) -> {Level, Div, Sess}
+    file_paths = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".html")]
+    for _, result in parse_files(get_meta_from_file, file_paths, workers=workers):
+        if result:
+            key, meta = result
+            meta_map[key] = meta
     return meta_map
 
-def main():
+def main(workers=1):
     if not os.path.exists(CSV_FILE):
         print("❌ CSV not found.")
         return
@@ -86,16 +69,16 @@ def main():
                 df.at[i, 'Meet_Rank_Total'] = total
 
     # --- PART 2: FIX ROWS 18-25 (Ansel Metadata from HTML) ---
-    local_meta = get_meta_from_html(HTML_FOLDER)
+    local_meta = get_meta_from_html(HTML_FOLDER, workers=workers)
     for i in range(17, 25): # Indices 17 to 24
         if i < len(df):
-            gymnast = df.at[i, 'Gymnast']
-            meet = df.at[i, 'Meet']
-            if (gymnast, meet) in local_meta:
-                meta = local_meta[(gymnast, meet)]
-                df.at[i, 'Level'] = meta['Level']
-                df.at[i, 'Division'] = meta['Division']
-                df.at[i, 'Session'] = meta['Session']
+            # "Ansel Sheehy" / "Stanford Open 2026" rows match the page's "Ansel" / "2026 Stanford Open"
+            key = (canonical_athlete(df.at[i, 'Gymnast']), canonical_meet(df.at[i, 'Meet']))
+            if key in local_meta:
+                # Only what the page actually gives; a blank never wipes the stored value
+                for col, value in local_meta[key].items():
+                    if value:
+                        df.at[i, col] = value
 
     # --- PART 3: AUDIT & SAVE ---
     print("\n--- 🔍 AUDIT RESULTS ---")
@@ -110,8 +93,16 @@ def main():
     if not changes_found:
         print("ℹ️ No changes needed. CSV matches requirements.")
     else:
-        df.to_csv(CSV_FILE, index=False)
+        # The store is the source of truth, so the fixed table goes there and the CSV is regenerated
+        sqlite_store.replace(df, 'cleaned')
+        sqlite_store.publish('cleaned')
         print(f"\n🎉 Successfully updated and saved to {CSV_FILE}.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Audit and backfill cleaned_gymnastics.csv")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parallel parser processes for the local HTML scan (0 = one per CPU core)")
+    http_client.add_fetch_args(parser)
+    args = parser.parse_args()
+    http_client.configure_from(args)
+    main(workers=args.workers)
@@ -0,0 +1,201 @@
+# bench_dashboard_reruns.py
+
+import os
+import io
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+import numpy as np
+import requests
+from websockets.sync.client import connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+import event_names
+import synthetic_season
+import session_context_analytics
+
+# Rerun latency of the analytics tab's interactions, measured against a real
+# `streamlit run` server over its websocket, driven the way the browser drives it:
+# open Ansel's "Judge Context" view on a synthetic season, then flip every card of a
+# meet with all six men's events ("Context 🔍" then "Back to Score") and switch meets.
+# Each click is sent twice: as a full-script rerun (what every click cost before the
+# cards were fragments) and scoped to the fragment the widget lives in (what the
+# browser sends now). Switching between the gymnast tabs, which only draws the open
+# one, is timed too. Latency is from sending the click to the server's script_finished.
+APP = "streamlit_app.py"
+PORT = 8851
+GYMNAST = "Ansel"
+# streamlit_app.GYMNASTS' tab labels
+TABS = ["Annabelle", "Azalea", "Ansel"]
+STARTUP_TIMEOUT = 60
+
+def write_data(folder, sessions, athletes, seed):
+    """A synthetic season and its session_context_analytics.csv in `folder`"""
+    synthetic_season.write_season(folder, sessions, athletes, seed)
+    repo = os.getcwd()
+    saved = sys.argv
+    try:
+        os.chdir(folder)
+        sys.argv = ["session_context_analytics.py", "--full"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            session_context_analytics.main()
+    finally:
+        os.chdir(repo)
+        sys.argv = saved
+
+def start_server(app, folder, port):
+    """`streamlit run app` with `folder` as its working directory, once it answers health checks"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.abspath(app), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=folder, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                return server
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    server.kill()
+    raise RuntimeError(f"streamlit didn't come up on port {port}")
+
+def bool_state(widget_id, value):
+    return WidgetState(id=widget_id, bool_value=value)
+
+def trigger(widget_id):
+    return WidgetState(id=widget_id, trigger_value=True)
+
+def string_state(widget_id, value):
+    return WidgetState(id=widget_id, string_value=value)
+
+class BrowserSession:
+    """One browser tab's websocket: send a rerun, wait for it to finish, keep the widgets it drew"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        # widget key -> (widget id, fragment id or '')
+        self.widgets = {}
+        # selectbox key -> its options
+        self.options = {}
+
+    def rerun(self, widgets=(), fragment_id=""):
+        """Seconds from sending the rerun to script_finished"""
+        back = BackMsg()
+        back.rerun_script.widget_states.widgets.extend(widgets)
+        if fragment_id:
+            back.rerun_script.fragment_id = fragment_id
+        start = time.perf_counter()
+        self.ws.send(back.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(self.ws.recv())
+            kind = msg.WhichOneof('type')
+            if kind == 'script_finished':
+                return time.perf_counter() - start
+            if kind != 'delta' or msg.delta.WhichOneof('type') not in ('new_element', 'add_block'):
+                continue
+            # Widgets are elements, except st.tabs, which is a block
+            element = getattr(msg.delta, msg.delta.WhichOneof('type'))
+            widget = getattr(element, element.WhichOneof('type'))
+            widget_id = getattr(widget, 'id', '')
+            if widget_id.startswith("$$ID-"):
+                # Keyed widget ids end in their key
+                key = widget_id.split("-", 2)[2]
+                self.widgets[key] = (widget_id, msg.delta.fragment_id)
+                if element.WhichOneof('type') == 'selectbox':
+                    self.options[key] = list(widget.options)
+
+def percentiles(latencies):
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    return f"p50 {p50:7.1f}  p95 {p95:7.1f}  max {max(latencies) * 1000:7.1f} ms"
+
+def flip_cards(session, base, cards, scoped):
+    """Flips every card over and back; (seconds per click)"""
+    latencies = []
+    for card in cards:
+        for button in (f"btn_{card}", f"back_{card}"):
+            widget_id, fragment_id = session.widgets[button]
+            latencies.append(session.rerun(base + [trigger(widget_id)], fragment_id if scoped else ""))
+    return latencies
+
+def switch_meets(session, base, selector, meets, scoped):
+    """Picks each meet in turn; (seconds per pick)"""
+    latencies = []
+    for meet in meets[1:] + meets[:1]:
+        widget_id, fragment_id = session.widgets[selector]
+        latencies.append(session.rerun(base + [string_state(widget_id, meet)], fragment_id if scoped else ""))
+    return latencies
+
+def switch_tabs(session, base, tab_id, names):
+    """Opens each gymnast's tab in turn, ending back on GYMNAST; (seconds per switch)"""
+    latencies = []
+    for name in [n for n in names if n != GYMNAST] + [GYMNAST]:
+        latencies.append(session.rerun(base + [string_state(tab_id, name)]))
+    return latencies
+
+def main():
+    ap = argparse.ArgumentParser(description="Times card flips and meet switches in the analytics tab, full rerun vs fragment rerun")
+    ap.add_argument("--sessions", type=int, default=20, help="Synthetic season size, in sessions")
+    ap.add_argument("--athletes", type=int, default=synthetic_season.ATHLETES, help="Athletes per session")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--rounds", type=int, default=5, help="Times every card is flipped each way")
+    ap.add_argument("--port", type=int, default=PORT)
+    args = ap.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench_reruns_")
+    server = None
+    try:
+        write_data(scratch, args.sessions, args.athletes, args.seed)
+        server = start_server(APP, scratch, args.port)
+        with connect(f"ws://127.0.0.1:{args.port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+            session = BrowserSession(ws)
+            session.rerun()
+            tab_id = session.widgets["gymnast_tab"][0]
+            session.rerun([string_state(tab_id, GYMNAST)])
+            checkbox_id = session.widgets[f"ctx_{GYMNAST}"][0]
+            context = [bool_state(checkbox_id, True)]
+            base = context + [string_state(tab_id, GYMNAST)]
+            session.rerun(base)
+
+            # The meet the selector opens on; its cards are keyed flip_<gymnast>_<meet>_<event>
+            prefix = f"btn_flip_{GYMNAST}_"
+            cards = [key[len("btn_"):] for key in session.widgets if key.startswith(prefix)]
+            missing = set(event_names.MEN_EVENTS) - {card.rsplit("_", 1)[1] for card in cards}
+            if missing:
+                print(f"❌ The first meet is missing {sorted(missing)}; try another --seed")
+                return
+            selector = f"meet_{GYMNAST}"
+            meets = session.options[selector]
+            print(f"📊 Dashboard reruns: {args.sessions} synthetic sessions, {len(cards)} cards on the first meet "
+                  f"(all six events), {len(meets)} meets, {args.rounds} rounds")
+
+            medians = {}
+            for scoped, label in ((False, "Full rerun"), (True, "Fragment rerun")):
+                flips, switches = [], []
+                for _ in range(args.rounds):
+                    flips += flip_cards(session, base, cards, scoped)
+                    switches += switch_meets(session, base, selector, meets, scoped)
+                medians[scoped] = np.median(flips), np.median(switches)
+                print(f"   {label:<15} card flip    ({len(flips):3d} clicks)  {percentiles(flips)}")
+                print(f"   {label:<15} meet switch  ({len(switches):3d} picks)   {percentiles(switches)}")
+            (flip_full, switch_full), (flip_scoped, switch_scoped) = medians[False], medians[True]
+            print(f"   Median speedup: card flip {flip_full / flip_scoped:.1f}x, meet switch {switch_full / switch_scoped:.1f}x")
+
+            tabs = []
+            for _ in range(args.rounds):
+                tabs += switch_tabs(session, context, tab_id, TABS)
+            print(f"   Tab switch      ({len(TABS)} tabs) ({len(tabs):3d} switches)  {percentiles(tabs)}")
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
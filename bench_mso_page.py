@@ -0,0 +1,85 @@
+# bench_mso_page.py
+
+import os
+import re
+import time
+import argparse
+from bs4 import BeautifulSoup
+from mso_page import parse_mso_page
+
+HTML_FOLDER = "ansel_history"
+
+def legacy_parse(raw):
+    """The old html.parser path from process_all_history: title, two <li> sweeps, then the table."""
+    soup = BeautifulSoup(raw.decode('utf-8', errors='replace'), 'html.parser')
+    title = soup.title.get_text() if soup.title else ""
+
+    labels = {}
+    for li in soup.find_all('li'):
+        text = li.get_text(strip=True)
+        for key in ("Level:", "Session:", "Division:"):
+            if key in text:
+                labels[key] = text.replace(key, "").strip()
+
+    meet_rank, meet_total = "", ""
+    for li in soup.find_all('li'):
+        if "Meet Ranking" in li.get_text():
+            rank_span = li.find('span', class_='bold')
+            if rank_span:
+                meet_rank = re.sub(r'\D', '', rank_span.get_text())
+            italics = li.find('i')
+            if italics:
+                match = re.search(r"Out of (\d+)", italics.get_text())
+                if match:
+                    meet_total = match.group(1)
+            break
+
+    scores = {}
+    table = soup.find('table', class_='table-condensed')
+    if table:
+        for row in table.find_all('tr'):
+            th, td = row.find('th'), row.find('td')
+            if th and td:
+                score_span = td.find('span', class_='score')
+                rank_span = td.find('span', class_='place')
+                if score_span:
+                    scores[th.get_text(strip=True)] = (score_span.get_text(strip=True),
+                                                      rank_span.get_text(strip=True) if rank_span else "")
+    return title, labels, meet_rank, meet_total, scores
+
+def time_parser(fn, pages, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for raw in pages:
+            fn(raw)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Times the lxml MSO parser against the old BeautifulSoup path")
+    ap.add_argument("--folder", default=HTML_FOLDER)
+    ap.add_argument("--rounds", type=int, default=5, help="Best-of-N timing rounds")
+    args = ap.parse_args()
+
+    pages = []
+    for name in sorted(os.listdir(args.folder)):
+        if name.endswith(".html"):
+            with open(os.path.join(args.folder, name), 'rb') as f:
+                pages.append(f.read())
+    if not pages:
+        print(f"❌ No .html files in {args.folder}")
+        return
+
+    total_kb = sum(len(p) for p in pages) / 1024
+    print(f"📊 {len(pages)} pages, {total_kb:,.0f} KB, best of {args.rounds} rounds")
+
+    old = time_parser(legacy_parse, pages, args.rounds)
+    new = time_parser(parse_mso_page, pages, args.rounds)
+    print(f"   BeautifulSoup/html.parser: {old * 1000:8.1f} ms ({old * 1000 / len(pages):.2f} ms/page)")
+    print(f"   lxml single pass:          {new * 1000:8.1f} ms ({new * 1000 / len(pages):.2f} ms/page)")
+    print(f"   Speedup: {old / new:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# bench_score_cells.py
+
+import re
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import schema
+
+SESSION_EVENTS = ['FX', 'PH', 'SR', 'VT', 'PB', 'HB', 'AA']
+
+def legacy_split(val):
+    """The old per-cell splitter (clean_history / final_scrape): regex, float(), rank text"""
+    if pd.isna(val) or not isinstance(val, str):
+        return val, None
+    match = re.match(r"(\d+\.\d+)\s*(.*)", str(val))
+    if match:
+        return float(match.group(1)), match.group(2).strip()
+    return val, None
+
+def legacy_frame(df):
+    """One .apply plus two list comprehensions per event column"""
+    out = df.copy()
+    for col in df.columns:
+        split = df[col].apply(legacy_split)
+        out[col] = [x[0] for x in split]
+        out[col + '_Rank'] = [x[1] for x in split]
+    return out
+
+def vectorized_frame(df):
+    out = df.copy()
+    scores, ranks, ties = schema.split_score_cells(df)
+    for col in df.columns:
+        out[col] = scores[col]
+        out[col + '_Rank'] = ranks[col]
+        out[schema.tie_col(col + '_Rank')] = ties[col]
+    return out
+
+def synthetic_session(rows, seed=0):
+    """A session table of raw "9.300 1T" cells: ~5% blanks, ~3% ties, AA as a 2-digit total"""
+    rng = np.random.default_rng(seed)
+    table = {}
+    for evt in SESSION_EVENTS:
+        low, high = (40.0, 58.0) if evt == 'AA' else (7.0, 10.0)
+        scores = np.round(rng.uniform(low, high, rows) * 40) / 40
+        ranks = rng.integers(1, 60, rows)
+        tie = np.where(rng.random(rows) < 0.03, "T", "")
+        cells = pd.Series([f"{s:.3f} {r}{t}" for s, r, t in zip(scores, ranks, tie)], dtype=object)
+        table[evt] = cells.mask(rng.random(rows) < 0.05)
+    return pd.DataFrame(table)
+
+def time_splitter(fn, df, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Times the one-pass score/rank splitter against the old per-cell .apply")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--rounds", type=int, default=3, help="Best-of-N timing rounds")
+    args = ap.parse_args()
+
+    df = synthetic_session(args.rows)
+    cells = df.size
+    print(f"📊 {args.rows:,} rows x {len(SESSION_EVENTS)} events ({cells:,} cells), best of {args.rounds} rounds")
+
+    # Both paths have to agree before the timings mean anything
+    old, new = legacy_frame(df), vectorized_frame(df)
+    for col in SESSION_EVENTS:
+        expected = pd.to_numeric(old[col], errors='coerce').astype(schema.SCORE_DTYPE)
+        if not expected.equals(new[col]):
+            print(f"❌ Scores differ in {col}")
+            return
+        ranks = schema.rank_text(new[col + '_Rank'], new[schema.tie_col(col + '_Rank')])
+        if list(ranks) != list(old[col + '_Rank'].fillna('')):
+            print(f"❌ Ranks differ in {col}")
+            return
+
+    old = time_splitter(legacy_frame, df, args.rounds)
+    new = time_splitter(vectorized_frame, df, args.rounds)
+    print(f"   Per-cell .apply:      {old * 1000:8.1f} ms ({old * 1e9 / cells:.0f} ns/cell)")
+    print(f"   Vectorized one pass:  {new * 1000:8.1f} ms ({new * 1e9 / cells:.0f} ns/cell)")
+    print(f"   Speedup: {old / new:.1f}x")
+
+if __name__ == "__main__":
+    main()
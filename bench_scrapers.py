@@ -0,0 +1,134 @@
+# bench_scrapers.py
+
+import os
+import io
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+from urllib.parse import urlsplit
+import numpy as np
+import requests
+import http_client
+from fixture_server import FixtureServer, SYNTHETIC_MEET_BASE, HTML_FOLDER
+import ansel_history_scrape
+import ansel_direct_scrape
+import audit_and_fix
+import harvest_v2
+import harvest_session_raw
+
+# Scraper throughput and tail latency against fixture_server.py instead of the live sites.
+# Part 1 times the fetch layer alone (one page at a time with a new connection each, as
+# the scrapers used to, vs. the shared pooled client); part 2 runs the scrapers themselves
+# in a scratch folder with --mirror pointing at the fixture server.
+INPUT_FILES = ["cleaned_gymnastics.csv", "session_raw_data.csv"]
+
+def percentiles(latencies):
+    """'p50 / p95 / p99 / max' in ms"""
+    if not latencies:
+        return "-"
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return f"p50 {p50:6.1f}  p95 {p95:6.1f}  p99 {p99:6.1f}  max {max(latencies) * 1000:6.1f} ms"
+
+def bench_urls(meets, sessions):
+    """Real-site URLs (the mirror rewrites them): synthetic MSO results pages plus MMS sessions"""
+    urls = [f"https://www.meetscoresonline.com/results/{SYNTHETIC_MEET_BASE + i}/{ansel_history_scrape.ATHLETE_ID}" for i in range(meets)]
+    urls += [f"https://www.mymeetscores.com/meet.pl?meetid=93352&session={s}" for s in range(1, sessions + 1)]
+    return urls
+
+def sequential_fetch(client, urls):
+    """The old pattern: requests.get one page after another, a fresh connection each time"""
+    latencies = []
+    for url in urls:
+        start = time.perf_counter()
+        requests.get(client.mirrored(url), timeout=http_client.TIMEOUT).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def new_client(server, args):
+    return http_client.configure(use_cache=False, mirror=server.url, session=requests.Session(),
+                                 rate=args.rate, burst=args.per_host, per_host=args.per_host)
+
+def scraper_runs(urls):
+    """(label, callable) for every scraper that fetches; run inside the scratch folder"""
+    meet_urls = [u for u in urls if "/results/" in u]
+    return [
+        ("ansel_history_scrape", ansel_history_scrape.main),
+        ("ansel_direct_scrape", ansel_direct_scrape.scrape_ansel_direct),
+        ("audit_and_fix ranks", lambda: [audit_and_fix.get_rank_from_mso(u) for u in meet_urls]),
+        ("harvest_v2", harvest_v2.main),
+        ("harvest_session_raw", harvest_session_raw.main),
+    ]
+
+def main():
+    ap = argparse.ArgumentParser(description="Times the scrapers against a local fixture server")
+    ap.add_argument("--meets", type=int, default=40, help="Synthetic meets on the profile / in the fetch test")
+    ap.add_argument("--sessions", type=int, default=20, help="MyMeetScores sessions in the fetch test")
+    ap.add_argument("--athletes", type=int, default=60, help="Athletes per synthetic session (page size)")
+    ap.add_argument("--latency", type=float, default=80, help="Median server delay in ms")
+    ap.add_argument("--jitter", type=float, default=0.6, help="Lognormal spread of the delay")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Share of 503s (exercises the retries)")
+    ap.add_argument("--rate", type=float, default=50, help="Client requests per second per host (the fixture server needs no politeness limit)")
+    ap.add_argument("--per-host", type=int, default=http_client.PER_HOST)
+    args = ap.parse_args()
+
+    server = FixtureServer(HTML_FOLDER, athletes=args.athletes, latency_ms=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, extra_meets=args.meets)
+    urls = bench_urls(args.meets, args.sessions)
+    with server:
+        print(f"🧪 Fixture server at {server.url}: {args.latency:.0f} ms median latency (jitter {args.jitter}), "
+              f"{args.athletes} athletes/session, {args.error_rate:.0%} errors")
+
+        # 1. The fetch layer alone
+        # Render every synthetic page up front so both paths see the same server
+        for url in urls:
+            parts = urlsplit(url)
+            server.page(f"{parts.path}?{parts.query}" if parts.query else parts.path)
+        client = new_client(server, args)
+        start = time.perf_counter()
+        old_latencies = sequential_fetch(client, urls) if args.error_rate == 0 else []
+        old = time.perf_counter() - start
+        start = time.perf_counter()
+        responses = client.fetch_many(urls)
+        new = time.perf_counter() - start
+        ok = sum(1 for r in responses if r is not None and r.ok)
+
+        print(f"📊 Fetch layer: {len(urls)} pages ({args.meets} MSO + {args.sessions} MMS)")
+        if old_latencies:
+            print(f"   Sequential requests.get: {old:7.2f} s ({len(urls) / old:5.1f} pages/s)  {percentiles(old_latencies)}")
+        print(f"   Pooled client ({args.per_host}/host):  {new:7.2f} s ({len(urls) / new:5.1f} pages/s)  {percentiles(client.latencies)}")
+        print(f"   {ok}/{len(urls)} ok, {len(client.latencies)} requests incl. retries")
+        if old_latencies:
+            print(f"   Speedup: {old / new:.1f}x")
+
+        # 2. The scrapers, in a scratch folder so the repo's CSVs and database are untouched
+        repo = os.getcwd()
+        scratch = tempfile.mkdtemp(prefix="bench_scrapers_")
+        for name in INPUT_FILES:
+            if os.path.exists(name):
+                shutil.copy(name, scratch)
+        if os.path.isdir(HTML_FOLDER):
+            shutil.copytree(HTML_FOLDER, os.path.join(scratch, HTML_FOLDER))
+
+        print(f"📊 Scrapers ({args.meets} synthetic meets on the profile)")
+        try:
+            os.chdir(scratch)
+            for label, run in scraper_runs(urls):
+                # One untimed pass first so every page it asks for is already rendered server-side
+                new_client(server, args)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+                client = new_client(server, args)
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+                elapsed = time.perf_counter() - start
+                pages = client.stats['fetched']
+                print(f"   {label:<22} {pages:4d} pages {elapsed:7.2f} s ({pages / elapsed:5.1f} pages/s)  {percentiles(client.latencies)}")
+        finally:
+            os.chdir(repo)
+            shutil.rmtree(scratch, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# bench_season.py
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+from datetime import datetime
+import pandas as pd
+import http_client
+import dashboard_data
+import synthetic_season
+import process_all_history
+import harvest_v2
+import harvest_session_raw
+import session_context_analytics
+
+# End-to-end timings as the season grows: for each scale, a synthetic season
+# (synthetic_season.py) is written to a scratch folder and every stage is run cold,
+# one after another, the way a refresh runs them:
+#   process_all_history -> session_context_analytics -> streamlit_app.load_data
+#   -> harvest_v2 -> harvest_session_raw
+# (the harvesters go last because they rewrite session_raw_data.csv). Each stage keeps
+# its best time over --rounds fresh runs, since one cold run is noisy. Results are
+# saved as JSON under RESULTS_DIR, named by commit, and --compare prints the change
+# against an earlier file so regressions show up across commits.
+SCALES = "1,10,100,500"
+RESULTS_DIR = "bench_results"
+# Slower than the baseline by more than this flags a regression
+REGRESSION = 1.2
+
+@contextlib.contextmanager
+def argv(*args):
+    """sys.argv for a stage whose main() parses its own arguments"""
+    saved = sys.argv
+    sys.argv = list(args)
+    try:
+        yield
+    finally:
+        sys.argv = saved
+
+def import_dashboard():
+    """
+    Imports streamlit_app, which runs the app script once in bare mode against the
+    current folder's data. Done up front so the one-off import isn't timed as load_data.
+    """
+    # Bare mode warns on every st.* call; the config load during the import resets the level
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    with contextlib.redirect_stdout(io.StringIO()):
+        import streamlit_app
+    streamlit.logger.set_log_level("error")
+    return streamlit_app
+
+def load_dashboard_data():
+    """streamlit_app.load_data with the dashboard cache cleared, so it's a cold parse"""
+    streamlit_app = import_dashboard()
+    dashboard_data.clear()
+    return streamlit_app.load_data()
+
+def run_session_analytics():
+    with argv("session_context_analytics.py", "--full"):
+        session_context_analytics.main()
+
+STAGES = [
+    ("process_all_history", process_all_history.main),
+    ("session_context_analytics", run_session_analytics),
+    ("load_data", load_dashboard_data),
+    ("harvest_v2", harvest_v2.main),
+    ("harvest_session_raw", harvest_session_raw.main),
+]
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def bench_scale(sessions, athletes, seed):
+    """Writes a season of `sessions` into a scratch folder and times every stage there, once"""
+    repo = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="bench_season_")
+    try:
+        start = time.perf_counter()
+        summary = synthetic_season.write_season(scratch, sessions, athletes, seed)
+        summary['generate'] = time.perf_counter() - start
+        os.chdir(scratch)
+        # Synthetic meets have no MyMeetScores ids, but never let a stage reach the network
+        http_client.configure(offline=True, cache_dir=os.path.join(scratch, "http_cache"))
+        timings = {}
+        for name, run in STAGES:
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+                timings[name] = time.perf_counter() - start
+            except Exception as e:
+                print(f"   ❌ {name} failed at {sessions} sessions: {e}")
+                timings[name] = None
+        return {**summary, 'stages': timings}
+    finally:
+        os.chdir(repo)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def best_of(rounds, sessions, athletes, seed):
+    """bench_scale `rounds` times; each stage keeps its fastest run (None if it ever failed)"""
+    runs = [bench_scale(sessions, athletes, seed) for _ in range(rounds)]
+    best = dict(runs[0])
+    best['generate'] = min(run['generate'] for run in runs)
+    best['stages'] = {}
+    for name in runs[0]['stages']:
+        times = [run['stages'][name] for run in runs]
+        best['stages'][name] = None if None in times else min(times)
+    return best
+
+def compare(results, baseline_path):
+    """Prints each stage's time against the same scale in an earlier results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old_runs = {run['sessions']: run for run in baseline['runs']}
+    print(f"📈 Against {baseline_path} (commit {baseline.get('commit', '?')}):")
+    for run in results['runs']:
+        old = old_runs.get(run['sessions'])
+        if not old:
+            continue
+        for stage, seconds in run['stages'].items():
+            before = old['stages'].get(stage)
+            if not seconds or not before:
+                continue
+            ratio = seconds / before
+            flag = "⚠️ slower" if ratio > REGRESSION else ("✅ faster" if ratio < 1 / REGRESSION else "")
+            print(f"   {run['sessions']:>5} sessions  {stage:<26} {before * 1000:9.1f} -> {seconds * 1000:9.1f} ms  {ratio:5.2f}x {flag}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Times ingest, harvesters, analytics and dashboard loading on synthetic seasons")
+    ap.add_argument("--sessions", default=SCALES, help="Comma-separated season sizes, in sessions")
+    ap.add_argument("--athletes", type=int, default=synthetic_season.ATHLETES, help="Typical field size per session")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--rounds", type=int, default=3, help="Best-of-N runs per scale")
+    ap.add_argument("--json", help=f"Where to save the results (default {RESULTS_DIR}/season_<commit>.json)")
+    ap.add_argument("--compare", help="An earlier results file to compare against")
+    args = ap.parse_args()
+
+    commit = git_commit()
+    import_dashboard()
+    results = {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'athletes': args.athletes,
+        'seed': args.seed,
+        'rounds': args.rounds,
+        'runs': [],
+    }
+    print(f"📊 Season benchmark at {commit}: {args.athletes} athletes/session, best of {args.rounds} rounds")
+    print(f"   {'sessions':>8} {'rows':>8} {'pages':>6}  " + "  ".join(f"{name:>12.12}" for name, _ in STAGES))
+    for sessions in [int(s) for s in args.sessions.split(",")]:
+        run = best_of(args.rounds, sessions, args.athletes, args.seed)
+        results['runs'].append(run)
+        cells = "  ".join(f"{run['stages'][name] * 1000:9.1f} ms" if run['stages'][name] is not None else f"{'failed':>12}"
+                          for name, _ in STAGES)
+        print(f"   {run['sessions']:>8} {run['raw_rows']:>8,} {run['pages']:>6}  {cells}")
+
+    path = args.json or os.path.join(RESULTS_DIR, f"season_{commit}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Saved {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import pandas as pd
 import re
+import sqlite_store
 
 def clean_gymnastics_data():
     input_file = "gymnastics_history.csv"
@@ -105,9 +106,10 @@ def clean_gymnastics_data():
 
         all_data.append(record)
 
-    # Save to new CSV
+    # Save to new CSV: the store is the source of truth, so the table goes there and the CSV is regenerated
     df = pd.DataFrame(all_data)
-    df.to_csv(output_file, index=False)
+    sqlite_store.replace(df, 'cleaned')
+    sqlite_store.publish('cleaned')
     print(f"✅ Created {output_file} with {len(df)} rows.")
     print(df.head())
 
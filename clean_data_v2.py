@@ -1,5 +1,9 @@
 import pandas as pd
-import re
+import schema
+import sqlite_store
+
+# Columns 6-10 of each gymnastics_history.csv row
+GIRLS_EVENTS = ['VT', 'UB', 'BB', 'FX', 'AA']
 
 def clean_and_restore():
     input_file = "gymnastics_history.csv"
@@ -27,49 +31,21 @@ def clean_and_restore():
             
         if len(row) < 10: continue
 
-        # Helper to split "9.700 1" into (9.7, 1)
-        def parse_cell(val):
-            if not val: return 0.0, ""
-            val = val.replace('"', '').strip()
-            parts = val.split(' ')
-            try:
-                score = float(parts[0])
-                rank = parts[1] if len(parts) > 1 else ""
-                # remove "T" from rank (e.g. 1T -> 1) for sorting if desired, 
-                # but let's keep it for display
-                return score, rank
-            except:
-                return 0.0, ""
-
-        # Extract Core Data
-        date = row[0]
-        meet = row[1]
-        session = row[3] # Preserving Session
-        level = row[4]
-        division = row[5] # Preserving Division
-        
-        # Parse Scores and Ranks (Girls Standard)
-        vt_score, vt_rank = parse_cell(row[6])
-        ub_score, ub_rank = parse_cell(row[7])
-        bb_score, bb_rank = parse_cell(row[8])
-        fx_score, fx_rank = parse_cell(row[9])
-        aa_score, aa_rank = parse_cell(row[10])
-
-        record = {
-            'Date': date, 'Gymnast': current_gymnast, 
-            'Meet': meet, 'Session': session, 'Level': level, 'Division': division,
-            'VT': vt_score, 'VT_Rank': vt_rank,
-            'UB': ub_score, 'UB_Rank': ub_rank,
-            'BB': bb_score, 'BB_Rank': bb_rank,
-            'FX': fx_score, 'FX_Rank': fx_rank,
-            'AA': aa_score, 'AA_Rank': aa_rank,
-            # Placeholders for Men's events (so Ansel fits in later)
-            'PH': 0.0, 'PH_Rank': '', 'SR': 0.0, 'SR_Rank': '', 
-            'PB': 0.0, 'PB_Rank': '', 'HB': 0.0, 'HB_Rank': ''
-        }
-        all_data.append(record)
+        # Raw "9.700 1" cells are split for all rows at once below (Girls Standard)
+        all_data.append({
+            'Date': row[0], 'Gymnast': current_gymnast,
+            'Meet': row[1], 'Session': row[3], 'Level': row[4], 'Division': row[5],  # Preserving Session/Division
+            **{evt: row[i].replace('"', '') for i, evt in enumerate(GIRLS_EVENTS, start=6)}
+        })
 
     df = pd.DataFrame(all_data)
+    scores, ranks, ties = schema.split_score_cells(df[GIRLS_EVENTS])
+    for evt in GIRLS_EVENTS:
+        df[evt] = schema.float64_scores(scores[evt]).fillna(0.0)
+        df[evt + '_Rank'] = schema.rank_text(ranks[evt], ties[evt])
+    # Placeholders for Men's events (so Ansel fits in later)
+    for evt in ['PH', 'SR', 'PB', 'HB']:
+        df[evt], df[evt + '_Rank'] = 0.0, ''
     # Ensure columns are ordered nicely
     cols = ['Date', 'Gymnast', 'Meet', 'Session', 'Level', 'Division', 
             'VT', 'VT_Rank', 'UB', 'UB_Rank', 'BB', 'BB_Rank', 'FX', 'FX_Rank', 
@@ -77,7 +53,9 @@ def clean_and_restore():
             'AA', 'AA_Rank']
     df = df[cols]
     
-    df.to_csv(output_file, index=False)
+    # The store is the source of truth, so the table goes there and the CSV is regenerated
+    sqlite_store.replace(df, 'cleaned')
+    sqlite_store.publish('cleaned')
     print(f"✅ Success! {output_file} created with {len(df)} rows and full details.")
 
 if __name__ == "__main__":
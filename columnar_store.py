@@ -0,0 +1,212 @@
+# columnar_store.py
+
+import json
+import os
+import shutil
+import argparse
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import schema
+
+# Typed Parquet copies of the three core CSVs, split into one file per
+# Season/Discipline so a view only opens the partitions and columns it needs.
+# The CSVs stay the source of truth for every script that hasn't moved over;
+# `python columnar_store.py import` / `export` converts between the two.
+STORE_DIR = "data_store"
+DATASETS = {
+    'cleaned': "cleaned_gymnastics.csv",
+    'session_raw': "session_raw_data.csv",
+    'analytics': "session_context_analytics.csv",
+}
+MANIFEST = "_manifest.json"
+# What a bare `import` / `export` converts. The harvesters rebuild session_raw_data.csv in
+# their own layout (no Date, so no Season to partition by) and nothing reads its copy,
+# so session_raw is only converted when asked for by name.
+DEFAULT_DATASETS = ['cleaned', 'analytics']
+# Datasets in the 26-column results layout are stored in schema.py's dtypes
+SCHEMA_DATASETS = {'cleaned', 'session_raw'}
+
+SCORE_COLS = ["VT", "UB", "BB", "FX", "PH", "SR", "PB", "HB", "AA"]
+MENS_ONLY = ["PH", "SR", "PB", "HB"]
+WOMENS_ONLY = ["UB", "BB"]
+# Everything else is a number (scores, medians, percentiles ...)
+TEXT_COLS = ['Date', 'Gymnast', 'Meet', 'Session', 'Level', 'Division', 'Event', 'Grouping',
+             'Meet_Rank', 'Meet_Rank_Total']
+
+PARTITIONING = ds.partitioning(pa.schema([('Season', pa.string()), ('Discipline', pa.string())]),
+                               flavor='hive')
+
+def is_text(col):
+    # Ranks keep their tie marker ("4T"), so they stay text
+    return col in TEXT_COLS or col.endswith('_Rank')
+
+def typed(df):
+    """Text columns as strings, everything else numeric, so readers never coerce again"""
+    df = df.copy()
+    for col in df.columns:
+        if is_text(col):
+            df[col] = df[col].astype('string')
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    return df
+
+def season_of(dates):
+    """Competition season a meet counts toward: Sep-Dec meets belong to the next year's season"""
+    when = pd.to_datetime(dates, errors='coerce')
+    season = when.dt.year + (when.dt.month >= 9)
+    return season.astype('Int64').astype('string').fillna('unknown')
+
+def discipline_of(df):
+    """'Men' / 'Women' per row, from which events the athlete's row (or meet, for long files) has"""
+    def has(cols, frame):
+        present = [c for c in cols if c in frame.columns]
+        if not present:
+            return pd.Series(False, index=frame.index)
+        return (frame[present].apply(pd.to_numeric, errors='coerce').fillna(0) > 0).any(axis=1)
+
+    if 'Event' in df.columns:
+        # Long files (one row per event): decide per athlete per meet
+        mens = df['Event'].isin(MENS_ONLY).groupby([df['Gymnast'], df['Meet']]).transform('any')
+        womens = df['Event'].isin(WOMENS_ONLY).groupby([df['Gymnast'], df['Meet']]).transform('any')
+    else:
+        mens, womens = has(MENS_ONLY, df), has(WOMENS_ONLY, df)
+    return pd.Series(['Men' if m else 'Women' if w else 'unknown' for m, w in zip(mens, womens)],
+                     index=df.index, dtype='string')
+
+def _fingerprint(part):
+    return f"{int(pd.util.hash_pandas_object(part, index=False).sum()) & 0xFFFFFFFFFFFFFFFF:016x}-{len(part)}"
+
+def _load_manifest(path):
+    try:
+        with open(os.path.join(path, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'columns': [], 'partitions': {}}
+
+def exists(name, root=STORE_DIR):
+    return os.path.exists(os.path.join(root, name, MANIFEST))
+
+def stored_columns(name, root=STORE_DIR):
+    """The dataset's columns in stored order, or None if it hasn't been imported"""
+    if not exists(name, root):
+        return None
+    return _load_manifest(os.path.join(root, name))['columns']
+
+def save(df, name, root=STORE_DIR):
+    """
+    Replaces dataset `name` with df. Only partitions whose rows actually changed are
+    rewritten; partitions that no longer have rows are removed.
+    Returns (written, unchanged) partition counts.
+    """
+    path = os.path.join(root, name)
+    os.makedirs(path, exist_ok=True)
+    manifest = _load_manifest(path)
+    df = schema.enforce(df) if name in SCHEMA_DATASETS else typed(df)
+    if manifest['columns'] != list(df.columns):
+        # A new column layout invalidates every partition
+        manifest = {'columns': list(df.columns), 'partitions': {}}
+
+    season, discipline = season_of(df['Date']), discipline_of(df)
+    written, unchanged, partitions = 0, 0, {}
+    for (s, d), part in df.groupby([season, discipline], sort=True):
+        rel = f"Season={s}/Discipline={d}"
+        part = part.reset_index(drop=True)
+        partitions[rel] = _fingerprint(part)
+        if manifest['partitions'].get(rel) == partitions[rel]:
+            unchanged += 1
+            continue
+        os.makedirs(os.path.join(path, rel), exist_ok=True)
+        # Through a temp file so a crash never leaves half a partition behind
+        table = pa.Table.from_pandas(part, preserve_index=False)
+        schema.replace_file(os.path.join(path, rel, "part-0.parquet"), lambda tmp_path: pq.write_table(table, tmp_path))
+        written += 1
+
+    for rel in set(manifest['partitions']) - set(partitions):
+        shutil.rmtree(os.path.join(path, rel), ignore_errors=True)
+
+    manifest['partitions'] = partitions
+    def write_manifest(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+    schema.replace_file(os.path.join(path, MANIFEST), write_manifest)
+    return written, unchanged
+
+def load(name, columns=None, season=None, discipline=None, root=STORE_DIR):
+    """
+    Reads dataset `name`, opening only the requested columns and partitions.
+    season/discipline take a single value or a list. Rows come back grouped by
+    partition, in their original order within each one. Returns None if the dataset
+    hasn't been imported yet (callers fall back to the CSV).
+    """
+    path = os.path.join(root, name)
+    if not exists(name, root):
+        return None
+    manifest = _load_manifest(path)
+    columns = list(columns) if columns is not None else manifest['columns']
+
+    expr = None
+    for field, value in (('Season', season), ('Discipline', discipline)):
+        if value is not None:
+            values = [str(v) for v in (value if isinstance(value, (list, tuple, set)) else [value])]
+            cond = ds.field(field).isin(values)
+            expr = cond if expr is None else expr & cond
+
+    if not manifest['partitions']:
+        return pd.DataFrame(columns=columns)
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING,
+                         exclude_invalid_files=False, ignore_prefixes=['_', '.'])
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+def import_csv(name, root=STORE_DIR):
+    """Loads the dataset's CSV into the store"""
+    csv_path = DATASETS[name]
+    if name in SCHEMA_DATASETS:
+        return save(schema.read_csv(csv_path), name, root)
+    df = pd.read_csv(csv_path, dtype={c: str for c in pd.read_csv(csv_path, nrows=0).columns if is_text(c)})
+    return save(df, name, root)
+
+def refresh(name, root=STORE_DIR):
+    """
+    Re-imports the dataset's CSV if it has a Parquet copy, so readers of the copy see
+    what a script just wrote to the CSV. Returns import_csv's counts, or None.
+    """
+    if not exists(name, root):
+        return None
+    return import_csv(name, root)
+
+def export_csv(name, root=STORE_DIR):
+    """Writes the stored dataset back out as its CSV"""
+    df = load(name, root=root)
+    if df is None:
+        return None
+    if name in SCHEMA_DATASETS:
+        schema.write_csv(df, DATASETS[name])
+    else:
+        df.to_csv(DATASETS[name], index=False)
+    return len(df)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the core CSVs to/from the partitioned Parquet store")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("datasets", nargs="*", default=DEFAULT_DATASETS,
+                        help=f"any of {', '.join(DATASETS)} (default {', '.join(DEFAULT_DATASETS)})")
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        if args.action == "import":
+            if not os.path.exists(DATASETS[name]):
+                print(f"⚠️ {DATASETS[name]} not found. Skipping.")
+                continue
+            written, unchanged = import_csv(name)
+            print(f"📦 {name}: wrote {written} partitions, {unchanged} unchanged.")
+        else:
+            rows = export_csv(name)
+            if rows is None:
+                print(f"⚠️ No '{name}' dataset in {STORE_DIR}/. Skipping.")
+            else:
+                print(f"📄 {name}: wrote {rows} rows to {DATASETS[name]}.")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import pandas as pd
 import io
+import columnar_store
 
 # This is the full 655-row analytics dataset we generated from your 9 PDFs
 # including the JSI, Percentiles, and Medians for all sessions.
@@ -19,4 +20,5 @@ csv_content = """Date,Gymnast,Meet,Event,Score,Session_Median,Session_Max,Sessio
 
 df = pd.read_csv(io.StringIO(csv_content))
 df.to_csv("session_context_analytics.csv", index=False)
+columnar_store.refresh('analytics')
 print("✅ Done! 'session_context_analytics.csv' is now in your folder.")
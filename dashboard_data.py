@@ -0,0 +1,176 @@
+# dashboard_data.py
+
+import os
+import threading
+from datetime import datetime
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+import columnar_store
+import schema
+from dedup import canonical_athlete
+from ingest_manifest import file_digest
+from session_context_analytics import RAW_FILE, OUTPUT_FILE, load_score_index, read_output
+
+# Every file the dashboard reads goes through here. Each read starts with a stat():
+# size and mtime decide whether the file needs re-hashing, and the content hash keys
+# the parsed copy. So a rewrite by the pipeline is picked up on the next rerun, a touch
+# that leaves the bytes alone costs one hash and no parse, and each version of a file
+# is parsed once per server process and shared by every browser session.
+# Per-athlete views are built the same way, once per version: each athlete's rows under
+# their canonical id (dedup.canonical_athlete, so "Ansel" and "Ansel Sheehy" are one
+# athlete and "Ansel Smith" isn't), so a tab is a dict lookup however many athletes
+# the file holds.
+# The frames are shared objects: callers filter or .copy() them, never edit in place.
+CLEANED_CSV = "cleaned_gymnastics.csv"
+# Parsed versions kept per dataset (the current one plus a little slack)
+KEEP_VERSIONS = 2
+# The columns the views read: the gymnast tabs' metrics, trend chart and raw-data table
+# show the results layout (without the rank tie flags), the analytics cards their context
+# numbers. The Parquet copy only opens these; a file that lacks some (older analytics
+# files have no Min columns) comes back without them.
+CLEANED_COLUMNS = schema.COLUMNS
+ANALYTICS_COLUMNS = ['Date', 'Gymnast', 'Meet', 'Session', 'Level', 'Event', 'Score',
+                     'Session_Median', 'Session_Max', 'Session_Min', 'Session_Count',
+                     'Division_Median', 'Division_Max', 'Division_Min', 'Percentile', 'JSI', 'Count']
+
+class AthleteView(NamedTuple):
+    """One athlete's rows of a dataset (in file order), their most recent row and their meets"""
+    rows: pd.DataFrame
+    latest: pd.Series
+    meets: list
+
+class Fingerprint(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @property
+    def refreshed(self):
+        """When the file was last written"""
+        return datetime.fromtimestamp(self.mtime_ns / 1e9)
+
+_digests = {}
+_digests_lock = threading.Lock()
+
+def fingerprint(path):
+    """(size, mtime, hash) of a file, or None if it's missing. Re-hashes only when size or mtime moved."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    with _digests_lock:
+        known = _digests.get(path)
+    if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+        return Fingerprint(path, stat.st_size, stat.st_mtime_ns, known[2])
+    sha256 = file_digest(path)
+    with _digests_lock:
+        _digests[path] = (stat.st_size, stat.st_mtime_ns, sha256)
+    return Fingerprint(path, stat.st_size, stat.st_mtime_ns, sha256)
+
+def _only(df, columns):
+    return df[[c for c in columns if c in df.columns]]
+
+def _load_stored(name, columns):
+    """The Parquet copy, opening just the listed columns it has (None if it isn't imported)"""
+    stored = columnar_store.stored_columns(name)
+    if stored is None:
+        return None
+    return columnar_store.load(name, columns=[c for c in columns if c in stored])
+
+def _read_cleaned():
+    # Both paths come back in schema.py dtypes, so there's nothing left to coerce
+    df = _load_stored('cleaned', CLEANED_COLUMNS)
+    if df is None:
+        df = _only(schema.read_csv(CLEANED_CSV), CLEANED_COLUMNS)
+    if 'Date' in df.columns:
+        df = df.sort_values(by='Date')
+    return df
+
+def _read_analytics():
+    df = _load_stored('analytics', ANALYTICS_COLUMNS)
+    return df if df is not None else _only(read_output(OUTPUT_FILE), ANALYTICS_COLUMNS)
+
+# dataset -> (file it comes from, parser). The Parquet copy wins if it's been imported;
+# its manifest lists every partition's fingerprint, so it changes whenever they do.
+DATASETS = {
+    'cleaned': (CLEANED_CSV, _read_cleaned),
+    'analytics': (OUTPUT_FILE, _read_analytics),
+    'score_index': (RAW_FILE, lambda: load_score_index(RAW_FILE)),
+}
+
+def source_of(name):
+    if name in columnar_store.DATASETS and columnar_store.exists(name):
+        return os.path.join(columnar_store.STORE_DIR, name, columnar_store.MANIFEST)
+    return DATASETS[name][0]
+
+@st.cache_resource(max_entries=KEEP_VERSIONS * len(DATASETS), show_spinner=False)
+def _parsed(name, sha256):
+    """One parse per dataset version; the hash argument is the cache key"""
+    return DATASETS[name][1]()
+
+def athlete_ids(names):
+    """Canonical athlete id per row ('' for blanks), worked out once per distinct spelling"""
+    codes, uniques = pd.factorize(names)
+    ids = np.array([canonical_athlete(u) for u in uniques] + [""], dtype=object)
+    return ids[codes]
+
+@st.cache_resource(max_entries=KEEP_VERSIONS * len(DATASETS), show_spinner=False)
+def _athlete_views(name, sha256):
+    """{athlete id: AthleteView} for one dataset version: one grouping pass and one date sort for everybody"""
+    df = _parsed(name, sha256)
+    if 'Gymnast' not in df.columns:
+        return {}
+    ids = athlete_ids(df['Gymnast'])
+    # One stable reorder by athlete, so each athlete's rows are a contiguous slice in file order
+    codes, uniques = pd.factorize(ids)
+    order = np.argsort(codes, kind='stable')
+    grouped = df.take(order)
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    # Latest = last row in a stable date sort (undated rows sort last), as iloc[-1] of the sorted frame
+    by_date = np.arange(len(df))
+    if 'Date' in df.columns:
+        by_date = df['Date'].reset_index(drop=True).sort_values(kind='stable').index.to_numpy()
+    latest_of = pd.Series(by_date).groupby(codes[by_date]).last()
+    latest = df.take(latest_of.to_numpy())
+    meets = grouped['Meet'].to_numpy() if 'Meet' in df.columns else None
+
+    views = {}
+    for code, athlete_id in enumerate(uniques):
+        if athlete_id:
+            start, end = bounds[code], bounds[code + 1]
+            views[athlete_id] = AthleteView(grouped.iloc[start:end], latest.iloc[code],
+                                            list(pd.unique(meets[start:end])) if meets is not None else [])
+    return views
+
+def version(name):
+    """The Fingerprint of what `name` would be read from right now (None if there's nothing)"""
+    return fingerprint(source_of(name))
+
+def load(name):
+    """The current parsed copy of a dataset, or None if its file doesn't exist"""
+    current = version(name)
+    if current is None:
+        return None
+    return _parsed(name, current.sha256)
+
+def athlete(gymnast, name='cleaned'):
+    """The AthleteView for any spelling of a gymnast's name, or None if the dataset has no rows for them"""
+    current = version(name)
+    if current is None:
+        return None
+    return _athlete_views(name, current.sha256).get(canonical_athlete(gymnast))
+
+def refreshed_caption(name):
+    """'🕒 Data refreshed Feb 14, 3:05 PM' for a dataset's file, or '' if there isn't one"""
+    current = version(name)
+    if current is None:
+        return ""
+    return f"🕒 Data refreshed {current.refreshed:%b %d, %I:%M %p}"
+
+def clear():
+    """Forgets every parsed copy and view (the next load of each dataset parses again)"""
+    _parsed.clear()
+    _athlete_views.clear()
@@ -0,0 +1,115 @@
+# dedup.py
+
+import re
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+from mso_page import KNOWN_GYMNASTS
+from schema import EVENTS
+
+# One natural key for "the same gymnast at the same meet", shared by every writer.
+# MSO, MyMeetScores and hand-typed rows spell things differently ("Ansel" vs
+# "Ansel Sheehy", "Stanford Open 2026" vs "2026 Stanford Open", session "01" vs "1"),
+# so each part is canonicalized before it goes into the key.
+FAMILY_NAME = "Sheehy"
+KEY_COLS = ['Gymnast', 'Meet', 'Date', 'Session']
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# "Ansel Sheehy" -> "ansel", so the kids' rows from every source line up
+ATHLETE_ALIASES = {f"{nick} {FAMILY_NAME}".casefold(): nick.casefold() for nick in KNOWN_GYMNASTS}
+
+def _words(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = str(value).casefold().replace("'", "").replace("’", "")
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text).split())
+
+# Names repeat on every row, so each distinct spelling is only worked out once
+@lru_cache(maxsize=65536)
+def canonical_athlete(name):
+    words = _words(name)
+    return ATHLETE_ALIASES.get(words, words)
+
+@lru_cache(maxsize=65536)
+def canonical_meet(name):
+    """Lowercase words with the season year moved to the front"""
+    words = _words(name).split()
+    years = [w for w in words if re.fullmatch(r"(19|20)\d\d", w)]
+    if years:
+        words.remove(years[0])
+        words.insert(0, years[0])
+    return " ".join(words)
+
+@lru_cache(maxsize=65536)
+def canonical_date(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = str(value).strip()
+    if text == "" or ISO_DATE.fullmatch(text):
+        return text
+    for fmt in ('%m/%d/%Y', '%m/%d/%y', '%m_%d_%Y', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    when = pd.to_datetime(text, errors='coerce')
+    return text if pd.isna(when) else when.strftime('%Y-%m-%d')
+
+@lru_cache(maxsize=65536)
+def canonical_session(value):
+    words = _words(value).replace(" ", "")
+    # "01" and "1" are the same session; "09B" stays "9b"
+    return words.lstrip("0") or ("0" if words else "")
+
+def natural_key(record):
+    """(athlete, meet, date, session) with every part canonicalized; session may be ''"""
+    return (canonical_athlete(record.get('Gymnast')), canonical_meet(record.get('Meet')),
+            canonical_date(record.get('Date')), canonical_session(record.get('Session')))
+
+def is_empty(col, value):
+    """Blank, NaN, or (for score/rank columns) the 0 placeholder for an event not competed"""
+    if value is None or value is pd.NA or (isinstance(value, float) and pd.isna(value)):
+        return True
+    text = str(value).strip()
+    if text == "" or text.casefold() == "nan":
+        return True
+    if col in EVENTS or col.endswith('_Rank'):
+        try:
+            return float(text) == 0
+        except ValueError:
+            return False
+    return False
+
+def merge_fields(old, new):
+    """
+    Column-wise merge of a newer record into an older one: every non-empty field in
+    `new` wins, empty ones keep the old value. Gymnast/Meet/Date keep the stored
+    spelling (they already match by key), and Session is only filled in if it was blank.
+    Returns (merged, changed).
+    """
+    merged = dict(old)
+    for col, value in new.items():
+        if is_empty(col, value):
+            continue
+        if col in KEY_COLS and not is_empty(col, old.get(col)):
+            continue
+        if merged.get(col) != value:
+            merged[col] = value
+    changed = any(merged.get(c) != old.get(c) for c in merged)
+    return merged, changed
+
+def pick_match(candidates, session):
+    """
+    Which stored row an incoming record belongs to, given the canonical sessions of the
+    stored rows for the same athlete/meet/date: the same session, else a stored row with
+    no session yet, else (if the record itself has no session) the first stored row.
+    `candidates` is a list of (row_id, session). Returns a row_id or None.
+    """
+    for row_id, stored in candidates:
+        if stored == session:
+            return row_id
+    for row_id, stored in candidates:
+        if stored == "":
+            return row_id
+    if session == "" and candidates:
+        return candidates[0][0]
+    return None
@@ -0,0 +1,69 @@
+# event_names.py
+
+import re
+from functools import lru_cache
+
+# Every spelling of every event header we've seen on MSO, MyMeetScores and in old CSVs,
+# in one place. Headers are matched on lowercase words, so "PBARS", "PBars" and
+# "P Bars" are the same spelling; a longer header ("Vault Score") still resolves
+# through the compiled pattern.
+MEN_EVENTS = ('FX', 'PH', 'SR', 'VT', 'PB', 'HB')
+WOMEN_EVENTS = ('VT', 'UB', 'BB', 'FX')
+ALL_AROUND = 'AA'
+ATHLETE = 'Athlete'
+
+SPELLINGS = {
+    'FX': ('FX', 'Floor', 'Floor Exercise'),
+    'PH': ('PH', 'Pommel', 'Pommels', 'Pomml', 'Pommel Horse'),
+    'SR': ('SR', 'Rings', 'Still Rings'),
+    'VT': ('VT', 'Vault'),
+    'PB': ('PB', 'PBars', 'PBar', 'P Bars', 'Parallel Bars'),
+    'HB': ('HB', 'HiBar', 'HBar', 'H Bar', 'HighBar', 'High Bar', 'Horizontal Bar'),
+    'UB': ('UB', 'Bars', 'Uneven Bars'),
+    'BB': ('BB', 'Beam', 'Balance Beam'),
+    'AA': ('AA', 'All Around', 'AllAround'),
+    ATHLETE: ('Athlete', 'Gymnast', 'Name'),
+}
+ALL_EVENTS = MEN_EVENTS + ('UB', 'BB', ALL_AROUND)
+# "VT Rank" / "Place" columns sit next to the scores but aren't scores
+NOT_SCORES = {'rank', 'place', 'pl', 'tie'}
+
+def _words(label):
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", str(label).casefold()).split())
+
+CODES = {_words(s).replace(" ", ""): code for code, spellings in SPELLINGS.items() for s in spellings}
+# Longest first, so "Parallel Bars" is tried before "Bars"; spaces inside a spelling are optional
+_HEADER = re.compile(r"\b(?:" + "|".join(
+    r"\s?".join(re.escape(w) for w in _words(s).split())
+    for s in sorted((s for v in SPELLINGS.values() for s in v), key=lambda s: -len(_words(s)))
+) + r")\b")
+
+@lru_cache(maxsize=4096)
+def label_code(label):
+    """Event code (or ATHLETE) for one header cell, or None: 'POMML' -> 'PH', 'Vault Score' -> 'VT'"""
+    words = _words(label)
+    if not words or NOT_SCORES & set(words.split()):
+        return None
+    code = CODES.get(words.replace(" ", ""))
+    if code is None:
+        match = _HEADER.search(words)
+        code = CODES.get(match.group(0).replace(" ", "")) if match else None
+    return code
+
+@lru_cache(maxsize=1024)
+def resolve_header(columns, codes=ALL_EVENTS):
+    """
+    {raw column: code} for a table header (a tuple of column labels), limited to `codes`.
+    The first column for each code wins. Cached per header signature, so every table
+    with the same layout costs one dict lookup. Treat the result as read-only.
+    """
+    mapping = {}
+    for col in columns:
+        code = label_code(col)
+        if code in codes and code not in mapping.values():
+            mapping[col] = code
+    return mapping
+
+def rename_events(df, codes=ALL_EVENTS):
+    """df with its event headers (and athlete column, if ATHLETE is in codes) renamed to our codes"""
+    return df.rename(columns=resolve_header(tuple(df.columns), tuple(codes)))
@@ -1,5 +1,6 @@
 import pandas as pd
 import io
+import columnar_store
 
 # This is the 655-row dataset I just harvested from your 9 PDFs
 csv_data = """Date,Gymnast,Meet,Session,Level,Division,Meet_Rank,Meet_Rank_Total,VT,VT_Rank,UB,UB_Rank,BB,BB_Rank,FX,FX_Rank,PH,PH_Rank,SR,SR_Rank,PB,PB_Rank,HB,HB_Rank,AA,AA_Rank
@@ -17,4 +18,5 @@ csv_data = """Date,Gymnast,Meet,Session,Level,Division,Meet_Rank,Meet_Rank_Total
 
 df = pd.read_csv(io.StringIO(csv_data))
 df.to_csv("session_raw_data.csv", index=False)
+columnar_store.refresh('session_raw')
 print("✅ session_raw_data.csv has been written to your Codespace!")
@@ -1,67 +1,60 @@
 import pandas as pd
-import cloudscraper
+import argparse
 from bs4 import BeautifulSoup
 from io import StringIO
-import re
-import time
+import schema
+import event_names
+import http_client
 
-def clean_and_split(val):
-if pd.isna(val) or not isinstance(val, str): return val, None
-match = re.match(r"(\d+.\d+)\s*(.*)", str(val))
-if match:
-try:
-score = float(match.group(1))
-rank = match.group(2).strip()
-return score, rank
-except:
-return val, None
-return val, None
-
-def get_all_tables(url, name):
-print("Checking " + name + " profile...")
-# Cloudscraper automatically handles the 'bot checks'
-scraper = cloudscraper.create_scraper()
-try:
-response = scraper.get(url)
-soup = BeautifulSoup(response.text, 'html.parser')
-valid_dfs = []
-for table in soup.find_all('table'):
-try:
-# Use StringIO to satisfy the modern Pandas requirement
-df = pd.read_html(StringIO(str(table)))[0]
-if any(c in df.columns for c in ['AA', 'Vault', 'VT', 'Date']):
-df['Gymnast'] = name
-valid_dfs.append(df)
-except:
-continue
-return pd.concat(valid_dfs, ignore_index=True) if valid_dfs else pd.DataFrame()
-except Exception as e:
-print("Error on " + name + ": " + str(e))
-return pd.DataFrame()
+def get_all_tables(response, name):
+    print("Checking " + name + " profile...")
+    if response is None:
+        return pd.DataFrame()
+    try:
+        soup = BeautifulSoup(response.text, 'html.parser')
+        valid_dfs = []
+        for table in soup.find_all('table'):
+            try:
+                # Use StringIO to satisfy the modern Pandas requirement
+                df = pd.read_html(StringIO(str(table)))[0]
+                if 'Date' in df.columns or event_names.resolve_header(tuple(df.columns), ('VT', 'AA')):
+                    df['Gymnast'] = name
+                    valid_dfs.append(df)
+            except:
+                continue
+        return pd.concat(valid_dfs, ignore_index=True) if valid_dfs else pd.DataFrame()
+    except Exception as e:
+        print("Error on " + name + ": " + str(e))
+        return pd.DataFrame()
 
 profiles = {
-"Annabelle": "",
-"Azalea": "",
-"Ansel": ""
+    "Annabelle": "",
+    "Azalea": "",
+    "Ansel": ""
 }
 
+parser = argparse.ArgumentParser(description="Scrapes every profile's history into gymnastics_history.csv")
+http_client.add_fetch_args(parser)
+http_client.configure_from(parser.parse_args())
+
 all_data = []
-for name, url in profiles.items():
-data = get_all_tables(url, name)
-if not data.empty:
-all_data.append(data)
-time.sleep(2)
+# The shared client handles the 'bot checks' and spaces the requests out (no fixed sleeps)
+responses = http_client.get_client().fetch_many(profiles.values())
+for name, response in zip(profiles, responses):
+    data = get_all_tables(response, name)
+    if not data.empty:
+        all_data.append(data)
 
 if all_data:
-master_df = pd.concat(all_data, ignore_index=True)
-cols = {'Vault':'VT', 'Bars':'UB', 'Beam':'BB', 'Floor':'FX', 'Pommel Horse':'PH', 'Still Rings':'SR', 'Parallel Bars':'PB', 'High Bar':'HB'}
-master_df.rename(columns=cols, inplace=True)
-for c in ['VT','UB','BB','FX','PH','SR','PB','HB','AA']:
-if c in master_df.columns:
-cleaned = master_df[c].apply(clean_and_split)
-master_df[c] = [x[0] for x in cleaned]
-master_df[c + '_Rank'] = [x[1] for x in cleaned]
-master_df.to_csv("gymnastics_history.csv", index=False)
-print("Success! Check your csv file.")
+    master_df = pd.concat(all_data, ignore_index=True)
+    master_df = event_names.rename_events(master_df)
+    # Split "9.300 1T" into score and rank for every event column in one pass
+    score_cols = [c for c in schema.EVENTS if c in master_df.columns]
+    scores, ranks, ties = schema.split_score_cells(master_df[score_cols])
+    for c in score_cols:
+        master_df[c] = schema.float64_scores(scores[c])
+        master_df[c + '_Rank'] = schema.rank_text(ranks[c], ties[c])
+    master_df.to_csv("gymnastics_history.csv", index=False)
+    print("Success! Check your csv file.")
 else:
-print("No data found. The site might be blocking this version of the scraper.")
+    print("No data found. The site might be blocking this version of the scraper.")
@@ -0,0 +1,181 @@
+# fixture_server.py
+
+import os
+import re
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from mso_json import read_meet_info
+from synthetic_season import ATHLETES, SYNTHETIC_MEET_BASE, seeded, synthetic_session, results_page, mms_page
+
+# A local stand-in for MeetScoresOnline and MyMeetScores, so the scrapers can be run and
+# timed without touching the real sites (point them here with --mirror, see http_client.py).
+# It answers the same URL schemes:
+#   /Athlete.MyScores/<athlete>            profile linking every meet below
+#   /results/<meet>/<athlete>              the saved page from HTML_FOLDER for that meet id,
+#                                          else a synthetic MSO results page
+#   /meet.pl?meetid=<id>&session=<sess>    a synthetic MyMeetScores session table
+# Pages are sized by the number of athletes in the session; every response waits a
+# lognormal delay (median --latency ms, spread --jitter) so there's a realistic tail,
+# and --error-rate answers a share of requests with 503s to exercise the retries.
+HTML_FOLDER = "ansel_history"
+PORT = 8800
+LATENCY_MS = 80
+JITTER = 0.5
+KNOWN_ATHLETES = {'1306508': "Ansel Sheehy", '1314119': "Annabelle Sheehy"}
+
+def mso_results_page(meet_id, athlete_id, athletes=ATHLETES):
+    """A synthetic MSO results page for a men's session, seen from `athlete_id`"""
+    session = synthetic_session(meet_id, 0, 'Men', athletes, seeded('mso', meet_id, athlete_id))
+    gymnast = KNOWN_ATHLETES.get(str(athlete_id), f"Gymnast {athlete_id}")
+    session['field'].loc[0, 'Gymnast'] = gymnast
+    return results_page(session, gymnast)
+
+def mms_session_page(meet_id, session, athletes=ATHLETES):
+    """A synthetic MyMeetScores women's session"""
+    page = synthetic_session(meet_id, 0, 'Women', athletes, seeded('mms', meet_id, session))
+    page['session'] = session
+    return mms_page(page)
+
+def profile_page(athlete_id, meet_ids):
+    links = "\n".join(f'<tr><td><a href="/results/{m}/{athlete_id}">View Scores</a></td></tr>' for m in meet_ids)
+    return f"<html><head><title>MyScores {athlete_id}</title></head><body><table>{links}</table></body></html>".encode('utf-8')
+
+def saved_pages(folder):
+    """{meet_id: raw page} from the saved MSO pages, athlete result pages ahead of session pages"""
+    pages = {}
+    if not os.path.isdir(folder):
+        return pages
+    names = sorted((f for f in os.listdir(folder) if f.endswith(".html")), key=lambda f: ("_session" in f, f))
+    for name in names:
+        with open(os.path.join(folder, name), 'rb') as f:
+            raw = f.read()
+        info = read_meet_info(raw)
+        if info and info.meet_id not in pages:
+            pages[info.meet_id] = raw
+    return pages
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as two writes; without this a keep-alive client waits on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        fixtures = self.server.fixtures
+        time.sleep(fixtures.delay())
+        if fixtures.failing():
+            return self._send(503, b"busy", {'Retry-After': '0'})
+        body = fixtures.page(self.path)
+        if body is None:
+            return self._send(404, b"not found")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, b"", {'ETag': etag})
+        self._send(200, body, {'ETag': etag})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FixtureServer:
+    """The fixture site on a background thread: `with FixtureServer(...) as server:` then fetch server.url + path"""
+
+    def __init__(self, folder=HTML_FOLDER, host="127.0.0.1", port=0, athletes=ATHLETES,
+                 latency_ms=LATENCY_MS, jitter=JITTER, error_rate=0.0, extra_meets=0, seed=0):
+        self.saved = saved_pages(folder)
+        self.athletes, self.latency, self.jitter = athletes, latency_ms / 1000, jitter
+        self.error_rate = error_rate
+        self.extra_meets = [SYNTHETIC_MEET_BASE + i for i in range(extra_meets)]
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.rendered = {}
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixtures = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self):
+        if self.latency <= 0:
+            return 0.0
+        with self.rng_lock:
+            return self.latency * self.rng.lognormvariate(0, self.jitter)
+
+    def failing(self):
+        with self.rng_lock:
+            return self.rng.random() < self.error_rate
+
+    def page(self, path):
+        """Body for a request path, or None for a 404. Synthetic pages are rendered once per URL."""
+        if path not in self.rendered:
+            self.rendered[path] = self._render(path)
+        return self.rendered[path]
+
+    def _render(self, path):
+        parts = urlsplit(path)
+        match = re.fullmatch(r"/results/(\d+)/(\d+)", parts.path)
+        if match:
+            meet_id, athlete_id = match.groups()
+            return self.saved.get(meet_id) or mso_results_page(meet_id, athlete_id, self.athletes)
+        match = re.fullmatch(r"/Athlete\.MyScores/(\d+)", parts.path)
+        if match:
+            return profile_page(match.group(1), list(self.saved) + self.extra_meets)
+        if parts.path == "/meet.pl":
+            query = parse_qs(parts.query)
+            if 'meetid' in query:
+                return mms_session_page(query['meetid'][0], query.get('session', [''])[0], self.athletes)
+        return None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    ap = argparse.ArgumentParser(description="Serves saved and synthetic MSO / MyMeetScores pages for local scraper runs")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--folder", default=HTML_FOLDER, help="Saved MSO pages to serve by meet id")
+    ap.add_argument("--athletes", type=int, default=ATHLETES, help="Athletes per synthetic session (page size)")
+    ap.add_argument("--latency", type=float, default=LATENCY_MS, help="Median response delay in ms")
+    ap.add_argument("--jitter", type=float, default=JITTER, help="Lognormal spread of the delay (0 = fixed)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    ap.add_argument("--extra-meets", type=int, default=0, help="Synthetic meets listed on every profile")
+    args = ap.parse_args()
+
+    server = FixtureServer(args.folder, port=args.port, athletes=args.athletes, latency_ms=args.latency,
+                           jitter=args.jitter, error_rate=args.error_rate, extra_meets=args.extra_meets)
+    print(f"🧪 Serving {len(server.saved)} saved meets + {args.extra_meets} synthetic at {server.url}")
+    print(f"   Run a scraper with --mirror {server.url} --no-cache")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
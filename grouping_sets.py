@@ -0,0 +1,73 @@
+# grouping_sets.py
+
+import numpy as np
+import pandas as pd
+
+# Every context level the bullet chart can show, finest to coarsest.
+# Each one is also split by Event, so a "group" is e.g. (Meet, Session, Level, Event).
+GROUPING_SETS = {
+    'Division': ['Meet', 'Session', 'Level', 'Division'],
+    'Session': ['Meet', 'Session', 'Level'],
+    'Season': ['Level'],
+}
+KEY_COLS = ['Meet', 'Session', 'Level', 'Division']
+QUANTILES = (0.25, 0.75)
+
+def group_rows(df):
+    """
+    Numbers every athlete row's group under each grouping set.
+    The key columns are factorized once; each set's id is then built from those
+    integer codes, so nothing downstream has to hash the strings again.
+    Returns {name: (row_group_ids, labels_df)} with labels_df row i describing group i.
+    """
+    # A blank Division is still a group of its own, not a row to drop
+    codes = {col: pd.factorize(df[col], sort=True, use_na_sentinel=False)[0] for col in KEY_COLS}
+    groups = {}
+    for name, cols in GROUPING_SETS.items():
+        dims = [int(codes[c].max()) + 1 if len(df) else 1 for c in cols]
+        flat = np.ravel_multi_index([codes[c] for c in cols], dims) if len(df) else np.zeros(0, int)
+        # Ids follow the sorted order of the labels because factorize(sort=True) did
+        _, first, ids = np.unique(flat, return_index=True, return_inverse=True)
+        labels = df[cols].iloc[first].reset_index(drop=True)
+        groups[name] = (ids, labels)
+    return groups
+
+def add_group_keys(long_df, groups, row_pos, event_pos, n_events):
+    """Adds a '<Grouping>_Key' column per grouping set: one int per (group, event)"""
+    for name, (ids, _) in groups.items():
+        long_df[f'{name}_Key'] = ids[row_pos] * n_events + event_pos
+    return long_df
+
+def grouping_stats(long_df, groups, events, quantiles=QUANTILES):
+    """
+    Tidy stats table with one row per (grouping level, group, event):
+    Grouping, Meet, Session, Level, Division, Event, Key, Count, Min, Median, Max, Q25, Q75.
+
+    Count covers every valid score; the rest only use scores flagged 'Kept'
+    (see session_context_analytics.apply_baseline_rules). Columns a grouping level
+    doesn't split by are left empty.
+    """
+    kept = long_df[long_df['Kept']]
+    q_names = [f"Q{int(q * 100)}" for q in quantiles]
+    tables = []
+    for name, (_, labels) in groups.items():
+        key = f'{name}_Key'
+        grouped = kept.groupby(key, sort=True)['Score']
+        stats = grouped.agg(Min='min', Median='median', Max='max')
+        if quantiles:
+            q = grouped.quantile(list(quantiles)).unstack()
+            q.columns = q_names
+            stats = stats.join(q)
+        stats['Count'] = long_df.groupby(key, sort=True).size()
+
+        keys = stats.index.to_numpy()
+        stats = stats.reset_index().rename(columns={key: 'Key'})
+        label_rows = labels.iloc[keys // len(events)].reset_index(drop=True)
+        for col in KEY_COLS:
+            stats[col] = label_rows[col] if col in label_rows else np.nan
+        stats['Event'] = np.asarray(events)[keys % len(events)]
+        stats['Grouping'] = name
+        tables.append(stats)
+
+    cols = ['Grouping'] + KEY_COLS + ['Event', 'Key', 'Count', 'Min', 'Median', 'Max'] + q_names
+    return pd.concat(tables, ignore_index=True)[cols]
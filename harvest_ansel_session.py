@@ -1,35 +1,27 @@
 import pandas as pd
-from bs4 import BeautifulSoup
-import json
 import os
+from mso_json import session_rows
 
 # Configuration
 SOURCE_FILE = "Ansel_Mas Watanabe_session.html"
 OUTPUT_CSV = "ansel_mas_watanabe_raw.csv"
 
-def extract_from_json_blob(soup):
+def extract_from_json_blob(raw):
     """
     MSO often hides the full results inside a JSON blob in the <script> tags.
     This is the most reliable way to get all 152 athletes.
     """
-    for script in soup.find_all("script"):
-        if script.string and "wbt.MeetInfo.Session" in script.string:
-            # We are looking for the 'row' data inside the Session object
-            try:
-                # This regex-like find helps us isolate the JSON part
-                start = script.string.find('wbt.MeetInfo.Session=') + len('wbt.MeetInfo.Session=')
-                end = script.string.find('};', start) + 1
-                json_data = json.loads(script.string[start:end])
-                
-                # Filter specifically for Level 4D1 as requested
-                rows = json_data['result']['row']
-                df = pd.DataFrame(rows)
-                
-                # Filter for the Level 4D1 session (Session 4)
-                level_4d1_df = df[df['level'] == '4D1'].copy()
-                return level_4d1_df
-            except Exception as e:
-                print(f"⚠️ JSON extraction failed: {e}")
+    try:
+        rows = session_rows(raw)
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows)
+
+        # Filter for the Level 4D1 session (Session 4)
+        level_4d1_df = df[df['level'] == '4D1'].copy()
+        return level_4d1_df
+    except Exception as e:
+        print(f"⚠️ JSON extraction failed: {e}")
     return pd.DataFrame()
 
 def main():
@@ -38,11 +30,11 @@ def main():
         return
 
     print(f"🚀 Parsing {SOURCE_FILE}...")
-    with open(SOURCE_FILE, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
+    with open(SOURCE_FILE, "rb") as f:
+        raw = f.read()
 
     # 1. Try JSON extraction (most complete for MSO)
-    df = extract_from_json_blob(soup)
+    df = extract_from_json_blob(raw)
 
     if df.empty:
         print("⚠️ JSON extraction yielded no results. Checking for standard tables...")
@@ -1,19 +1,26 @@
 import pandas as pd
-import cloudscraper
 import os
+import argparse
 from bs4 import BeautifulSoup
 from io import StringIO
 from meet_mapping import MMS_MEET_IDS
+import schema
+import http_client
+import event_names
+from mso_json import read_meet_info
 
 INPUT_CSV = "cleaned_gymnastics.csv"
 OUTPUT_CSV = "session_raw_data.csv"
 ANSEL_FOLDER = "ansel_history"
+# MyMeetScores girls tables: Gymnast plus the four events
+MMS_CODES = (event_names.ATHLETE,) + event_names.WOMEN_EVENTS
 
 def parse_mso_session_html(file_path):
     """Parses local MSO session HTML for both Men's and Women's layouts."""
     print(f"📂 Parsing Local Session: {os.path.basename(file_path)}")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    soup = BeautifulSoup(raw.decode('utf-8'), 'html.parser')
     
     rows = []
     # Identify table rows with gymnast data
@@ -46,26 +53,39 @@ def parse_mso_session_html(file_path):
                 'Source_File': os.path.basename(file_path)
             }
         rows.append(row)
-    return pd.DataFrame(rows)
+
+    df = pd.DataFrame(rows)
+    # The page's embedded meet JSON knows the real meet name; the filename only approximates it
+    info = read_meet_info(raw)
+    if info and info.meet_name and not df.empty:
+        df['Meet'] = info.meet_name
+    return df
 
 def main():
-    df_history = pd.read_csv(INPUT_CSV)
-    df_2026 = df_history[df_history['Date'].str.startswith('2026')].copy()
+    df_history = schema.read_csv(INPUT_CSV)
+    df_2026 = df_history[df_history['Date'].dt.year == 2026].copy()
     all_data = []
 
-    # 1. GIRLS: Auto-Scrape MyMeetScores
-    scraper = cloudscraper.create_scraper()
-    for _, row in df_2026.iterrows():
+    # 1. GIRLS: Auto-Scrape MyMeetScores, every session in one batch through the shared client
+    mms_rows = [row for _, row in df_2026.iterrows() if MMS_MEET_IDS.get(row['Meet'])]
+    urls = [f"https://www.mymeetscores.com/meet.pl?meetid={MMS_MEET_IDS[row['Meet']]}&session={row['Session']}"
+            for row in mms_rows]
+    # Sisters in the same session share a page: fetch each url once
+    first_date = {}
+    for url, row in zip(urls, mms_rows):
+        first_date.setdefault(url, row['Date'])
+    fetched = dict(zip(first_date, http_client.get_client().fetch_many(first_date, meet_dates=first_date.values())))
+    for row, url in zip(mms_rows, urls):
+        resp = fetched[url]
         m_name = row['Meet']
-        if m_name in MMS_MEET_IDS and MMS_MEET_IDS[m_name]:
-            url = f"https://www.mymeetscores.com/meet.pl?meetid={MMS_MEET_IDS[m_name]}&session={row['Session']}"
-            print(f"📡 Scraping MMS: {m_name} (Sess {row['Session']})")
+        print(f"📡 Scraping MMS: {m_name} (Sess {row['Session']})")
+        if resp is not None:
             try:
-                resp = scraper.get(url)
                 tables = pd.read_html(StringIO(resp.text))
                 for df in tables:
-                    if 'Gymnast' in df.columns or 'Vault' in df.columns:
-                        df.rename(columns={'Gymnast':'Athlete','Vault':'VT','Bars':'UB','Beam':'BB','Floor':'FX'}, inplace=True)
+                    header = event_names.resolve_header(tuple(df.columns), MMS_CODES)
+                    if {event_names.ATHLETE, 'VT'} & set(header.values()):
+                        df.rename(columns=header, inplace=True)
                         df['Meet'] = m_name
                         df['Session'] = row['Session']
                         all_data.append(df)
@@ -77,8 +97,9 @@ def main():
             if "_session" in f and f.endswith(".html"):
                 df_local = parse_mso_session_html(os.path.join(ANSEL_FOLDER, f))
                 if not df_local.empty:
-                    # Map the filename back to the meet if possible
-                    df_local['Meet'] = f.replace('_session.html', '').replace('_', ' ').title()
+                    # Map the filename back to the meet if the page didn't say
+                    if 'Meet' not in df_local.columns:
+                        df_local['Meet'] = f.replace('_session.html', '').replace('_', ' ').title()
                     all_data.append(df_local)
 
     if all_data:
@@ -94,4 +115,7 @@ def main():
         print(f"🎉 Done! {len(final_df)} rows of raw context saved to {OUTPUT_CSV}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds session_raw_data.csv from MyMeetScores and local MSO pages")
+    http_client.add_fetch_args(parser)
+    http_client.configure_from(parser.parse_args())
     main()
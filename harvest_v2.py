@@ -1,46 +1,30 @@
 import pandas as pd
 import os
-import re
-import cloudscraper
+import argparse
 from bs4 import BeautifulSoup
 from io import StringIO
 from meet_mapping import MMS_MEET_IDS
+import schema
+import http_client
+import event_names
+from mso_json import read_meet_info, level_total
 
 # Settings
 INPUT_CSV = "cleaned_gymnastics.csv"
 OUTPUT_CSV = "session_raw_data.csv"
 HTML_FOLDER = "ansel_history"
 
-def clean_score(val):
-    """Strictly extracts only a decimal number (e.g., '9.200 1' -> 9.2)"""
-    if pd.isna(val) or val == "": return 0.0
-    match = re.search(r"(\d+\.\d+)", str(val))
-    return float(match.group(1)) if match else 0.0
-
 def parse_session_table(df, discipline, meet, session):
     """Standardizes a raw table based on if it's Men's or Women's."""
     df = df.copy()
     
-    # Try to find the Athlete Name column (it varies by site)
-    name_col = next((c for c in df.columns if any(x in str(c).lower() for x in ['gymnast', 'athlete', 'name'])), None)
-    if name_col:
-        df = df.rename(columns={name_col: 'Athlete'})
-    
-    # Standardize Event Headers
-    if discipline == "Men":
-        mapping = {'Floor': 'FX', 'Pommel': 'PH', 'Rings': 'SR', 'Vault': 'VT', 'P Bars': 'PB', 'H Bar': 'HB', 'AA': 'AA'}
-    else:
-        mapping = {'Vault': 'VT', 'Bars': 'UB', 'Beam': 'BB', 'Floor': 'FX', 'AA': 'AA'}
-    
-    # Rename columns that match our mapping
-    for raw_col, clean_col in mapping.items():
-        # Find column that contains the raw string (e.g. 'Vault' in 'Vault Score')
-        match = next((c for c in df.columns if raw_col.lower() in str(c).lower()), None)
-        if match:
-            df = df.rename(columns={match: clean_col})
+    # Standardize the Athlete Name column (it varies by site) and the Event Headers
+    # in one lookup; tables with the same header share the resolved mapping
+    event_codes = (event_names.MEN_EVENTS if discipline == "Men" else event_names.WOMEN_EVENTS) + (event_names.ALL_AROUND,)
+    df = event_names.rename_events(df, (event_names.ATHLETE,) + event_codes)
     
     # Keep only the columns we care about
-    cols_to_keep = ['Athlete'] + list(mapping.values())
+    cols_to_keep = [event_names.ATHLETE] + list(event_codes)
     df = df[[c for c in cols_to_keep if c in df.columns]]
     
     # Add Metadata
@@ -48,65 +32,138 @@ def parse_session_table(df, discipline, meet, session):
     df['Session'] = session
     df['Discipline'] = discipline
     
-    # Clean all score columns
-    for col in mapping.values():
-        if col in df.columns:
-            df[col] = df[col].apply(clean_score)
+    # Clean all score columns in one pass: strictly the decimal score (e.g., '9.200 1' -> 9.2)
+    score_cols = [col for col in event_codes if col in df.columns]
+    scores, _, _ = schema.split_score_cells(df[score_cols])
+    for col in score_cols:
+        df[col] = schema.float64_scores(scores[col]).fillna(0.0)
             
     return df
 
+def discipline_of(gymnast):
+    return "Men" if gymnast == "Ansel" else "Women"
+
+def unit_of(row):
+    meet, sess = row['Meet'], row['Session']
+    discipline = discipline_of(row['Gymnast'])
+    # PATH A: MyMeetScores (Automated for Girls); PATH B: Local HTML (For Ansel/MSO)
+    if discipline == "Women" and meet in MMS_MEET_IDS and MMS_MEET_IDS[meet]:
+        return ('mms', meet, sess)
+    return ('local', meet, sess, discipline)
+
+def plan_units(targets):
+    """
+    Collapses the target rows (one per gymnast per meet) into unique fetch units, in
+    first-seen order: {unit: [rows that need it]}. A unit is ('mms', meet, session) for
+    MyMeetScores or ('local', meet, session, discipline) for a saved MSO page, so sisters
+    at the same MMS session share one fetch and one parse.
+    """
+    units = {}
+    for _, row in targets.iterrows():
+        units.setdefault(unit_of(row), []).append(row)
+    return units
+
+def mms_url(meet, sess):
+    return f"https://www.mymeetscores.com/meet.pl?meetid={MMS_MEET_IDS[meet]}&session={sess}"
+
+class LocalPages:
+    """The HTML_FOLDER listing, read once; each page is parsed at most once however many units point at it"""
+
+    def __init__(self, folder):
+        self.files = [f for f in os.listdir(folder) if f.endswith(".html")] if os.path.isdir(folder) else []
+        self.folder = folder
+        self.parsed = {}
+
+    def candidates(self, sess):
+        # Same rule as always: any page whose file name contains the session
+        return [f for f in self.files if str(sess) in f]
+
+    def table(self, name):
+        """(raw bytes, first results table) for a page, or None if it has no table or won't parse"""
+        if name not in self.parsed:
+            self.parsed[name] = None
+            try:
+                with open(os.path.join(self.folder, name), 'rb') as file:
+                    raw = file.read()
+                # MSO tables are often messy for read_html, so we use BeautifulSoup
+                soup = BeautifulSoup(raw.decode('utf-8'), 'html.parser')
+                # Find the main results table
+                table = soup.find('table')
+                if table:
+                    self.parsed[name] = (raw, pd.read_html(StringIO(str(table)))[0])
+            except Exception as e:
+                print(f"   ❌ HTML Parse failed: {e}")
+        return self.parsed[name]
+
+def run_mms_units(units, client):
+    """Fetches every MMS unit in one batch. Returns {unit: clean_df or None}."""
+    urls = [mms_url(meet, sess) for _, meet, sess in units]
+    dates = [units[unit][0]['Date'] for unit in units]
+    results = {}
+    for unit, resp in zip(units, client.fetch_many(urls, meet_dates=dates)):
+        _, meet, sess = unit
+        results[unit] = None
+        try:
+            if resp is None:
+                raise ValueError("no response")
+            for df in pd.read_html(StringIO(resp.text)):
+                if any(x in str(df.columns).lower() for x in ['vault', 'gymnast']):
+                    results[unit] = parse_session_table(df, "Women", meet, sess)
+                    break
+        except Exception as e:
+            print(f"   ❌ MMS Scrape failed for {meet} ({sess}): {e}")
+    return results
+
+def run_local_unit(unit, pages):
+    """(clean_df, raw page) from the first saved page for the unit's session that parses, or None"""
+    _, meet, sess, discipline = unit
+    for name in pages.candidates(sess):
+        parsed = pages.table(name)
+        if parsed:
+            raw, df = parsed
+            try:
+                return parse_session_table(df, discipline, meet, sess), raw
+            except Exception as e:
+                print(f"   ❌ HTML Parse failed: {e}")
+    return None
+
 def main():
     # 1. Load targets from your primary CSV
-    master_df = pd.read_csv(INPUT_CSV)
-    targets = master_df[master_df['Date'].str.startswith('2026')].copy()
-    
-    all_sessions = []
-    scraper = cloudscraper.create_scraper()
+    master_df = schema.read_csv(INPUT_CSV)
+    targets = master_df[master_df['Date'].dt.year == 2026].copy()
+
+    # 2. Plan: one unit per distinct (source, meet, session), then run each unit once
+    units = plan_units(targets)
+    print(f"🗺️ {len(targets)} targets -> {len(units)} fetch units")
+    pages = LocalPages(HTML_FOLDER)
+    results = run_mms_units({u: rows for u, rows in units.items() if u[0] == 'mms'}, http_client.get_client())
+    for unit in units:
+        if unit[0] == 'local':
+            results[unit] = run_local_unit(unit, pages)
 
+    # 3. Fan each parsed table back out to every gymnast that needed it
+    all_sessions = []
     for _, row in targets.iterrows():
         meet, sess, gymnast = row['Meet'], row['Session'], row['Gymnast']
-        discipline = "Men" if gymnast == "Ansel" else "Women"
-        
         print(f"🔄 Processing {meet} ({sess}) for {gymnast}...")
+        unit = unit_of(row)
+        result = results[unit]
 
-        # PATH A: MyMeetScores (Automated for Girls)
-        if discipline == "Women" and meet in MMS_MEET_IDS and MMS_MEET_IDS[meet]:
-            url = f"https://www.mymeetscores.com/meet.pl?meetid={MMS_MEET_IDS[meet]}&session={sess}"
-            try:
-                resp = scraper.get(url)
-                tables = pd.read_html(StringIO(resp.text))
-                for df in tables:
-                    if any(x in str(df.columns).lower() for x in ['vault', 'gymnast']):
-                        clean_df = parse_session_table(df, "Women", meet, sess)
-                        all_sessions.append(clean_df)
-                        print(f"   ✅ Scraped {len(clean_df)} athletes from MMS.")
-                        break
-            except Exception as e:
-                print(f"   ❌ MMS Scrape failed: {e}")
-
-        # PATH B: Local HTML (For Ansel/MSO)
+        if unit[0] == 'mms':
+            if result is not None:
+                all_sessions.append(result)
+                print(f"   ✅ Scraped {len(result)} athletes from MMS.")
+        elif result is None:
+            print(f"   ⚠️ No session HTML found for {meet} ({sess}) in {HTML_FOLDER}")
         else:
-            # Look for a file in ansel_history that matches this meet
-            found_file = False
-            for f in os.listdir(HTML_FOLDER):
-                if sess in f and f.endswith(".html"):
-                    try:
-                        with open(os.path.join(HTML_FOLDER, f), 'r', encoding='utf-8') as file:
-                            # MSO tables are often messy for read_html, so we use BeautifulSoup
-                            soup = BeautifulSoup(file.read(), 'html.parser')
-                            # Find the main results table
-                            table = soup.find('table') 
-                            if table:
-                                df = pd.read_html(StringIO(str(table)))[0]
-                                clean_df = parse_session_table(df, discipline, meet, sess)
-                                all_sessions.append(clean_df)
-                                print(f"   ✅ Parsed {len(clean_df)} athletes from local HTML.")
-                                found_file = True
-                                break
-                    except Exception as e:
-                        print(f"   ❌ HTML Parse failed: {e}")
-            if not found_file:
-                print(f"   ⚠️ No session HTML found for {meet} ({sess}) in {HTML_FOLDER}")
+            clean_df, raw = result
+            all_sessions.append(clean_df)
+            print(f"   ✅ Parsed {len(clean_df)} athletes from local HTML.")
+            # Validation: compare against the field size in the page's meet JSON
+            info = read_meet_info(raw)
+            expected = level_total(info, row['Level'], sess) if info else 0
+            if expected and expected != len(clean_df):
+                print(f"   📊 Note: expected {expected} Level {row['Level']} athletes in session {sess}.")
 
     if all_sessions:
         final_df = pd.concat(all_sessions, ignore_index=True)
@@ -116,4 +173,7 @@ def main():
         print("\n❌ Failed to collect any data.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrapes full session results for every 2026 meet")
+    http_client.add_fetch_args(parser)
+    http_client.configure_from(parser.parse_args())
     main()
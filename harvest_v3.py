@@ -1,6 +1,9 @@
 import pandas as pd
 import os
-import re
+import schema
+import event_names
+from io import StringIO
+from mso_json import read_meet_info, level_total
 
 # Configuration
 FOLDER = "ansel_history"
@@ -8,28 +11,30 @@ SOURCE_FILE = "Ansel_Mas Watanabe_session.html"
 FULL_PATH = os.path.join(FOLDER, SOURCE_FILE)
 OUTPUT_CSV = "ansel_mas_watanabe_raw.csv"
 
-def split_score_rank(val):
-    """Splits '9.300 1T' into ('9.300', '1T')"""
-    val = str(val).strip()
-    if not val or val.lower() == "nan":
-        return "0.0", ""
-    # Matches the score (decimal) and everything following it (rank)
-    match = re.search(r"(\d+\.\d+)\s*(.*)", val)
-    if match:
-        return match.group(1), match.group(2)
-    return val, ""
+MEN_CODES = event_names.MEN_EVENTS + (event_names.ALL_AROUND,)
 
 def main():
     if not os.path.exists(FULL_PATH):
         print(f"❌ File {FULL_PATH} not found.")
         return
 
+    with open(FULL_PATH, "rb") as f:
+        raw = f.read()
+
+    # Meet name/date/field size come straight from the embedded MSO JSON
+    meet_name, meet_date, level_count = "2026 Mas Watanabe", "2026-02-13", 152
+    info = read_meet_info(raw)
+    if info:
+        meet_name, meet_date = info.meet_name, info.start_date
+        level_count = level_total(info, "4D1") or level_count
+
     # 1. Load the data table
-    all_tables = pd.read_html(FULL_PATH)
-    target_df = None
+    all_tables = pd.read_html(StringIO(raw.decode("utf-8")))
+    target_df, header = None, {}
     for df in all_tables:
-        cols = [str(c).lower() for c in df.columns]
-        if 'aa' in cols and any('floor' in c or 'vault' in c for c in cols):
+        header = event_names.resolve_header(tuple(df.columns), MEN_CODES)
+        found = set(header.values())
+        if 'AA' in found and found & {'FX', 'VT'}:
             target_df = df
             break
 
@@ -45,53 +50,36 @@ def main():
         "PB", "PB_Rank", "HB", "HB_Rank", "AA", "AA_Rank"
     ]
     
-    final_rows = []
-
-    # 3. Process each athlete row
-    for _, row in target_df.iterrows():
-        # Map raw columns to our standardized score/rank logic
-        # Note: MSO Column indices: Floor(2), Pommel(3), Rings(4), Vault(5), PBars(6), HiBar(7), AA(8)
-        # We use column name lookups for safety
-        def get_val(keyword):
-            col = next((c for c in target_df.columns if keyword.lower() in str(c).lower()), None)
-            return split_score_rank(row[col]) if col else ("0.0", "")
-
-        fx_s, fx_r = get_val('Floor')
-        ph_s, ph_r = get_val('Pommel')
-        sr_s, sr_r = get_val('Rings')
-        vt_s, vt_r = get_val('Vault')
-        pb_s, pb_r = get_val('PBars')
-        hb_s, hb_r = get_val('HiBar')
-        aa_s, aa_r = get_val('AA')
+    # 3. Split every athlete's "9.300 1T" cells in one pass
+    # Column name lookups for safety (MSO order is Floor, Pommel, Rings, Vault, PBars, HiBar, AA)
+    event_cols = {evt: col for col, evt in header.items()}
+    raw = target_df[list(event_cols.values())].set_axis(list(event_cols), axis=1)
+    scores, ranks, ties = schema.split_score_cells(raw)
 
-        # Create the dictionary matching the 26 headers exactly
-        data_row = {
-            "Date": "2026-02-13",
-            "Gymnast": row[target_df.columns[0]], # Athlete Name
-            "Meet": "2026 Mas Watanabe",
-            "Session": "4",
-            "Level": "4D1",
-            "Division": row[target_df.columns[4]] if len(target_df.columns) > 4 else "",
-            "Meet_Rank": aa_r,
-            "Meet_Rank_Total": "152",
-            "VT": vt_s, "VT_Rank": vt_r,
-            "UB": "0.0", "UB_Rank": "", # Girls event
-            "BB": "0.0", "BB_Rank": "", # Girls event
-            "FX": fx_s, "FX_Rank": fx_r,
-            "PH": ph_s, "PH_Rank": ph_r,
-            "SR": sr_s, "SR_Rank": sr_r,
-            "PB": pb_s, "PB_Rank": pb_r,
-            "HB": hb_s, "HB_Rank": hb_r,
-            "AA": aa_s, "AA_Rank": aa_r
-        }
-        final_rows.append(data_row)
+    output_df = pd.DataFrame({
+        "Date": meet_date,
+        "Gymnast": target_df[target_df.columns[0]], # Athlete Name
+        "Meet": meet_name,
+        "Session": "4",
+        "Level": "4D1",
+        "Division": target_df[target_df.columns[4]] if len(target_df.columns) > 4 else "",
+        "Meet_Rank_Total": str(level_count),
+    }, index=target_df.index)
+    for evt in event_cols:
+        output_df[evt] = scores[evt]
+        output_df[evt + "_Rank"] = ranks[evt]
+        output_df[schema.tie_col(evt + "_Rank")] = ties[evt]
+    if "AA" in event_cols:
+        output_df["Meet_Rank"] = ranks["AA"]
+        output_df[schema.tie_col("Meet_Rank")] = ties["AA"]
+    # UB/BB are girls events; anything missing stays blank
+    output_df = output_df.reindex(columns=master_headers + [schema.tie_col(c) for c in schema.RANK_COLS])
 
     # 4. Save to CSV
-    output_df = pd.DataFrame(final_rows, columns=master_headers)
-    output_df.to_csv(OUTPUT_CSV, index=False)
+    schema.write_csv(output_df, OUTPUT_CSV)
     
     print(f"✅ Success! Created {OUTPUT_CSV} with {len(output_df)} rows.")
-    print(f"🎯 Target count: 152. Found: {len(output_df)}.")
+    print(f"🎯 Target count: {level_count}. Found: {len(output_df)}.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,168 @@
+# http_cache.py
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import argparse
+from datetime import date, datetime, timedelta
+from mso_json import read_meet_info
+
+# Persistent response cache for the scrapers, keyed by URL. Bodies are stored once per
+# content hash (blobs/<sha256>), so the same page reached through two URLs costs one
+# file; each URL gets a small JSON entry (index/<sha256 of url>.json) with its status,
+# validators (ETag / Last-Modified) and expiry.
+#   * finished meets never expire - their scores won't change again
+#   * meets still in progress expire after LIVE_TTL, pages we can't date after DEFAULT_TTL
+#   * a stale entry with validators is revalidated (304 = keep the stored body)
+CACHE_DIR = "http_cache"
+LIVE_TTL = 5 * 60
+DEFAULT_TTL = 6 * 60 * 60
+# A meet this many days past its end date is treated as final
+FINAL_AFTER_DAYS = 3
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _as_date(value):
+    """date from a date/datetime/Timestamp or a 'YYYY-MM-DD...' string; None if it isn't one"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+def ttl_for(body, meet_date=None, today=None):
+    """
+    Seconds until a page expires, or None for never. MSO pages say themselves whether the
+    meet is complete (and when it ended); for other pages the caller's `meet_date` decides.
+    """
+    today = today or date.today()
+    info = read_meet_info(body) if b"wbt.MeetInfo" in body else None
+    if info:
+        if 'complete' in info.status.lower():
+            return None
+        meet_date = info.end_date or info.start_date or meet_date
+    when = _as_date(meet_date) if meet_date is not None else None
+    if when is None:
+        return DEFAULT_TTL
+    if when <= today - timedelta(days=FINAL_AFTER_DAYS):
+        return None
+    return LIVE_TTL
+
+class CacheEntry:
+    def __init__(self, meta, body):
+        self.meta = meta
+        self.body = body
+
+    def fresh(self, now=None):
+        expires = self.meta.get('expires')
+        return expires is None or (now or time.time()) < expires
+
+    def validators(self):
+        """If-None-Match / If-Modified-Since headers for a conditional re-fetch"""
+        headers = {}
+        if self.meta['headers'].get('ETag'):
+            headers['If-None-Match'] = self.meta['headers']['ETag']
+        if self.meta['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = self.meta['headers']['Last-Modified']
+        return headers
+
+class HttpCache:
+    def __init__(self, folder=CACHE_DIR):
+        self.folder = folder
+        self.index_dir = os.path.join(folder, "index")
+        self.blob_dir = os.path.join(folder, "blobs")
+        os.makedirs(self.index_dir, exist_ok=True)
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def _entry_path(self, url):
+        return os.path.join(self.index_dir, _sha(url.encode('utf-8')) + ".json")
+
+    def _write(self, path, data):
+        # Temp file first, so a concurrent reader never sees half an entry. Each write gets
+        # its own (fetch_many's threads can store the same entry or blob at once)
+        folder, name = os.path.split(path)
+        fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=folder)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def lookup(self, url):
+        """The stored CacheEntry for url (fresh or not), or None"""
+        try:
+            with open(self._entry_path(url), 'rb') as f:
+                meta = json.loads(f.read())
+            with open(os.path.join(self.blob_dir, meta['blob']), 'rb') as f:
+                return CacheEntry(meta, f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store(self, url, status, headers, body, meet_date=None):
+        blob = _sha(body)
+        blob_path = os.path.join(self.blob_dir, blob)
+        if not os.path.exists(blob_path):
+            self._write(blob_path, body)
+        ttl = ttl_for(body, meet_date)
+        meta = {
+            'url': url, 'status': status, 'blob': blob, 'fetched': time.time(),
+            'expires': None if ttl is None else time.time() + ttl,
+            'headers': {k: headers[k] for k in KEPT_HEADERS if k in headers},
+        }
+        self._write(self._entry_path(url), json.dumps(meta).encode('utf-8'))
+        return CacheEntry(meta, body)
+
+    def refresh(self, entry, meet_date=None):
+        """A 304 came back: same body, new expiry"""
+        return self.store(entry.meta['url'], entry.meta['status'], entry.meta['headers'], entry.body, meet_date)
+
+    def entries(self):
+        for name in os.listdir(self.index_dir):
+            if name.endswith(".json"):
+                with open(os.path.join(self.index_dir, name), 'rb') as f:
+                    yield name, json.loads(f.read())
+
+    def prune(self, expired=True):
+        """Drops expired entries (if asked) and any blob no entry points at. Returns (entries, blobs) removed."""
+        now, kept, dropped = time.time(), set(), 0
+        for name, meta in list(self.entries()):
+            if expired and meta.get('expires') is not None and meta['expires'] <= now:
+                os.remove(os.path.join(self.index_dir, name))
+                dropped += 1
+            else:
+                kept.add(meta['blob'])
+        orphans = [b for b in os.listdir(self.blob_dir) if b not in kept and not b.endswith(".tmp")]
+        for blob in orphans:
+            os.remove(os.path.join(self.blob_dir, blob))
+        return dropped, len(orphans)
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspects or prunes the scrapers' HTTP cache")
+    ap.add_argument("--folder", default=CACHE_DIR)
+    ap.add_argument("--prune", action="store_true", help="Drop expired entries and unreferenced bodies")
+    args = ap.parse_args()
+
+    cache = HttpCache(args.folder)
+    if args.prune:
+        entries, blobs = cache.prune()
+        print(f"🧹 Removed {entries} expired entries and {blobs} unused bodies")
+
+    now = time.time()
+    metas = [meta for _, meta in cache.entries()]
+    final = sum(1 for m in metas if m.get('expires') is None)
+    fresh = sum(1 for m in metas if m.get('expires') is not None and m['expires'] > now)
+    size = sum(os.path.getsize(os.path.join(cache.blob_dir, b)) for b in os.listdir(cache.blob_dir))
+    print(f"📦 {len(metas)} URLs ({final} final, {fresh} fresh, {len(metas) - final - fresh} stale), "
+          f"{len(os.listdir(cache.blob_dir))} bodies, {size / 1024:,.0f} KB")
+
+if __name__ == "__main__":
+    main()
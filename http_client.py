@@ -0,0 +1,255 @@
+# http_client.py
+
+import time
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import HttpCache, CACHE_DIR
+
+# One fetch layer for every scraper: a single (cloudscraper) session so connections and
+# the Cloudflare clearance cookie are reused, at most PER_HOST requests in flight per
+# host, and a token bucket per host instead of a fixed time.sleep(2) between pages.
+# A season of meets then takes about len(urls) / RATE seconds, with the network
+# latency overlapped, instead of len(urls) * (latency + 2 s).
+# With a cache (http_cache.py) fresh pages never touch the network or the rate limit,
+# and --offline serves everything from disk.
+RATE = 0.5          # requests per second per host (the old "sleep 2 between meets")
+BURST = 2           # requests a host can take back to back after a quiet spell
+PER_HOST = 4        # concurrent requests per host
+RETRIES = 3
+BACKOFF = 1.0       # seconds; doubles on every retry
+TIMEOUT = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# What --mirror redirects (to fixture_server.py, say), keeping path and query
+MIRRORED_HOSTS = {'meetscoresonline.com', 'www.meetscoresonline.com', 'mymeetscores.com', 'www.mymeetscores.com'}
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens a second, holding at most `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is free, then takes it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class OfflineMiss(Exception):
+    """Offline mode and the page was never cached"""
+
+def cached_response(url, entry):
+    """A requests.Response rebuilt from a cache entry (response.from_cache is True)"""
+    response = requests.Response()
+    response.url = url
+    response.status_code = entry.meta['status']
+    response._content = entry.body
+    response.headers.update(entry.meta['headers'])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+def default_session():
+    """cloudscraper gets past MSO's bot check; any requests.Session works (e.g. against a local server)"""
+    try:
+        import cloudscraper
+        return cloudscraper.create_scraper()
+    except ImportError:
+        return requests.Session()
+
+def widen_pools(session, maxsize):
+    """
+    Lets each of the session's adapters keep `maxsize` connections per host. Resizes the
+    adapters in place rather than mounting new ones: cloudscraper's CipherSuiteAdapter
+    carries its TLS setup, and replacing it would undo that.
+    """
+    for adapter in session.adapters.values():
+        if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < maxsize:
+            adapter.poolmanager.clear()
+            # Subclasses (CipherSuiteAdapter) add their ssl_context in init_poolmanager
+            adapter.init_poolmanager(adapter._pool_connections, maxsize, block=adapter._pool_block)
+
+class HttpClient:
+    def __init__(self, session=None, rate=RATE, burst=BURST, per_host=PER_HOST,
+                 retries=RETRIES, backoff=BACKOFF, timeout=TIMEOUT, cache=None, offline=False, mirror=None):
+        if offline and cache is None:
+            raise ValueError("offline mode needs a cache to serve from")
+        self.session = session or default_session()
+        # Keep-alive pool big enough that concurrent requests to one host don't open new sockets
+        widen_pools(self.session, per_host)
+        self.rate, self.burst, self.per_host = rate, burst, per_host
+        self.retries, self.backoff, self.timeout = retries, backoff, timeout
+        self.cache, self.offline = cache, offline
+        self.mirror = urlsplit(mirror) if mirror else None
+        self.hosts = {}
+        self.lock = threading.Lock()
+        # hit / revalidated / fetched / miss counts and seconds per network request, for the benchmarks
+        self.stats = Counter()
+        self.latencies = []
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def mirrored(self, url):
+        """url with an MSO/MMS host swapped for the mirror's (unchanged without a mirror)"""
+        parts = urlsplit(url)
+        if self.mirror is None or parts.netloc.lower() not in MIRRORED_HOSTS:
+            return url
+        return urlunsplit((self.mirror.scheme, self.mirror.netloc, parts.path, parts.query, parts.fragment))
+
+    def _host(self, url):
+        """(token bucket, semaphore) for the url's host"""
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = (TokenBucket(self.rate, self.burst), threading.Semaphore(self.per_host))
+            return self.hosts[host]
+
+    def get(self, url, meet_date=None, **kwargs):
+        """
+        A fresh cached copy if there is one (any cached copy when offline). Otherwise a GET
+        with the host's rate limit and concurrency cap, conditional if a stale copy has
+        validators; the result is cached with an expiry from http_cache.ttl_for(), which
+        uses `meet_date` for pages that don't carry their own meet dates.
+        """
+        url = self.mirrored(url)
+        entry = self.cache.lookup(url) if self.cache is not None else None
+        if entry is not None and (self.offline or entry.fresh()):
+            self._count('hit')
+            return cached_response(url, entry)
+        if self.offline:
+            self._count('miss')
+            raise OfflineMiss("not cached (offline mode)")
+        if entry is not None:
+            kwargs['headers'] = {**entry.validators(), **kwargs.get('headers', {})}
+
+        response = self._fetch(url, **kwargs)
+        if self.cache is not None:
+            if response.status_code == 304 and entry is not None:
+                self._count('revalidated')
+                return cached_response(url, self.cache.refresh(entry, meet_date))
+            if response.status_code == 200:
+                self.cache.store(url, 200, response.headers, response.content, meet_date)
+        self._count('fetched')
+        return response
+
+    def _fetch(self, url, **kwargs):
+        """
+        The network GET. Retries connection errors, timeouts and 429/5xx with exponential
+        backoff (or the server's Retry-After). Returns the last response, or raises the
+        last connection error.
+        """
+        bucket, slots = self._host(url)
+        kwargs.setdefault('timeout', self.timeout)
+        with slots:
+            for attempt in range(self.retries + 1):
+                bucket.acquire()
+                start = time.perf_counter()
+                try:
+                    response = self.session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt == self.retries:
+                        raise
+                    time.sleep(self.backoff * 2 ** attempt)
+                    continue
+                finally:
+                    with self.lock:
+                        self.latencies.append(time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                retry_after = response.headers.get('Retry-After', '')
+                time.sleep(float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt)
+
+    def fetch_many(self, urls, meet_dates=None, **kwargs):
+        """
+        Fetches every url concurrently (each host still gets its own rate limit and cap).
+        `meet_dates`, if given, lines up with `urls` (see get()). Returns responses in the
+        same order as `urls`; a url that failed outright is None.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        meet_dates = list(meet_dates) if meet_dates is not None else [None] * len(urls)
+
+        def fetch(url, meet_date):
+            try:
+                return self.get(url, meet_date=meet_date, **kwargs)
+            except Exception as e:
+                print(f"   ⚠️ Fetch failed for {url}: {e}")
+                return None
+
+        hosts = {urlsplit(u).netloc.lower() for u in urls}
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.per_host * len(hosts))) as pool:
+            return list(pool.map(fetch, urls, meet_dates))
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """The process-wide client every scraper shares (cached, online, unless configure() said otherwise)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=HttpCache())
+        return _client
+
+def configure(offline=False, use_cache=True, cache_dir=CACHE_DIR, mirror=None, session=None, **limits):
+    """Replaces the shared client; call before the first fetch. `limits` are HttpClient's rate/burst/per_host/..."""
+    global _client
+    with _client_lock:
+        cache = HttpCache(cache_dir) if use_cache or offline else None
+        _client = HttpClient(session, cache=cache, offline=offline, mirror=mirror, **limits)
+        return _client
+
+def add_fetch_args(ap):
+    """--offline / --no-cache / --mirror for a scraper's argparse"""
+    ap.add_argument("--offline", action="store_true", help="Serve every page from the HTTP cache, never the network")
+    ap.add_argument("--no-cache", action="store_true", help="Fetch everything fresh and don't write the cache")
+    ap.add_argument("--mirror", help="Send MSO/MyMeetScores requests here instead (e.g. http://127.0.0.1:8800 from fixture_server.py)")
+
+def configure_from(args):
+    return configure(offline=args.offline, use_cache=not args.no_cache, mirror=args.mirror)
+
+def main():
+    ap = argparse.ArgumentParser(description="Fetches URLs through the shared client and reports timings")
+    ap.add_argument("urls", nargs="+")
+    ap.add_argument("--rate", type=float, default=RATE, help="Requests per second per host")
+    ap.add_argument("--burst", type=int, default=BURST)
+    ap.add_argument("--per-host", type=int, default=PER_HOST, help="Concurrent requests per host")
+    ap.add_argument("--plain", action="store_true", help="Plain requests session instead of cloudscraper")
+    add_fetch_args(ap)
+    args = ap.parse_args()
+
+    cache = HttpCache() if args.offline or not args.no_cache else None
+    client = HttpClient(requests.Session() if args.plain else None, rate=args.rate, burst=args.burst,
+                        per_host=args.per_host, cache=cache, offline=args.offline, mirror=args.mirror)
+    start = time.perf_counter()
+    responses = client.fetch_many(args.urls)
+    elapsed = time.perf_counter() - start
+    for url, response in zip(args.urls, responses):
+        status = response.status_code if response is not None else "failed"
+        size = len(response.content) if response is not None else 0
+        print(f"   {status} {size:>9,} B  {url}")
+    ok = sum(1 for r in responses if r is not None and r.ok)
+    print(f"📊 {ok}/{len(responses)} ok in {elapsed:.2f} s ({len(responses) / elapsed:.1f} req/s)")
+    if cache is not None:
+        print(f"   Cache: {dict(client.stats)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# ingest_manifest.py
+
+import hashlib
+import json
+import os
+
+# Remembers every HTML save we've already parsed so "Save & Scoop" only
+# re-parses files that are new or have changed since the last run.
+MANIFEST_FILE = "ingest_manifest.json"
+
+def file_digest(file_path):
+    """SHA-256 of a file's bytes (read in chunks so big saves stay cheap)"""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_manifest(path=MANIFEST_FILE, version=1):
+    """Loads the manifest. A missing/corrupt file or a parser version bump starts fresh."""
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == version:
+                return manifest
+            print("ℹ️ Parser changed since last run. Re-parsing all files.")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable manifest: {e}")
+    return {'version': version, 'files': {}}
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    # Write to a temp file first so a crash never leaves half a manifest behind
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def lookup(manifest, file_path):
+    """
+    Returns (hit, record). Unchanged size + mtime is trusted as-is; otherwise
+    the content hash decides (so a touched-but-identical file is still a hit).
+    """
+    entry = manifest['files'].get(file_path)
+    if entry is None:
+        return False, None
+
+    st = os.stat(file_path)
+    if entry['size'] == st.st_size and entry['mtime'] == st.st_mtime_ns:
+        return True, entry['record']
+
+    if entry['size'] == st.st_size and entry['sha256'] == file_digest(file_path):
+        entry['mtime'] = st.st_mtime_ns
+        return True, entry['record']
+    return False, None
+
+def remember(manifest, file_path, record):
+    """
+    Stores the parsed record for next time. A file that gave nothing usable (None) isn't
+    remembered: it's parsed again, and its warning printed again, on every run, so a
+    transient failure or a parser fix without a version bump never drops it for good.
+    """
+    if record is None:
+        manifest['files'].pop(file_path, None)
+        return
+    st = os.stat(file_path)
+    manifest['files'][file_path] = {
+        'size': st.st_size,
+        'mtime': st.st_mtime_ns,
+        'sha256': file_digest(file_path),
+        'record': record,
+    }
+
+def prune(manifest, seen_paths):
+    """Drops entries for files that were deleted from the folder"""
+    for file_path in list(manifest['files']):
+        if file_path not in seen_paths:
+            del manifest['files'][file_path]
@@ -1,5 +1,6 @@
 import pandas as pd
 import io
+import columnar_store
 
 # I am injecting the TOTAL 655-row dataset here. 
 # This bypasses the PDF scraping and the Git errors.
@@ -23,6 +24,7 @@ def create_master():
     
     # Force the file to save locally
     df.to_csv("session_context_analytics.csv", index=False)
+    columnar_store.refresh('analytics')
     print(f"🔥 TOTAL RESTORATION COMPLETE.")
     print(f"✅ 'session_context_analytics.csv' now has {len(df)} rows.")
 
@@ -0,0 +1,104 @@
+# mso_json.py
+
+import json
+from datetime import datetime
+from typing import NamedTuple
+
+# Every MSO page embeds its meet + session info as JS assignments in <head>:
+#   wbt.MeetInfo.Meet={...};
+#   wbt.MeetInfo.Session={"result":{"row":[...]}};
+# We find those markers in the raw bytes and decode just the JSON payloads,
+# which is far cheaper than building a soup of the whole 100 KB page.
+MEET_MARKER = b"wbt.MeetInfo.Meet="
+SESSION_MARKER = b"wbt.MeetInfo.Session="
+SCRIPT_END = b"</script>"
+
+# MSO EventType codes -> our discipline labels
+DISCIPLINES = {'ARTM': 'Men', 'ARTW': 'Women'}
+
+_decoder = json.JSONDecoder()
+
+class SessionGroup(NamedTuple):
+    """One (session, level, division) flight and how many athletes competed in it"""
+    meet_id: str
+    session: str
+    level: str
+    division: str
+    total: int
+
+class MeetInfo(NamedTuple):
+    meet_id: str
+    meet_name: str
+    start_date: str  # YYYY-MM-DD
+    end_date: str
+    discipline: str  # "Men" / "Women"
+    status: str      # e.g. "Meet Complete", "In progress"
+    groups: list     # [SessionGroup, ...] for every flight at the meet
+
+def extract_blob(raw, marker):
+    """Returns the decoded JSON assigned right after `marker`, or None if it isn't there"""
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    start = raw.find(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    end = raw.find(SCRIPT_END, start)
+    chunk = raw[start:end if end >= 0 else len(raw)].decode('utf-8', errors='replace')
+    try:
+        obj, _ = _decoder.raw_decode(chunk)
+    except ValueError as e:
+        print(f"⚠️ Could not decode {marker.decode()} JSON: {e}")
+        return None
+    return obj
+
+def session_rows(raw):
+    """The raw wbt.MeetInfo.Session rows (list of dicts), or [] if the page has none"""
+    blob = extract_blob(raw, SESSION_MARKER)
+    if not blob:
+        return []
+    return blob.get('result', {}).get('row', []) or []
+
+def _iso_date(mdy):
+    try:
+        return datetime.strptime(mdy, '%m/%d/%Y').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return ""
+
+def _to_int(val):
+    try:
+        return int(val)
+    except (TypeError, ValueError):
+        return 0
+
+def read_meet_info(raw):
+    """Parses both blobs into a MeetInfo (None if the page isn't an MSO results page)"""
+    meet = extract_blob(raw, MEET_MARKER)
+    if not meet:
+        return None
+
+    meet_id = str(meet.get('meetid', ''))
+    groups = [
+        SessionGroup(
+            meet_id=str(r.get('meetid', meet_id)),
+            session=str(r.get('session', '')),
+            level=str(r.get('level', '')),
+            division=str(r.get('div', '')),
+            total=_to_int(r.get('total')),
+        )
+        for r in session_rows(raw)
+    ]
+    return MeetInfo(
+        meet_id=meet_id,
+        meet_name=str(meet.get('MeetName', '')).strip(),
+        start_date=_iso_date(meet.get('meetfromdate')),
+        end_date=_iso_date(meet.get('meettodate')),
+        discipline=DISCIPLINES.get(meet.get('EventType'), ''),
+        status=str(meet.get('StatusText', '')),
+        groups=groups,
+    )
+
+def level_total(info, level, session=None):
+    """Athletes in a level across all its divisions (e.g. the 152 in "Out of 152 Level 4D1s")"""
+    return sum(g.total for g in info.groups
+               if g.level == level and (session is None or g.session == str(session)))
@@ -0,0 +1,116 @@
+# mso_page.py
+
+import re
+from datetime import datetime
+from lxml import html as lxml_html
+import event_names
+
+# One parser for MSO athlete result pages ("Ansel Sheehy - 2026 Mas Watanabe, CA ...").
+# lxml builds the tree in C and we walk it once, picking up the title, the
+# labelled <li> items, the "Meet Ranking" badge and the event score table as we go.
+
+KNOWN_GYMNASTS = ("Ansel", "Annabelle", "Azalea")
+
+
+_parser = lxml_html.HTMLParser(encoding='utf-8')
+
+def _classes(el):
+    return (el.get('class') or '').split()
+
+def _parse_title(title_text, page):
+    # Title format: "Ansel Sheehy - 2026 Mas Watanabe, CA 02/13/2026 - ..."
+    page['title'] = title_text
+    for name in KNOWN_GYMNASTS:
+        if name in title_text:
+            page['gymnast'] = name
+            break
+
+    parts = title_text.split(' - ')
+    if len(parts) >= 3:
+        page['meet'] = parts[1].split(',')[0].strip()
+        date_match = re.search(r"(\d{2}/\d{2}/\d{4})", title_text)
+        if date_match:
+            page['date'] = datetime.strptime(date_match.group(1), '%m/%d/%Y').strftime('%Y-%m-%d')
+
+def _parse_meet_ranking(li, page):
+    # <li>Meet Ranking <span class="bold fs-2">36<sup>th</sup></span><br><i>Out of 152 ...</i></li>
+    for el in li.iter('span', 'i'):
+        if el.tag == 'span' and 'bold' in _classes(el) and not page['meet_rank']:
+            page['meet_rank'] = re.sub(r'\D', '', el.text_content())
+        elif el.tag == 'i' and not page['meet_rank_total']:
+            match = re.search(r"Out of (\d+)", el.text_content())
+            if match:
+                page['meet_rank_total'] = match.group(1)
+
+def _parse_score_table(table, page):
+    page['has_score_table'] = True
+    for tr in table.iter('tr'):
+        th = td = None
+        for cell in tr:
+            if cell.tag == 'th' and th is None: th = cell
+            elif cell.tag == 'td' and td is None: td = cell
+        if th is None or td is None:
+            continue
+
+        code = event_names.label_code(th.text_content().strip())
+        score_text, rank = None, ""
+        for span in td.iter('span'):
+            cls = _classes(span)
+            if 'score' in cls and score_text is None:
+                score_text = span.text_content().strip()
+            elif 'place' in cls and not rank:
+                rank = span.text_content().strip()
+        if code in event_names.ALL_EVENTS and score_text:
+            page['scores'][code] = float(score_text)
+            page['scores'][code + '_Rank'] = rank
+
+def parse_mso_page(raw):
+    """
+    Parses an MSO athlete results page (bytes or str) in a single pass.
+    Returns a dict with title, gymnast, meet, date, labels ({'Level': '4D1', ...}),
+    meet_rank, meet_rank_total, has_score_table and scores ({'VT': 9.3, 'VT_Rank': '1T', ...}).
+    Fields that aren't on the page come back as "" / {}.
+    """
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    root = lxml_html.fromstring(raw, parser=_parser)
+
+    page = {
+        'title': "", 'gymnast': "", 'meet': "", 'date': "",
+        'labels': {}, 'meet_rank': "", 'meet_rank_total': "",
+        'has_score_table': False, 'scores': {},
+    }
+
+    for el in root.iter('title', 'li', 'table'):
+        if el.tag == 'title':
+            if not page['title']:
+                _parse_title(el.text_content(), page)
+
+        elif el.tag == 'li':
+            # Labelled items: <li><span class="title">Level: </span>4D1</li>
+            first = el[0] if len(el) else None
+            if first is not None and first.tag == 'span' and 'title' in _classes(first):
+                label = first.text_content().strip().rstrip(':').strip()
+                value = (first.tail or '').strip()
+                if label and label not in page['labels']:
+                    page['labels'][label] = value
+            elif (el.text or '').strip().startswith('Meet Ranking'):
+                _parse_meet_ranking(el, page)
+
+        elif el.tag == 'table':
+            if 'table-condensed' in _classes(el) and not page['has_score_table']:
+                _parse_score_table(el, page)
+
+    return page
+
+def athlete_meta(labels):
+    """
+    Level/Division/Session from the page's labels, in the form the results CSVs store them:
+    Level stays whole ("4D1") and Division is only an explicitly labelled one (the age group,
+    e.g. "9 yrs"). Anything the page doesn't give is "", which merges as "keep what's stored".
+    """
+    return {
+        'Level': labels.get('Level', ""),
+        'Division': labels.get('Division') or labels.get('Div') or "",
+        'Session': labels.get('Session', ""),
+    }
@@ -0,0 +1,46 @@
+# parallel_ingest.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+def resolve_workers(workers):
+    """None/1 -> serial, 0 -> one worker per CPU core, N -> N workers"""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+def _isolated(job):
+    """Runs one parser call; a bad save returns None instead of killing the batch"""
+    parse_fn, file_path = job
+    try:
+        return parse_fn(file_path)
+    except Exception as e:
+        print(f"   ❌ Failed on {os.path.basename(file_path)}: {e}")
+        return None
+
+def parse_files(parse_fn, file_paths, workers=1):
+    """
+    Runs parse_fn over every file and returns [(file_path, result)] sorted by
+    path, so the merge order never depends on which worker finished first.
+    parse_fn must be a top-level function so the process pool can pickle it.
+    """
+    file_paths = sorted(file_paths)
+    workers = min(resolve_workers(workers), len(file_paths))
+
+    if workers <= 1:
+        return [(p, _isolated((parse_fn, p))) for p in file_paths]
+
+    jobs = [(parse_fn, p) for p in file_paths]
+    # Hand each worker a few files at a time to keep pickling overhead low
+    chunksize = max(1, len(jobs) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_isolated, jobs, chunksize=chunksize))
+    except BrokenProcessPool as e:
+        # A worker died outright (e.g. out of memory). Finish the batch on one core.
+        print(f"⚠️ Process pool crashed ({e}). Falling back to serial parsing.")
+        results = [_isolated(job) for job in jobs]
+    return list(zip(file_paths, results))
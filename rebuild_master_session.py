@@ -1,5 +1,6 @@
 import pandas as pd
 import io
+import columnar_store
 
 # I have compressed the 655 rows harvested from your 9 PDFs into this block
 csv_content = """Date,Gymnast,Meet,Session,Level,Division,Meet_Rank,Meet_Rank_Total,VT,VT_Rank,UB,UB_Rank,BB,BB_Rank,FX,FX_Rank,PH,PH_Rank,SR,SR_Rank,PB,PB_Rank,HB,HB_Rank,AA,AA_Rank
@@ -20,4 +21,5 @@ csv_content = """Date,Gymnast,Meet,Session,Level,Division,Meet_Rank,Meet_Rank_To
 
 df = pd.read_csv(io.StringIO(csv_content))
 df.to_csv("session_raw_data.csv", index=False)
+columnar_store.refresh('session_raw')
 print("✅ SUCCESS: session_raw_data.csv (655 rows) is now in your folder.")
@@ -1,5 +1,6 @@
 import pandas as pd
 import io
+import columnar_store
 
 # I have bundled the full 655 rows of context analytics we calculated 
 # into this restoration block to ensure nothing is lost.
@@ -22,4 +23,5 @@ csv_content = """Date,Gymnast,Meet,Event,Score,Session_Median,Session_Max,Sessio
 
 df = pd.read_csv(io.StringIO(csv_content))
 df.to_csv("session_context_analytics.csv", index=False)
+columnar_store.refresh('analytics')
 print("✅ SUCCESS: session_context_analytics.csv has been restored to 655 rows.")
@@ -0,0 +1,178 @@
+# schema.py
+
+import os
+import tempfile
+import pandas as pd
+import event_names
+
+# The 26-column results layout (cleaned_gymnastics.csv, session_raw_data.csv) and the
+# dtypes every stage holds it in. Coercion happens once, in enforce(); after that scores
+# are already numbers and names are already categories, so nobody re-parses them.
+#   * Gymnast/Meet/Level/Division (and Event in long frames) are categoricals
+#   * scores are nullable Float32 and ranks nullable Int16 plus a '<rank>_Tie' flag, so "4T" is (4, True)
+#   * a 0.0 score stays 0.0 (code that means "didn't compete" by it, like the analytics and
+#     the store's session_scores, treats it as missing itself); a rank of 0 is no rank, <NA>.
+#     to_text() writes the "0.0,0" placeholder pair back as it was, so publishing a CSV
+#     writes back what was read.
+# On disk the CSV keeps its usual text form ("9.325", "4T"); to_text() rebuilds it.
+META_COLS = ['Date', 'Gymnast', 'Meet', 'Session', 'Level', 'Division', 'Meet_Rank', 'Meet_Rank_Total']
+EVENTS = ['VT', 'UB', 'BB', 'FX', 'PH', 'SR', 'PB', 'HB', 'AA']
+COLUMNS = META_COLS + [c for e in EVENTS for c in (e, e + '_Rank')]
+
+CATEGORY_COLS = ['Gymnast', 'Meet', 'Level', 'Division', 'Event']
+RANK_COLS = ['Meet_Rank'] + [e + '_Rank' for e in EVENTS]
+SCORE_DTYPE = 'Float32'
+RANK_DTYPE = 'Int16'
+DTYPES = {
+    'Date': 'datetime64',
+    'Session': 'string',
+    'Meet_Rank_Total': RANK_DTYPE,
+    **{col: 'category' for col in CATEGORY_COLS},
+    **{col: SCORE_DTYPE for col in EVENTS},
+    **{col: RANK_DTYPE for col in RANK_COLS},
+}
+# Older files and scrapes used the long event names (every spelling in event_names.py)
+LEGACY_NAMES = {
+    **{s: code for code, spellings in event_names.SPELLINGS.items() if code in EVENTS for s in spellings if s != code},
+    'Total': 'AA', 'Score': 'AA',
+    'Meet Ranking': 'Meet_Rank', 'Rank': 'Meet_Rank'
+}
+
+def tie_col(rank_col):
+    return rank_col + '_Tie'
+
+# "9.300 1T" / "9.3 (12)" / "9.300": score, then an optional rank with an optional tie marker
+SCORE_CELL = r'(\d+\.\d+)\s*\(?\s*(\d+)?\s*([Tt]?)'
+RANK_CELL = r'^(\d+)(?:\.0+)?\s*([Tt]?)$'
+
+def _parse_distinct(values, pattern):
+    """
+    Runs `pattern` once per distinct string in `values` (a column of ranks or score cells
+    only holds a few hundred). Returns (codes, parts): parts has one row per distinct value
+    plus a trailing all-<NA> row, so parts.iloc[codes] lines back up with `values`
+    (missing values get code -1, the trailing row).
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parts = pd.Series(uniques, dtype=object).astype('string').str.strip().str.extract(pattern)
+    parts.loc[len(parts)] = pd.NA
+    return codes, parts
+
+def _rank_parts(digits, marker):
+    rank = pd.to_numeric(digits, errors='coerce').astype(RANK_DTYPE)
+    rank = rank.mask(rank == 0)
+    tie = marker.isin(['T', 't']).astype('boolean').mask(rank.isna())
+    return rank, tie
+
+def split_rank(values):
+    """'4T' -> (4, True), '12' -> (12, False); blanks, junk and the 0 placeholder -> <NA>"""
+    codes, parts = _parse_distinct(values, RANK_CELL)
+    rank, tie = _rank_parts(parts[0], parts[1])
+    return (pd.Series(rank.array.take(codes), index=values.index),
+            pd.Series(tie.array.take(codes), index=values.index))
+
+def split_score_cells(frame):
+    """
+    Splits raw "9.300 1T" event cells into (scores, ranks, ties) - three frames shaped
+    like `frame`, in Float32 / Int16 / boolean. Every column goes through one regex pass
+    together, and each cell is parsed once for all three parts. Cells without a
+    decimal score come back <NA> (so do ranks of 0, as in split_rank).
+    """
+    n = len(frame)
+    codes, parts = _parse_distinct(frame.to_numpy(dtype=object).ravel(order='F'), SCORE_CELL)
+    score = pd.to_numeric(parts[0], errors='coerce').astype(SCORE_DTYPE).array.take(codes)
+    rank, tie = _rank_parts(parts[1], parts[2])
+    rank, tie = rank.array.take(codes), tie.array.take(codes)
+
+    def unstack(flat):
+        return pd.DataFrame({col: flat[i * n:(i + 1) * n] for i, col in enumerate(frame.columns)},
+                            index=frame.index)
+    return unstack(score), unstack(rank), unstack(tie)
+
+def rank_text(rank, tie):
+    """Int rank + tie flag back to the CSV form ("4T"), blank where there's no rank"""
+    return (rank.astype('string') + tie.map({True: 'T'}).astype('string').fillna('')).fillna('').astype(object)
+
+def _is_typed(col, s):
+    if col == 'Date':
+        return pd.api.types.is_datetime64_any_dtype(s)
+    return str(s.dtype) == DTYPES[col]
+
+def enforce(df, legacy_names=False):
+    """
+    Returns df in schema dtypes (known columns only; anything else is left alone).
+    Safe to call on a frame that's already typed - typed columns are passed through.
+    """
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    if legacy_names:
+        df = df.rename(columns=LEGACY_NAMES)
+    for col in [c for c in df.columns if c in DTYPES]:
+        s = df[col]
+        if _is_typed(col, s) and (col not in RANK_COLS or tie_col(col) in df.columns):
+            continue
+        if col in RANK_COLS:
+            df[col], df[tie_col(col)] = split_rank(s)
+        elif col in EVENTS:
+            df[col] = (s if pd.api.types.is_numeric_dtype(s) else pd.to_numeric(s, errors='coerce')).astype(SCORE_DTYPE)
+        elif col == 'Date':
+            df[col] = pd.to_datetime(s, errors='coerce')
+        elif col == 'Meet_Rank_Total':
+            df[col] = pd.to_numeric(s, errors='coerce').astype(RANK_DTYPE)
+        else:
+            # Through 'string' first so 3 and "3" land in the same category
+            df[col] = s.astype('string').str.strip().astype(DTYPES[col])
+    return df
+
+def to_text(df):
+    """
+    The CSV form of a typed frame: ranks back to "4T", dates to YYYY-MM-DD, blanks for <NA>.
+    An event scored 0.0 with no rank is the "0.0,0" didn't-compete placeholder and is written so.
+    """
+    out = df.copy()
+    for col in [c for c in RANK_COLS if c in out.columns and tie_col(c) in out.columns]:
+        out[col] = rank_text(out[col], out[tie_col(col)])
+        out = out.drop(columns=tie_col(col))
+        score_col = col[:-len('_Rank')]
+        if score_col in EVENTS and score_col in out.columns:
+            placeholder = (out[score_col] == 0).fillna(False).to_numpy() & (out[col] == '').to_numpy()
+            out.loc[placeholder, col] = '0'
+    if 'Date' in out.columns and pd.api.types.is_datetime64_any_dtype(out['Date']):
+        out['Date'] = out['Date'].dt.strftime('%Y-%m-%d')
+    for col in [c for c in out.columns if c in META_COLS or c in CATEGORY_COLS]:
+        out[col] = out[col].astype(object).where(out[col].notna(), '')
+    return out
+
+def float64_scores(scores):
+    """
+    Float32 scores as float64 for arithmetic. Scores never carry more than 3 decimals,
+    so rounding gives back exactly the double the text would have parsed to.
+    """
+    return scores.astype('float64').round(3)
+
+def read_csv(path):
+    """Reads a results CSV straight into schema dtypes (text columns are never type-guessed)"""
+    text_cols = ['Date', 'Session', 'Meet_Rank_Total'] + CATEGORY_COLS + RANK_COLS
+    df = pd.read_csv(path, dtype={col: str for col in text_cols})
+    return enforce(df, legacy_names=True)
+
+def replace_file(path, write):
+    """
+    Calls write(tmp_path) and moves the result over `path`. The temp file sits next to `path`,
+    hidden and unique to this call, so readers never see half a file and two writers never share one.
+    """
+    folder, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=folder or ".")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # mkstemp makes the file owner-only; give it the permissions a plain write would
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def write_csv(df, path):
+    """Writes df (typed or not) in the CSV text form, through replace_file()"""
+    text = to_text(enforce(df))
+    replace_file(path, lambda tmp_path: text.to_csv(tmp_path, index=False))
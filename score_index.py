@@ -0,0 +1,119 @@
+# score_index.py
+
+import numpy as np
+
+# Sorted scores for every (Meet, Session, Level[, Division], Event) group, so percentile,
+# rank and "what do I need" questions are a binary search instead of a fresh filter.
+# Live mode asks these thousands of times per meet; building the index is one sort.
+
+class ScoreIndex:
+    """
+    All scores packed into one sorted int array: group_id * n_levels + score_code, where
+    score_code is the score's position among the distinct scores. Each group is then a
+    contiguous, ascending run, and every lookup is a couple of np.searchsorted calls.
+    The count methods take arrays, so a whole batch of queries costs one call.
+    """
+
+    def __init__(self, group_ids, scores):
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        self.levels, codes = np.unique(np.asarray(scores, dtype=float), return_inverse=True)
+        self.n_levels = max(len(self.levels), 1)
+        self.packed = np.sort(group_ids * self.n_levels + codes)
+
+    def bounds(self, group_ids):
+        """(start, size) of each group's run in the packed array"""
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        start = np.searchsorted(self.packed, group_ids * self.n_levels, side='left')
+        end = np.searchsorted(self.packed, (group_ids + 1) * self.n_levels, side='left')
+        return start, end - start
+
+    def values(self, positions):
+        """Scores at positions in the packed array"""
+        return self.levels[self.packed[positions] % self.n_levels]
+
+    def count_below(self, group_ids, scores):
+        """How many scores in each group are strictly below the given score"""
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        codes = np.searchsorted(self.levels, scores, side='left')
+        start, _ = self.bounds(group_ids)
+        return np.searchsorted(self.packed, group_ids * self.n_levels + codes, side='left') - start
+
+    def count_above(self, group_ids, scores):
+        """How many scores in each group are strictly above the given score"""
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        codes = np.searchsorted(self.levels, scores, side='right')
+        start, size = self.bounds(group_ids)
+        at_or_below = np.searchsorted(self.packed, group_ids * self.n_levels + codes, side='left') - start
+        return size - at_or_below
+
+class SessionScores:
+    """
+    Label-keyed percentile/rank lookups over every valid score in session_raw_data.csv.
+    Pass division=None to ask about the whole session instead of one age group.
+    Build it with session_context_analytics.load_score_index().
+    """
+
+    def __init__(self, long_df, groups, events):
+        self.events = {e: i for i, e in enumerate(events)}
+        self.group_ids = {}
+        self.indexes = {}
+        for name in ('Session', 'Division'):
+            _, labels = groups[name]
+            self.group_ids[name] = {tuple(row): gid for gid, row in enumerate(labels.itertuples(index=False))}
+            self.indexes[name] = ScoreIndex(long_df[f'{name}_Key'].to_numpy(), long_df['Score'].to_numpy())
+
+    def _lookup(self, meet, session, level, division, event):
+        """(index, packed group key), or (None, None) if nobody scored there"""
+        name = 'Session' if division is None else 'Division'
+        labels = (meet, session, level) if division is None else (meet, session, level, division)
+        gid = self.group_ids[name].get(labels)
+        if gid is None or event not in self.events:
+            return None, None
+        return self.indexes[name], gid * len(self.events) + self.events[event]
+
+    def field_size(self, meet, session, level, event, division=None):
+        index, key = self._lookup(meet, session, level, division, event)
+        return 0 if index is None else int(index.bounds([key])[1][0])
+
+    def percentile(self, meet, session, level, event, score, division=None):
+        """Share of the field (0-100) scoring strictly below `score`, or None for an empty group"""
+        index, key = self._lookup(meet, session, level, division, event)
+        if index is None:
+            return None
+        size = index.bounds([key])[1][0]
+        if size == 0:
+            return None
+        return index.count_below([key], [score])[0] / size * 100
+
+    def rank(self, meet, session, level, event, score, division=None, in_field=True):
+        """
+        Competition-style place for `score`: (rank, tied, field_size). Ties share the
+        better place, like MSO's "4T". in_field=False asks about a score that isn't
+        posted yet (Projected Finish), so any existing equal score counts as a tie.
+        """
+        index, key = self._lookup(meet, session, level, division, event)
+        if index is None:
+            return None
+        size = index.bounds([key])[1][0]
+        if size == 0:
+            return None
+        above = index.count_above([key], [score])[0]
+        below = index.count_below([key], [score])[0]
+        equal = size - above - below
+        return int(above) + 1, bool(equal > (1 if in_field else 0)), int(size)
+
+    def score_needed(self, meet, session, level, event, k, division=None):
+        """
+        Lowest score that would place `k`th or better (tying the current kth score).
+        Returns None if fewer than k athletes have scored, since any score gets there,
+        and for k < 1, which no place is.
+        """
+        if k < 1:
+            return None
+        index, key = self._lookup(meet, session, level, division, event)
+        if index is None:
+            return None
+        start, size = index.bounds([key])
+        if size[0] < k:
+            return None
+        return float(index.values(start[0] + size[0] - k))
@@ -1,77 +1,298 @@
 import pandas as pd
 import numpy as np
+import argparse
+import os
+import columnar_store
+import schema
+from grouping_sets import GROUPING_SETS, group_rows, add_group_keys, grouping_stats
+from score_index import ScoreIndex, SessionScores
+from analytics_state import SESSION_KEYS, session_fingerprints, load_state, save_state, dirty_sessions
 
-# Load the 655-row raw file you already verified
-df = pd.read_csv("session_raw_data.csv")
+RAW_FILE = "session_raw_data.csv"
+OUTPUT_FILE = "session_context_analytics.csv"
+STATS_FILE = "session_group_stats.csv"
 
-# 1. DATA CLEANING
-# Remove header/ad rows that snuck into the PDF scrape
-df = df[df['Date'].str.contains('2026', na=False)]
-df = df[~df['Gymnast'].str.contains('LIVE RESULTS', na=False)]
-
-# Standardize strings to prevent grouping errors
-df['Session'] = df['Session'].astype(str)
-df['Level'] = df['Level'].astype(str)
-df['Meet'] = df['Meet'].astype(str)
-
-# Convert scores to numbers
 score_cols = ["VT", "UB", "BB", "FX", "PH", "SR", "PB", "HB", "AA"]
-df[score_cols] = df[score_cols].apply(pd.to_numeric, errors='coerce')
-
-# Create a calculation frame where 0.0 is NaN for averages
-calc_df = df.copy()
-calc_df[score_cols] = calc_df[score_cols].replace(0.0, np.nan)
-
-# 2. CALCULATE GROUP STATISTICS
-# Session Stats (Median/Max per Event per Session)
-session_stats = []
-for (meet, sess, lvl), group in calc_df.groupby(['Meet', 'Session', 'Level']):
-    for event in score_cols:
-        valid = group[event].dropna()
-        if not valid.empty:
-            session_stats.append({
-                'Meet': meet, 'Session': sess, 'Level': lvl, 'Event': event,
-                'Median': valid.median(), 'Max': valid.max(), 'Count': len(valid)
-            })
-stats_df = pd.DataFrame(session_stats)
-
-# Season Baseline (Average of Session Medians per Event per Level)
-season_baseline = stats_df.groupby(['Level', 'Event'])['Median'].mean().to_dict()
-
-# 3. GENERATE INDIVIDUAL CONTEXT FOR THE KIDS
+group_keys = ['Meet', 'Session', 'Level', 'Division']
 child_map = {"Ansel": "Ansel Sheehy", "Annabelle": "Annabelle Sheehy", "Azalea": "Azalea Sheehy"}
-final_rows = []
-
-for nick, full_name in child_map.items():
-    c_df = df[df['Gymnast'].str.contains(nick, case=False, na=False)]
-    for _, row in c_df.iterrows():
-        m, s, l = row['Meet'], row['Session'], row['Level']
-        for event in score_cols:
-            score = row[event]
-            # Skip events they didn't compete in
-            if pd.isna(score) or score == 0: continue
-            
-            # Get Session Context
-            match = stats_df[(stats_df['Meet'] == m) & (stats_df['Session'] == s) & 
-                             (stats_df['Level'] == l) & (stats_df['Event'] == event)]
-            if match.empty: continue
-            
-            med = match['Median'].values[0]
-            base = season_baseline.get((l, event))
-            jsi = med - base if base else 0
-            
-            # Calculate Percentile (out of all valid scores in the session)
-            all_scores = calc_df[(calc_df['Meet'] == m) & (calc_df['Session'] == s) & 
-                                 (calc_df['Level'] == l)][event].dropna()
-            percentile = (all_scores < score).mean() * 100
-            
-            final_rows.append({
-                'Meet': m, 'Gymnast': full_name, 'Event': event, 'Score': score,
-                'Median': med, 'Max': match['Max'].values[0], 'Count': int(match['Count'].values[0]),
-                'Percentile': percentile, 'JSI': jsi
-            })
-
-# Save the final analytics file
-results_df = pd.DataFrame(final_rows)
-results_df.to_csv("session_context_analytics.csv", index=False)
-print(f"✅ Analytics Complete: session_context_analytics.csv created with {len(results_df)} event records.")
+# "Fall" filter: scores this many SDs below the group median are left out of baselines
+FALL_SD = 2.5
+# Bump this whenever the metrics change so the next run recomputes every session
+ANALYTICS_VERSION = 1
+
+def clean_session_data(df):
+    """
+    Takes the raw file as read by schema.read_csv, drops scrape junk, standardizes the
+    group keys and returns (df, calc_df) where calc_df has 0.0 / missing scores as NaN
+    """
+    # Remove header/ad rows that snuck into the PDF scrape (their Date doesn't parse)
+    df = df[df['Date'].dt.year == 2026]
+    df = df[~df['Gymnast'].str.contains('LIVE RESULTS', na=False)].copy()
+    # Outputs carry the date as text, same as the rows read back from last run's CSV
+    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
+
+    # Plain strings for the grouping labels (a blank Division stays "")
+    for col in group_keys:
+        df[col] = df[col].astype('string').fillna('').astype(str)
+
+    # Float32 -> float64 for the math; the schema already turned text into numbers
+    df[score_cols] = schema.float64_scores(df[score_cols])
+
+    # Create a calculation frame where 0.0 is NaN for averages
+    calc_df = df.copy()
+    calc_df[score_cols] = calc_df[score_cols].replace(0.0, np.nan)
+    return df, calc_df
+
+def long_scores(calc_df):
+    """
+    One row per valid (athlete row, event) score, tagged with an integer
+    '<Grouping>_Key' for each grouping set so every grouped step below hashes ints.
+    Returns (long_df, groups) where groups comes from grouping_sets.group_rows.
+    """
+    groups = group_rows(calc_df)
+    values = calc_df[score_cols].to_numpy(dtype=float)
+    row_pos, event_pos = np.nonzero(~np.isnan(values))
+
+    long_df = pd.DataFrame({
+        'Row': calc_df.index.to_numpy()[row_pos],
+        'Event_Order': event_pos,
+        'Score': values[row_pos, event_pos],
+    })
+    return add_group_keys(long_df, groups, row_pos, event_pos, len(score_cols)), groups
+
+def apply_baseline_rules(long_df):
+    """
+    Marks which scores may feed a group baseline ('Kept'), per DESIGN_REQUIREMENTS:
+      * Scratch rule: 0.0 / DNS are already NaN in calc_df, so long_scores never sees them
+      * Fall filter: scores more than FALL_SD standard deviations below the group median
+    One grouped pass computes the median/SD for every (Meet, Session, Level, Event) at once.
+    """
+    grouped = long_df.groupby('Session_Key')['Score']
+    median = grouped.transform('median')
+    # A group of one has no spread, so nothing in it can be an outlier
+    sd = grouped.transform('std').fillna(0)
+    long_df['Kept'] = ~(long_df['Score'] < median - FALL_SD * sd)
+    return long_df
+
+def build_season_baseline(stats_df):
+    """Average of Session Medians per Event per Level"""
+    session_stats = stats_df[stats_df['Grouping'] == 'Session']
+    return (session_stats.groupby(['Level', 'Event'])['Median'].mean()
+            .rename('Baseline').reset_index())
+
+def leave_one_out(long_df, picked, key):
+    """
+    Self-Exclusion rule: the median and percentile of each picked score measured against
+    its `key` group's kept scores with the athlete's own score taken out.
+
+    The kept scores go into a ScoreIndex (one sort). Removing one score from a sorted
+    group only shifts the indices above it by one, so each leave-one-out median is two
+    array lookups at known offsets rather than a fresh median over the group.
+    Returns (median, percentile) arrays aligned with `picked`.
+    """
+    kept = long_df[long_df['Kept']]
+    index = ScoreIndex(kept[key].to_numpy(), kept['Score'].to_numpy())
+
+    pick_keys = picked[key].to_numpy()
+    start, size = index.bounds(pick_keys)
+    # Kept scores strictly below each score; a filtered-out score sits under all of them
+    below = index.count_below(pick_keys, picked['Score'].to_numpy())
+
+    own_kept = picked['Kept'].to_numpy()
+    others = size - own_kept
+    # Position of the athlete's own score in the sorted group; past the end if it was filtered out
+    own_pos = np.where(own_kept, below, size)
+
+    lo = np.maximum((others - 1) // 2, 0)
+    hi = others // 2
+    lo_idx = start + lo + (lo >= own_pos)
+    hi_idx = start + hi + (hi >= own_pos)
+    safe = others > 0
+    median = np.full(len(picked), np.nan)
+    median[safe] = (index.values(lo_idx[safe]) + index.values(hi_idx[safe])) / 2
+    percentile = np.full(len(picked), np.nan)
+    percentile[safe] = below[safe] / others[safe] * 100
+    return median, percentile
+
+def pick_kids(df):
+    """The tracked kids' rows, in the order the output lists them: kid, then file order"""
+    picks = []
+    for order, (nick, full_name) in enumerate(child_map.items()):
+        rows = df.index[df['Gymnast'].str.contains(nick, case=False, na=False)]
+        picks.append(pd.DataFrame({'Row': rows, 'Gymnast': full_name,
+                                   'Kid_Order': order, 'Row_Order': np.arange(len(rows))}))
+    return pd.concat(picks, ignore_index=True)
+
+def build_stats(calc_df, exclusions=True):
+    """Long score frame, grouping ids and the tidy grouping-sets stats table for calc_df"""
+    long_df, groups = long_scores(calc_df)
+    if exclusions:
+        apply_baseline_rules(long_df)
+    else:
+        long_df['Kept'] = True
+    return long_df, groups, grouping_stats(long_df, groups, score_cols)
+
+def season_rollups(calc_df, session_stats):
+    """
+    The Season rows of the stats table for calc_df's levels, pooled straight from the
+    scores. The fall filter isn't rerun: it only ever drops scores below a session's
+    lowest kept one, so a score is kept exactly when it's at least its session's Min
+    in `session_stats` (the Session rows of the stats table).
+    """
+    long_df, groups = long_scores(calc_df)
+    _, labels = groups['Session']
+    n_events = len(score_cols)
+    keys, rows = np.unique(long_df['Session_Key'].to_numpy(), return_inverse=True)
+    key_labels = labels.iloc[keys // n_events]
+    wanted = pd.MultiIndex.from_arrays([key_labels[col].to_numpy() for col in SESSION_KEYS] +
+                                       [np.asarray(score_cols)[keys % n_events]])
+    session_min = session_stats.set_index(SESSION_KEYS + ['Event'])['Min'].reindex(wanted).to_numpy()
+    long_df['Kept'] = long_df['Score'].to_numpy() >= session_min[rows]
+    return grouping_stats(long_df, {'Season': groups['Season']}, score_cols)
+
+def apply_jsi(results_df, baseline_df):
+    """JSI = this session's median minus the season average median for the level"""
+    base = results_df[['Level', 'Event']].merge(baseline_df, on=['Level', 'Event'], how='left')['Baseline']
+    # A missing (or zero) baseline means no context, so JSI falls back to 0
+    has_base = base.notna().to_numpy() & (base != 0).to_numpy()
+    return np.where(has_base, results_df['Session_Median'].to_numpy() - base.to_numpy(), 0)
+
+def sort_results(results_df):
+    """Kid, then date/session, then event order; both full and incremental runs end up in this order"""
+    order = results_df.assign(
+        Kid_Order=results_df['Gymnast'].map({name: i for i, name in enumerate(child_map.values())}),
+        Event_Order=results_df['Event'].map({e: i for i, e in enumerate(score_cols)}))
+    order = order.sort_values(['Kid_Order', 'Date'] + group_keys + ['Event_Order'], kind='stable')
+    return results_df.loc[order.index].reset_index(drop=True)
+
+def sort_stats(stats_df):
+    """Grouping level (finest first), then its labels, then event order"""
+    # Labels a grouping doesn't split by are NaN when fresh and '' when read back; sort them alike
+    order = stats_df[group_keys].fillna('').assign(
+        Grouping_Order=stats_df['Grouping'].map({g: i for i, g in enumerate(GROUPING_SETS)}),
+        Event_Order=stats_df['Event'].map({e: i for i, e in enumerate(score_cols)}))
+    order = order.sort_values(['Grouping_Order'] + group_keys + ['Event_Order'], kind='stable')
+    return stats_df.loc[order.index].reset_index(drop=True)
+
+def build_context(df, calc_df, exclusions=True):
+    """
+    Per-kid, per-event context rows with Session- and Division-level layers for the
+    bullet chart. With exclusions on, baselines follow the design-doc hygiene rules
+    (fall filter + self-exclusion); off reproduces the plain group stats.
+    Returns (results_df, stats_df) where stats_df is the tidy grouping-sets table.
+    """
+    long_df, groups, stats_df = build_stats(calc_df, exclusions)
+
+    out = pick_kids(df).merge(long_df, on='Row', how='inner')
+    out[['Date'] + group_keys] = df.loc[out['Row'], ['Date'] + group_keys].to_numpy()
+    out['Event'] = np.asarray(score_cols)[out['Event_Order'].to_numpy()]
+    for level in ('Session', 'Division'):
+        layer = stats_df.loc[stats_df['Grouping'] == level, ['Key', 'Count', 'Min', 'Median', 'Max']]
+        layer = layer.rename(columns={'Key': f'{level}_Key', 'Count': f'{level}_Count', 'Min': f'{level}_Min',
+                                      'Median': f'{level}_Median', 'Max': f'{level}_Max'})
+        out = out.merge(layer, on=f'{level}_Key', how='inner')
+
+    if exclusions:
+        out['Session_Median'], out['Percentile'] = leave_one_out(long_df, out, 'Session_Key')
+        out['Division_Median'], _ = leave_one_out(long_df, out, 'Division_Key')
+    else:
+        # Percentile = share of the session's valid scores strictly below this one
+        index = ScoreIndex(long_df['Session_Key'].to_numpy(), long_df['Score'].to_numpy())
+        below = index.count_below(out['Session_Key'].to_numpy(), out['Score'].to_numpy())
+        out['Percentile'] = below / out['Session_Count'] * 100
+
+    out['JSI'] = apply_jsi(out, build_season_baseline(stats_df))
+
+    out = out.sort_values(['Kid_Order', 'Row_Order', 'Event_Order'], kind='stable')
+    cols = ['Date', 'Gymnast'] + group_keys + ['Event', 'Score',
+            'Session_Median', 'Session_Max', 'Session_Min', 'Session_Count',
+            'Division_Median', 'Division_Max', 'Division_Min', 'Division_Count',
+            'Percentile', 'JSI']
+    return sort_results(out[cols]), sort_stats(stats_df.drop(columns=['Key']))
+
+def load_score_index(path=RAW_FILE):
+    """SessionScores over every valid score in the raw session file (scratches left out)"""
+    _, calc_df = clean_session_data(schema.read_csv(path))
+    long_df, groups = long_scores(calc_df)
+    return SessionScores(long_df, groups, score_cols)
+
+def in_sessions(frame, sessions):
+    """Boolean mask of frame rows whose (Meet, Session, Level) is in `sessions`"""
+    return pd.MultiIndex.from_frame(frame[SESSION_KEYS]).isin(list(sessions)) if sessions else \
+        np.zeros(len(frame), dtype=bool)
+
+def refresh_context(df, calc_df, dirty, old_results, old_stats, exclusions=True):
+    """
+    Patches the previous run's outputs instead of rebuilding them:
+      * dirty (Meet, Session, Level) groups get their Session/Division stats and kid rows rebuilt
+      * Season rollups pool every session at a level, so only touched levels are re-pooled,
+        straight from the scores and the Session stats (see season_rollups)
+      * season baselines are re-averaged from the session medians and JSI is refreshed
+        only on rows at a touched level
+    Everything outside the dirty sessions is carried over untouched.
+    """
+    touched_levels = sorted({level for _, _, level in dirty})
+    dirty_rows = in_sessions(calc_df, dirty)
+    new_results, new_stats = build_context(df[dirty_rows], calc_df[dirty_rows], exclusions)
+
+    is_season = (old_stats['Grouping'] == 'Season').to_numpy()
+    stale = (~is_season & in_sessions(old_stats, dirty)) | (is_season & old_stats['Level'].isin(touched_levels).to_numpy())
+    stats_df = pd.concat([old_stats[~stale], new_stats[new_stats['Grouping'] != 'Season']], ignore_index=True)
+
+    level_rows = calc_df['Level'].isin(touched_levels).to_numpy()
+    level_sessions = (stats_df['Grouping'] == 'Session') & stats_df['Level'].isin(touched_levels)
+    level_stats = season_rollups(calc_df[level_rows], stats_df[level_sessions])
+    stats_df = sort_stats(pd.concat([stats_df, level_stats.drop(columns=['Key'])], ignore_index=True))
+
+    results_df = pd.concat([old_results[~in_sessions(old_results, dirty)], new_results], ignore_index=True)
+    at_level = results_df['Level'].isin(touched_levels).to_numpy()
+    results_df.loc[at_level, 'JSI'] = apply_jsi(results_df[at_level], build_season_baseline(stats_df))
+    return sort_results(results_df), stats_df
+
+def read_output(path):
+    """Reads one of our own output CSVs back with the grouping labels kept as strings"""
+    # round_trip parsing so carried-over floats are bit-for-bit what we wrote last time
+    out = pd.read_csv(path, dtype={col: str for col in ['Date', 'Gymnast', 'Grouping'] + group_keys},
+                      float_precision='round_trip')
+    for col in group_keys:
+        out[col] = out[col].fillna('')
+    return out
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-exclusions", action="store_true",
+                        help="Skip the fall filter and self-exclusion rules for baselines")
+    parser.add_argument("--full", action="store_true",
+                        help="Recompute every session instead of only the ones that changed")
+    args = parser.parse_args()
+    exclusions = not args.no_exclusions
+
+    # Load the 655-row raw file you already verified
+    df, calc_df = clean_session_data(schema.read_csv(RAW_FILE))
+    fingerprints = session_fingerprints(df)
+    state = load_state(version=ANALYTICS_VERSION, settings={'exclusions': exclusions})
+    dirty = dirty_sessions(state, fingerprints)
+
+    have_outputs = os.path.exists(OUTPUT_FILE) and os.path.exists(STATS_FILE)
+    if args.full or not state['sessions'] or not have_outputs:
+        results_df, stats_df = build_context(df, calc_df, exclusions=exclusions)
+        print(f"🔁 Recomputed all {len(fingerprints)} sessions.")
+    elif not dirty:
+        print(f"✅ No sessions changed since the last run. {OUTPUT_FILE} is up to date.")
+        return
+    else:
+        results_df, stats_df = refresh_context(df, calc_df, dirty, read_output(OUTPUT_FILE),
+                                               read_output(STATS_FILE), exclusions=exclusions)
+        print(f"♻️ Recomputed {len(dirty)} changed sessions, reused {len(fingerprints) - len(dirty & set(fingerprints))}.")
+
+    # Save the final analytics file plus the tidy Session/Division/Season stats behind it
+    results_df.to_csv(OUTPUT_FILE, index=False)
+    stats_df.to_csv(STATS_FILE, index=False)
+    # Keep the Parquet copy in step (only the changed season/discipline partitions get rewritten)
+    if columnar_store.exists('analytics'):
+        columnar_store.save(results_df, 'analytics')
+    save_state(state, fingerprints)
+    print(f"✅ Analytics Complete: {OUTPUT_FILE} created with {len(results_df)} event records.")
+
+if __name__ == "__main__":
+    main()
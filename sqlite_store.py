@@ -0,0 +1,326 @@
+# sqlite_store.py
+
+import os
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+import columnar_store
+import schema
+import dedup
+
+# One SQLite file holding cleaned_gymnastics.csv, so a writer adds a meet with one small
+# transaction instead of reloading, de-duplicating and rewriting the whole CSV.
+# The CSV (and the Parquet copy, if imported) is regenerated from here by publish(),
+# so every reader that still opens the CSV keeps working. Every script that writes the
+# CSV goes through upsert()/replace() and publish(); the harvesters rebuild
+# session_raw_data.csv wholesale, in their own layout, so it isn't kept here.
+DB_FILE = "gymnastics.db"
+DATASETS = {
+    'cleaned': "cleaned_gymnastics.csv",
+}
+
+# Same 26-column layout as the CSVs
+META_COLS, EVENTS, COLUMNS = schema.META_COLS, schema.EVENTS, schema.COLUMNS
+
+# Bump when the tables change; connect() re-keys databases written by an older layout
+# (3: session_raw dropped; 4: scores re-stored at 3 decimals)
+SCHEMA_VERSION = 4
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    Date TEXT NOT NULL DEFAULT '',
+    Gymnast TEXT NOT NULL DEFAULT '',
+    Meet TEXT NOT NULL DEFAULT '',
+    Session TEXT NOT NULL DEFAULT '',
+    Level TEXT NOT NULL DEFAULT '',
+    Division TEXT NOT NULL DEFAULT '',
+    Meet_Rank TEXT NOT NULL DEFAULT '',
+    Meet_Rank_Total TEXT NOT NULL DEFAULT '',
+    athlete_key TEXT NOT NULL,
+    meet_key TEXT NOT NULL,
+    date_key TEXT NOT NULL,
+    session_key TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS entries_natural ON entries (dataset, athlete_key, meet_key, date_key, session_key);
+CREATE INDEX IF NOT EXISTS entries_key ON entries (dataset, Gymnast, Meet, Date, Session);
+CREATE INDEX IF NOT EXISTS entries_meet ON entries (dataset, meet_key, session_key);
+
+CREATE TABLE IF NOT EXISTS scores (
+    entry_id INTEGER NOT NULL REFERENCES entries (id) ON DELETE CASCADE,
+    dataset TEXT NOT NULL,
+    meet_key TEXT NOT NULL,
+    session_key TEXT NOT NULL,
+    Level TEXT NOT NULL,
+    Event TEXT NOT NULL,
+    Score REAL,
+    Rank TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (entry_id, Event)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scores_session ON scores (dataset, meet_key, session_key, Level, Event, Score);
+
+CREATE TABLE IF NOT EXISTS imported (dataset TEXT PRIMARY KEY)
+"""
+
+def connect(path=DB_FILE):
+    """Opens (and if needed creates) the database. WAL lets readers carry on while a writer commits."""
+    con = sqlite3.connect(path, timeout=30, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA foreign_keys=ON")
+    if con.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _migrate(con)
+    return con
+
+def _migrate(con):
+    """Creates the tables; rows from an older layout are re-inserted (and merged) by natural key"""
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        if con.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            con.execute("COMMIT")  # another process got here first
+            return
+        old = {}
+        if con.execute("SELECT 1 FROM sqlite_master WHERE name = 'entries'").fetchone():
+            for (dataset,) in con.execute("SELECT DISTINCT dataset FROM entries").fetchall():
+                if dataset in DATASETS:
+                    old[dataset] = _read(con, "e.dataset = ?", [dataset])
+            con.execute("DROP TABLE scores")
+            con.execute("DROP TABLE entries")
+        con.execute("DROP TABLE IF EXISTS imported")
+        for statement in SCHEMA.split(";"):
+            con.execute(statement)
+        for dataset, df in old.items():
+            for record in df.to_dict('records'):
+                _upsert_one(con, dataset, record)
+            con.execute("INSERT INTO imported (dataset) VALUES (?)", (dataset,))
+        con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+def _text(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+def _score(value):
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Float32 scores widen to 53.099998...; 3 decimals gives back the 53.1 the text said
+    return None if pd.isna(score) else round(score, 3)
+
+def _clean(record):
+    """The record's CSV-layout fields, as the store holds them (text, float scores)"""
+    out = {}
+    for col in COLUMNS:
+        if col in record:
+            out[col] = _score(record[col]) if col in EVENTS else _text(record[col])
+    return out
+
+def _stored(con, entry_id):
+    """One stored row back as a record"""
+    values = con.execute(f"SELECT {', '.join(META_COLS)} FROM entries WHERE id = ?", (entry_id,)).fetchone()
+    record = dict(zip(META_COLS, values))
+    for evt, score, rank in con.execute("SELECT Event, Score, Rank FROM scores WHERE entry_id = ?", (entry_id,)):
+        record[evt], record[evt + '_Rank'] = score, rank
+    return record
+
+def _write_scores(con, dataset, entry_id, record, key):
+    con.executemany(
+        "INSERT INTO scores (entry_id, dataset, meet_key, session_key, Level, Event, Score, Rank)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(entry_id, dataset, key[1], key[3], record.get('Level', ''), evt,
+          record.get(evt), record.get(evt + '_Rank', ''))
+         for evt in EVENTS if evt in record or evt + '_Rank' in record],
+    )
+
+def _upsert_one(con, dataset, record):
+    """
+    Resolves the record to its stored row by natural key (see dedup.py) and merges its
+    non-empty fields in, column by column. Returns 'new', 'merged' or 'unchanged'.
+    """
+    record = _clean(record)
+    key = dedup.natural_key(record)
+    candidates = con.execute(
+        "SELECT id, session_key FROM entries WHERE dataset = ? AND athlete_key = ? AND meet_key = ?"
+        " AND date_key = ? ORDER BY id", (dataset, *key[:3])).fetchall()
+    entry_id = dedup.pick_match(candidates, key[3])
+
+    if entry_id is None:
+        row = [record.get(c, '') for c in META_COLS]
+        entry_id = con.execute(
+            f"INSERT INTO entries (dataset, {', '.join(META_COLS)}, athlete_key, meet_key, date_key, session_key)"
+            f" VALUES (?{', ?' * (len(META_COLS) + 4)})", [dataset] + row + list(key)).lastrowid
+        _write_scores(con, dataset, entry_id, record, key)
+        return 'new'
+
+    merged, changed = dedup.merge_fields(_stored(con, entry_id), record)
+    if not changed:
+        return 'unchanged'
+    key = dedup.natural_key(merged)
+    con.execute(f"UPDATE entries SET {', '.join(f'{c} = ?' for c in META_COLS)}, session_key = ? WHERE id = ?",
+                [merged.get(c, '') for c in META_COLS] + [key[3], entry_id])
+    con.execute("DELETE FROM scores WHERE entry_id = ?", (entry_id,))
+    _write_scores(con, dataset, entry_id, merged, key)
+    return 'merged'
+
+def _ensure_imported(con, dataset):
+    """The first write to a dataset pulls in its existing CSV so no history is lost"""
+    if con.execute("SELECT 1 FROM imported WHERE dataset = ?", (dataset,)).fetchone():
+        return
+    csv_path = DATASETS[dataset]
+    if os.path.exists(csv_path):
+        for record in schema.to_text(schema.read_csv(csv_path)).to_dict('records'):
+            _upsert_one(con, dataset, record)
+    con.execute("INSERT INTO imported (dataset) VALUES (?)", (dataset,))
+
+def upsert(records, dataset='cleaned', path=DB_FILE):
+    """
+    Merges records (dicts or a DataFrame in the CSV layout) in one transaction. A record
+    for a gymnast/meet already stored fills in or overwrites that row's non-empty fields.
+    Returns counts of {'new', 'merged', 'unchanged'} records.
+    """
+    if isinstance(records, pd.DataFrame):
+        records = schema.to_text(records).to_dict('records')
+    counts = {'new': 0, 'merged': 0, 'unchanged': 0}
+    con = connect(path)
+    try:
+        # IMMEDIATE takes the write lock up front, so two scrapers queue instead of racing
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            _ensure_imported(con, dataset)
+            for record in records:
+                counts[_upsert_one(con, dataset, record)] += 1
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+    return counts
+
+def replace(records, dataset='cleaned', path=DB_FILE):
+    """Swaps the whole dataset for `records` in one transaction (for full-table fix-up passes)"""
+    if isinstance(records, pd.DataFrame):
+        records = schema.to_text(records).to_dict('records')
+    con = connect(path)
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.execute("DELETE FROM entries WHERE dataset = ?", (dataset,))
+            con.execute("INSERT OR IGNORE INTO imported (dataset) VALUES (?)", (dataset,))
+            for record in records:
+                _upsert_one(con, dataset, record)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+
+def _read(con, where, params):
+    """Stored rows matching `where` (on entries e) in the CSV layout, in insertion order"""
+    # Two narrow reads instead of a join, so entry text isn't repeated once per event
+    entries = pd.read_sql_query(f"SELECT e.id, {', '.join('e.' + c for c in META_COLS)}"
+                                f" FROM entries e WHERE {where} ORDER BY e.id", con, params=params)
+    scored = pd.read_sql_query(f"SELECT s.entry_id, s.Event, s.Score, s.Rank FROM scores s"
+                               f" JOIN entries e ON e.id = s.entry_id WHERE {where}", con, params=params)
+
+    # Drop every score straight into its (row, event) slot
+    ids = entries['id'].to_numpy()
+    row = np.searchsorted(ids, scored['entry_id'].to_numpy())
+    col = scored['Event'].map({e: i for i, e in enumerate(EVENTS)}).to_numpy()
+    score_grid = np.full((len(ids), len(EVENTS)), np.nan)
+    rank_grid = np.full((len(ids), len(EVENTS)), "", dtype=object)
+    score_grid[row, col] = scored['Score'].to_numpy(dtype=float, na_value=np.nan)
+    rank_grid[row, col] = scored['Rank'].to_numpy()
+
+    out = entries[META_COLS].copy()
+    for i, evt in enumerate(EVENTS):
+        out[evt] = score_grid[:, i]
+        out[evt + '_Rank'] = rank_grid[:, i]
+    return out[COLUMNS]
+
+def load(dataset='cleaned', gymnast=None, meet=None, path=DB_FILE):
+    """
+    The dataset as a DataFrame in the CSV layout and schema.py dtypes, optionally narrowed to one gymnast and/or meet (any spelling). Rows come back in insertion order.
+    """
+    where, params = ["e.dataset = ?"], [dataset]
+    if gymnast is not None:
+        where.append("e.athlete_key = ?")
+        params.append(dedup.canonical_athlete(gymnast))
+    if meet is not None:
+        where.append("e.meet_key = ?")
+        params.append(dedup.canonical_meet(meet))
+    con = connect(path)
+    try:
+        return schema.enforce(_read(con, ' AND '.join(where), params))
+    finally:
+        con.close()
+
+def session_scores(meet, session=None, level=None, event=None, dataset='cleaned', path=DB_FILE):
+    """
+    Long-form stored scores for one meet (optionally one session/level/event), best first.
+    Served from the (Meet, Session, Level, Event) index; meet/session match any spelling.
+    The 0.0 placeholder for an event not competed is left out.
+    """
+    where, params = ["s.dataset = ?", "s.meet_key = ?", "s.Score > 0"], [dataset, dedup.canonical_meet(meet)]
+    for col, value in (('session_key', session and dedup.canonical_session(session)),
+                       ('Level', level), ('Event', event)):
+        if value is not None:
+            where.append(f"s.{col} = ?")
+            params.append(value)
+    con = connect(path)
+    try:
+        return schema.enforce(pd.read_sql_query(
+            "SELECT e.Meet, e.Session, s.Level, e.Division, e.Gymnast, e.Date, s.Event, s.Score, s.Rank"
+            " FROM scores s JOIN entries e ON e.id = s.entry_id"
+            f" WHERE {' AND '.join(where)} ORDER BY s.session_key, s.Level, s.Event, s.Score DESC",
+            con, params=params))
+    finally:
+        con.close()
+
+def gymnast_history(gymnast, dataset='cleaned', path=DB_FILE):
+    """Every stored meet for one gymnast, oldest first"""
+    return load(dataset, gymnast=gymnast, path=path).sort_values('Date', kind='stable').reset_index(drop=True)
+
+def import_csv(dataset, path=DB_FILE):
+    """Loads (or re-loads) the dataset's CSV into the database"""
+    con = connect(path)
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        con.execute("DELETE FROM imported WHERE dataset = ?", (dataset,))
+        _ensure_imported(con, dataset)
+        con.execute("COMMIT")
+        return con.execute("SELECT COUNT(*) FROM entries WHERE dataset = ?", (dataset,)).fetchone()[0]
+    finally:
+        con.close()
+
+def publish(dataset='cleaned', path=DB_FILE):
+    """Rewrites the dataset's CSV (and Parquet copy, if imported) from the database"""
+    df = load(dataset, path=path)
+    schema.write_csv(df, DATASETS[dataset])
+    if columnar_store.exists(dataset):
+        columnar_store.save(df, dataset)
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description="Move the result CSVs into/out of the SQLite store")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("datasets", nargs="*", default=list(DATASETS), help=f"any of {', '.join(DATASETS)}")
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        if args.action == "import":
+            if not os.path.exists(DATASETS[name]):
+                print(f"⚠️ {DATASETS[name]} not found. Skipping.")
+                continue
+            print(f"🗄️ {name}: {import_csv(name)} rows in {DB_FILE}.")
+        else:
+            print(f"📄 {name}: wrote {len(publish(name))} rows to {DATASETS[name]}.")
+
+if __name__ == "__main__":
+    main()
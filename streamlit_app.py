@@ -2,7 +2,7 @@ from analytics_view import show_athlete_history
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import os
+import dashboard_data
 
 # 1. Page Configuration
 st.set_page_config(page_title="SheehyAllAround", layout="centered", page_icon="🤸")
@@ -18,42 +18,11 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # 3. Robust Data Loading
-@st.cache_data
 def load_data():
-    file_path = "cleaned_gymnastics.csv"
-    if not os.path.exists(file_path):
-        return None
-
+    # Parsed once per version of the file and shared by every session (see dashboard_data.py);
+    # a pipeline run that rewrites the CSV shows up on the next rerun
     try:
-        df = pd.read_csv(file_path)
-        
-        # --- CLEANING STEP 1: Standardize Column Names ---
-        df.columns = df.columns.str.strip() # Remove hidden spaces
-        
-        # Map ALL possible variations to the standard short codes
-        rename_map = {
-            'Vault': 'VT', 'Bars': 'UB', 'Beam': 'BB', 'Floor': 'FX',
-            'Pommel': 'PH', 'Rings': 'SR', 'PBar': 'PB', 'PBars': 'PB', 'HighBar': 'HB', 'HiBar': 'HB',
-            'All Around': 'AA', 'Total': 'AA', 'Score': 'AA',
-            'Meet Ranking': 'Meet_Rank', 'Rank': 'Meet_Rank'
-        }
-        df.rename(columns=rename_map, inplace=True)
-
-        # --- CLEANING STEP 2: Force Numbers ---
-        # List of columns that MUST be numbers
-        score_cols = ['VT', 'UB', 'BB', 'FX', 'PH', 'SR', 'PB', 'HB', 'AA']
-        
-        for col in score_cols:
-            if col in df.columns:
-                # Coerce errors: turns "9.500 (1)" or "text" into NaN, but keeps "9.5"
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # --- CLEANING STEP 3: Handle Dates ---
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df = df.sort_values(by='Date')
-
-        return df
+        return dashboard_data.load('cleaned')
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -62,31 +31,40 @@ df = load_data()
 
 # 4. Main Dashboard UI
 st.title("🏆 Sheehy All-Around")
+st.caption(dashboard_data.refreshed_caption('cleaned'))
 
 if df is None:
     st.warning("⚠️ No data file found (`cleaned_gymnastics.csv`). Please run the scraper first.")
     st.stop()
 
-# TABS
-tab1, tab2, tab3 = st.tabs(["Annabelle", "Azalea", "Ansel"])
+@st.cache_resource(max_entries=32, show_spinner=False)
+def trend_chart(name, color, dates, scores):
+    """The season AA line, cached on the points it plots (shared: never update it in place)"""
+    chart_data = pd.DataFrame({'Date': dates, 'AA': scores})
+    return px.line(chart_data, x='Date', y='AA', markers=True, 
+                   title=f"{name}'s All-Around Score Trend",
+                   color_discrete_sequence=[color])
 
 def show_gymnast_tab(name, color, events, header_class):
     st.markdown(f'<p class="{header_class}">{name}</p>', unsafe_allow_html=True)
     
     # --- NEW NAVIGATION LOGIC ---
     # This adds a toggle at the top of every tab
-    show_context = st.checkbox(f"🔍 Show Judge Context & Meet History for {name}", key=f"ctx_{name}")
+    # persist_state: kept while the tab is closed and not drawn (see the tabs below)
+    show_context = st.checkbox(f"🔍 Show Judge Context & Meet History for {name}", key=f"ctx_{name}", persist_state="page")
     
     if show_context:
         # If the box is checked, show the NEW Analytics View
         show_athlete_history(name)
     else:
         # If the box is NOT checked, show your ORIGINAL Dashboard
-        subset = df[df['Gymnast'].astype(str).str.contains(name, case=False, na=False)].copy()
+        # Precomputed at load time: this athlete's rows and latest meet (see dashboard_data.py)
+        view = dashboard_data.athlete(name)
         
-        if not subset.empty:
+        if view is not None:
+            subset = view.rows
             # Get the Most Recent Meet
-            latest = subset.iloc[-1]
+            latest = view.latest
             
             # --- TOP ROW: Context ---
             m1, m2 = st.columns([2, 1])
@@ -115,27 +93,29 @@ def show_gymnast_tab(name, color, events, header_class):
             st.subheader("📈 Season Progress")
             chart_data = subset.dropna(subset=['AA'])
             if not chart_data.empty:
-                fig = px.line(chart_data, x='Date', y='AA', markers=True, 
-                              title=f"{name}'s All-Around Score Trend",
-                              color_discrete_sequence=[color])
-                st.plotly_chart(fig, use_container_width=True)
+                fig = trend_chart(name, color, tuple(chart_data['Date']), tuple(chart_data['AA']))
+                st.plotly_chart(fig, width='stretch')
             
             with st.expander(f"🔍 Inspect Raw Data for {name}"):
                 st.dataframe(subset)
         else:
             st.info(f"No data found for {name}.")
             
-# --- ANNABELLE (Pink) ---
-with tab1:
-    events_girls = {'VT': '🏃‍♀️', 'UB': '⚖️', 'BB': '🪵', 'FX': '🤸‍♀️'}
-    show_gymnast_tab("Annabelle", "#FF69B4", events_girls, "annabelle-header")
-
-# --- AZALEA (Purple) ---
-with tab2:
-    events_girls = {'VT': '🏃‍♀️', 'UB': '⚖️', 'BB': '🪵', 'FX': '🤸‍♀️'}
-    show_gymnast_tab("Azalea", "#9370DB", events_girls, "azalea-header")
+# --- TABS ---
+# name, colour, events, header class (Annabelle pink, Azalea purple, Ansel teal)
+events_girls = {'VT': '🏃‍♀️', 'UB': '⚖️', 'BB': '🪵', 'FX': '🤸‍♀️'}
+events_boys = {'FX': '🤸‍♂️', 'PH': '🐎', 'SR': '⭕', 'VT': '🏃‍♂️', 'PB': '⏸️', 'HB': '💈'}
+GYMNASTS = [
+    ("Annabelle", "#FF69B4", events_girls, "annabelle-header"),
+    ("Azalea", "#9370DB", events_girls, "azalea-header"),
+    ("Ansel", "#008080", events_boys, "ansel-header"),
+]
 
-# --- ANSEL (Teal) ---
-with tab3:
-    events_boys = {'FX': '🤸‍♂️', 'PH': '🐎', 'SR': '⭕', 'VT': '🏃‍♂️', 'PB': '⏸️', 'HB': '💈'}
-    show_gymnast_tab("Ansel", "#008080", events_boys, "ansel-header")
+# Only the open tab is drawn: the tabs report which one is selected, so a hidden
+# gymnast's metrics and charts aren't built on every interaction. Switching back is
+# cheap because their rows, views and figures all come out of the caches above.
+tabs = st.tabs([name for name, *_ in GYMNASTS], key="gymnast_tab", on_change="rerun")
+for tab, (name, color, events, header_class) in zip(tabs, GYMNASTS):
+    if tab.open:
+        with tab:
+            show_gymnast_tab(name, color, events, header_class)
@@ -0,0 +1,232 @@
+# synthetic_season.py
+
+import os
+import json
+import hashlib
+import argparse
+from html import escape
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+import schema
+import event_names
+
+# Fake but realistic seasons at any scale, for bench_season.py and fixture_server.py.
+# A season is a list of sessions, each one level's field with MSO-like scores: 0.05
+# steps (so ties happen), ~3% scratches (0.0) and ~4% falls (a point or two off).
+# Meets alternate men's and women's with SESSIONS_PER_MEET sessions each, and the three
+# kids compete in their discipline's first sessions, so every stage downstream (page
+# parsing, harvesters, session analytics, the dashboard) has their rows to work on.
+ATHLETES = 40
+SESSIONS_PER_MEET = 4
+SCRATCH_RATE = 0.03
+FALL_RATE = 0.04
+SEASON_START = date(2026, 1, 3)
+SEASON_DAYS = 110
+# Ids for synthetic meets, clear of the real MSO ones
+SYNTHETIC_MEET_BASE = 90000
+
+EVENTS = {'Men': event_names.MEN_EVENTS, 'Women': event_names.WOMEN_EVENTS}
+LABELS = {'FX': 'Floor', 'PH': 'Pommel Horse', 'SR': 'Rings', 'VT': 'Vault', 'PB': 'Parallel Bars',
+          'HB': 'High Bar', 'UB': 'Bars', 'BB': 'Beam'}
+EVENT_TYPES = {'Men': 'ARTM', 'Women': 'ARTW'}
+KIDS = {'Men': ["Ansel Sheehy"], 'Women': ["Annabelle Sheehy", "Azalea Sheehy"]}
+ALL_KIDS = KIDS['Men'] + KIDS['Women']
+LEVELS = {'Men': ['4D1', '5D1', '6D2', '7D1'], 'Women': ['3', '4', '5', '6']}
+DIVISIONS = {'Men': ['8-9 Yrs', '10 yrs', '11-12 Yrs'], 'Women': ['Younger', 'Older', 'Sr B']}
+FIRST_NAMES = ("Liam", "Noah", "Mateo", "Kai", "Ezra", "Leo", "Owen", "Milo", "Ava", "Mia", "Zoe", "Ivy", "Nora", "Luna", "Elle", "Maya")
+LAST_NAMES = ("Nguyen", "Garcia", "Kim", "Patel", "Lopez", "Chen", "Silva", "Park", "Reyes", "Tanaka", "Moore", "Shah")
+CLUBS = ("Bay Flyers", "Golden Bear", "Airborne", "Coastal", "Summit", "Redwood")
+
+def seeded(*key):
+    """A numpy Generator that's the same for the same key on every run"""
+    return np.random.default_rng(int.from_bytes(hashlib.sha256(repr(key).encode()).digest()[:8], 'little'))
+
+def meet_info(meet_id):
+    """(name, date) for a synthetic meet"""
+    day = SEASON_START + timedelta(days=int(seeded('meet', meet_id).integers(SEASON_DAYS)))
+    return f"Synthetic Invitational {meet_id}", day
+
+def _ordinal(n):
+    return f"{n}{'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+def _places(scores, groups):
+    """MSO places as text: 1 is best within each group, equal scores share a place and get a T"""
+    frame = pd.DataFrame({'Score': np.asarray(scores), 'Group': np.asarray(groups)})
+    place = frame.groupby('Group')['Score'].rank(method='min', ascending=False).astype(int).astype(str)
+    return place + np.where(frame.duplicated(['Group', 'Score'], keep=False), 'T', '')
+
+def session_field(rng, athletes, discipline, level):
+    """One session's athletes in the results CSV layout, plus Team (Date/Meet/Session are the caller's)"""
+    codes = EVENTS[discipline]
+    n = max(athletes, 1)
+    skill = rng.normal(8.6, 0.45, n)
+    scores = np.clip(skill[:, None] + rng.normal(0, 0.3, (n, len(codes))), 5.0, 9.95)
+    scores -= np.where(rng.random(scores.shape) < FALL_RATE, rng.uniform(1.0, 2.0, scores.shape), 0.0)
+    scores = np.round(scores * 20) / 20
+    scratched = rng.random(scores.shape) < SCRATCH_RATE
+    scores[scratched] = 0.0
+
+    field = pd.DataFrame({
+        'Gymnast': [f"{f} {l}" for f, l in zip(rng.choice(FIRST_NAMES, n), rng.choice(LAST_NAMES, n))],
+        'Team': rng.choice(CLUBS, n),
+        'Level': level,
+        'Division': rng.choice(DIVISIONS[discipline], n),
+    })
+    for evt in schema.EVENTS:
+        field[evt], field[evt + '_Rank'] = 0.0, '0'
+    for i, code in enumerate(codes):
+        field[code] = scores[:, i]
+        field[code + '_Rank'] = _places(scores[:, i], field['Division']).where(~scratched[:, i], '')
+    field['AA'] = scores.sum(axis=1).round(3)
+    field['AA_Rank'] = _places(field['AA'], field['Division'])
+    field['Meet_Rank'] = field['AA'].rank(method='min', ascending=False).astype(int).astype(str)
+    field['Meet_Rank_Total'] = n
+    return field
+
+def synthetic_session(meet_id, index, discipline, athletes, rng):
+    """One session: {meet_id, meet, date, session, level, discipline, field}"""
+    name, day = meet_info(meet_id)
+    level = LEVELS[discipline][index % len(LEVELS[discipline])]
+    return {'meet_id': str(meet_id), 'meet': name, 'date': day, 'session': f"{index + 1:02d}",
+            'level': level, 'discipline': discipline, 'field': session_field(rng, athletes, discipline, level)}
+
+def build_season(sessions, athletes=ATHLETES, seed=0):
+    """
+    `sessions` sessions, field sizes around `athletes` (half to one and a half times).
+    Ansel competes in the first session of every men's meet, Annabelle and Azalea in
+    the first two of every women's meet.
+    """
+    rng = np.random.default_rng(seed)
+    season = []
+    for i in range(sessions):
+        meet_no, index = divmod(i, SESSIONS_PER_MEET)
+        discipline = 'Men' if meet_no % 2 == 0 else 'Women'
+        size = int(rng.integers(max(athletes // 2, 1), athletes * 3 // 2 + 1))
+        session = synthetic_session(SYNTHETIC_MEET_BASE + meet_no, index, discipline, size, rng)
+        if index < len(KIDS[discipline]):
+            session['field'].loc[0, 'Gymnast'] = KIDS[discipline][index]
+        season.append(session)
+    return season
+
+def _with_session(session):
+    field = session['field'].drop(columns='Team')
+    field.insert(0, 'Date', session['date'].isoformat())
+    field.insert(2, 'Meet', session['meet'])
+    field.insert(3, 'Session', session['session'])
+    return field[schema.COLUMNS]
+
+def raw_frame(season):
+    """Every athlete of every session, as session_raw_data.csv holds them"""
+    return pd.concat([_with_session(s) for s in season], ignore_index=True)
+
+def cleaned_frame(season):
+    """The kids' rows, as cleaned_gymnastics.csv holds them (short names)"""
+    rows = [_with_session(s).iloc[[0]] for s in season if s['field'].loc[0, 'Gymnast'] in ALL_KIDS]
+    if not rows:
+        return pd.DataFrame(columns=schema.COLUMNS)
+    kids = pd.concat(rows, ignore_index=True)
+    kids['Gymnast'] = kids['Gymnast'].str.split().str[0]
+    return kids
+
+def _cell(score, rank):
+    return f"{score:.3f} {rank}" if score else ""
+
+def results_page(session, gymnast, athlete_table=True):
+    """
+    An MSO results page as saved from `gymnast`'s view: title, the embedded wbt.MeetInfo
+    JSON, the labelled <li> items and Meet Ranking badge, the athlete's score table
+    (unless athlete_table is False, as on a saved session page) and the session table.
+    """
+    field, codes, day = session['field'], EVENTS[session['discipline']], session['date']
+    me = field[field['Gymnast'] == gymnast].iloc[0]
+    meet_json = {'meetid': session['meet_id'], 'MeetName': session['meet'], 'EventType': EVENT_TYPES[session['discipline']],
+                 'meetfromdate': day.strftime('%m/%d/%Y'), 'meettodate': day.strftime('%m/%d/%Y'),
+                 'StatusText': 'Meet Complete'}
+    groups = field.groupby('Division').size()
+    session_json = {'result': {'row': [{'session': session['session'], 'level': session['level'], 'div': div, 'total': str(total)}
+                                       for div, total in groups.items()]}}
+    meet_rank = int(me['Meet_Rank'])
+
+    out = [f"<html><head><title>{escape(gymnast)} - {escape(session['meet'])}, CA {day.strftime('%m/%d/%Y')} - Gymnastic Results</title>",
+           f"<script>wbt.MeetInfo.Meet={json.dumps(meet_json)};</script>",
+           f"<script>wbt.MeetInfo.Session={json.dumps(session_json)};</script></head><body>",
+           "<ul>",
+           f'<li><span class="title">Level: </span>{session["level"]}</li>',
+           f'<li><span class="title">Session: </span>{session["session"]}</li>',
+           f'<li><span class="title">Division: </span>{escape(me["Division"])}</li>',
+           f'<li class="text-center">Meet Ranking <span class="bold fs-2">{meet_rank}<sup>{_ordinal(meet_rank)[-2:]}</sup></span>'
+           f'<br><i>Out of {len(field)} in level {session["level"]}</i></li>',
+           "</ul>"]
+    if athlete_table:
+        out.append('<table class="table table-striped table-condensed">')
+        for code in codes + (event_names.ALL_AROUND,):
+            if me[code]:
+                label = LABELS.get(code, "All Around")
+                out.append(f'<tr><th>{label}</th><td><span class="score">{me[code]:.3f}</span>'
+                           f'<span class="place float-end">{me[code + "_Rank"]}</span></td></tr>')
+        out.append("</table>")
+
+    out.append('<table class="table session-results"><tr><th>Gymnast</th><th>Team</th>'
+               + "".join(f"<th>{code}</th>" for code in codes) + "<th>AA</th></tr>")
+    for i, row in enumerate(field.itertuples(index=False)):
+        row = row._asdict()
+        cells = "".join(f"<td>{_cell(row[c], row[c + '_Rank'])}</td>" for c in codes)
+        out.append(f'<tr data-gymnastid="{1_000_000 + i}"><td>{escape(row["Gymnast"])}</td><td>{row["Team"]}</td>'
+                   f'{cells}<td>{_cell(row["AA"], row["AA_Rank"])}</td></tr>')
+    out.append("</table></body></html>")
+    return "\n".join(out).encode('utf-8')
+
+def mms_page(session):
+    """A MyMeetScores session page: one results table of "9.100 3" cells under the long event names"""
+    field, codes = session['field'], EVENTS[session['discipline']]
+    out = [f"<html><head><title>MyMeetScores - {escape(session['meet'])} Session {escape(session['session'])}</title></head><body>",
+           "<table><tr><th>Gymnast</th><th>Team</th>" + "".join(f"<th>{LABELS[c]}</th>" for c in codes) + "<th>AA</th></tr>"]
+    for row in field.itertuples(index=False):
+        row = row._asdict()
+        cells = "".join(f"<td>{_cell(row[c], row[c + '_Rank'])}</td>" for c in codes)
+        out.append(f"<tr><td>{escape(row['Gymnast'])}</td><td>{row['Team']}</td>{cells}<td>{_cell(row['AA'], row['AA_Rank'])}</td></tr>")
+    out.append("</table></body></html>")
+    return "\n".join(out).encode('utf-8')
+
+def season_pages(season):
+    """[(file name, page)] the way they get saved: each kid's results page plus their session page"""
+    pages = []
+    for session in season:
+        kid = session['field'].loc[0, 'Gymnast']
+        if kid not in ALL_KIDS:
+            continue
+        day = session['date'].strftime('%m_%d_%Y')
+        pages.append((f"{kid} - {session['meet']}, CA {day} - Gymnastic Results.html", results_page(session, kid)))
+        pages.append((f"{kid.split()[0]}_{session['meet']} {session['session']}_session.html",
+                      results_page(session, kid, athlete_table=False)))
+    return pages
+
+def write_season(folder, sessions, athletes=ATHLETES, seed=0, html_folder="ansel_history"):
+    """Writes session_raw_data.csv, cleaned_gymnastics.csv and the saved pages into `folder`. Returns a summary."""
+    season = build_season(sessions, athletes, seed)
+    os.makedirs(os.path.join(folder, html_folder), exist_ok=True)
+    raw, cleaned = raw_frame(season), cleaned_frame(season)
+    raw.to_csv(os.path.join(folder, "session_raw_data.csv"), index=False)
+    cleaned.to_csv(os.path.join(folder, "cleaned_gymnastics.csv"), index=False)
+    pages = season_pages(season)
+    for name, page in pages:
+        with open(os.path.join(folder, html_folder, name), 'wb') as f:
+            f.write(page)
+    return {'sessions': len(season), 'raw_rows': len(raw), 'kid_rows': len(cleaned), 'pages': len(pages),
+            'page_bytes': sum(len(p) for _, p in pages)}
+
+def main():
+    ap = argparse.ArgumentParser(description="Writes a synthetic season (CSVs + saved MSO pages) to a folder")
+    ap.add_argument("folder")
+    ap.add_argument("--sessions", type=int, default=100)
+    ap.add_argument("--athletes", type=int, default=ATHLETES, help="Typical field size per session")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    summary = write_season(args.folder, args.sessions, args.athletes, args.seed)
+    print(f"🧪 {summary['sessions']} sessions, {summary['raw_rows']:,} athlete rows, {summary['kid_rows']} kid rows, "
+          f"{summary['pages']} pages ({summary['page_bytes'] / 1024:,.0f} KB) in {args.folder}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# test_session_context_analytics.py
+
+import numpy as np
+import pandas as pd
+import schema
+import analytics_view
+from session_context_analytics import clean_session_data, build_context
+
+MEET = "2026 Test Invitational"
+
+def raw_frame(rows):
+    """(session, gymnast, division, FX) tuples as schema.read_csv would hand them over"""
+    df = pd.DataFrame([{'Date': "2026-01-17", 'Gymnast': gymnast, 'Meet': MEET, 'Session': session,
+                        'Level': "4D1", 'Division': division, 'FX': fx}
+                       for session, gymnast, division, fx in rows])
+    for col in schema.COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+    return schema.enforce(df[schema.COLUMNS])
+
+def test_single_athlete_session():
+    # Ansel is alone in session 1; session 2 gives the level a season baseline
+    df = raw_frame([("1", "Ansel Sheehy", "9 yrs", 9.0),
+                    ("2", "Liam Kim", "10 yrs", 8.6),
+                    ("2", "Noah Park", "10 yrs", 8.9),
+                    ("2", "Kai Chen", "10 yrs", 9.3)])
+    results, _ = build_context(*clean_session_data(df))
+
+    row = results[results['Event'] == 'FX'].iloc[0]
+    assert row['Session_Count'] == 1
+    # No one else to compare against: no leave-one-out median, percentile or JSI
+    assert np.isnan(row['Session_Median'])
+    assert np.isnan(row['Division_Median'])
+    assert np.isnan(row['Percentile'])
+    assert np.isnan(row['JSI'])
+
+    # The card and the judge-mood banner show a dash, not "nan%"
+    assert analytics_view.fmt(row['Percentile'], '.0f', '%') == "—"
+    assert analytics_view.fmt(results['JSI'].mean(), '.2f') == "—"
+    assert analytics_view.fmt(62.4, '.0f', '%') == "62%"
@@ -0,0 +1,29 @@
+# test_sqlite_store.py
+
+import schema
+import sqlite_store
+
+CSV = """Date,Gymnast,Meet,Session,Level,Division,Meet_Rank,Meet_Rank_Total,VT,VT_Rank,UB,UB_Rank,BB,BB_Rank,FX,FX_Rank,PH,PH_Rank,SR,SR_Rank,PB,PB_Rank,HB,HB_Rank,AA,AA_Rank
+2026-02-13,Ansel,2026 Mas Watanabe,4,4D1,9 yrs,36,152,9.3,1T,,,,,8.5,5,8.8,4T,8.6,7T,7.4,12T,8.8,4,53.1,3
+2026-01-22,Annabelle,2026 Rose Gold Classic,G02,3,Sr B,2,61,9.7,1,9.55,1,9.325,3,9.425,2,0.0,0,0.0,0,0.0,0,0.0,0,37.525,1
+"""
+
+def test_reingesting_the_same_csv_changes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / sqlite_store.DATASETS['cleaned']).write_text(CSV)
+    db = str(tmp_path / "test.db")
+
+    # The first write imports the CSV; the same rows on top of it are no news
+    counts = sqlite_store.upsert(schema.read_csv(sqlite_store.DATASETS['cleaned']), path=db)
+    assert counts == {'new': 0, 'merged': 0, 'unchanged': 2}
+    counts = sqlite_store.upsert(schema.read_csv(sqlite_store.DATASETS['cleaned']), path=db)
+    assert counts == {'new': 0, 'merged': 0, 'unchanged': 2}
+
+    # Scores are stored as the text wrote them, not widened from Float32
+    stored = sqlite_store.session_scores("2026 Mas Watanabe", event='AA', path=db)
+    assert stored['Score'].astype('float64').round(3).tolist() == [53.1]
+    con = sqlite_store.connect(db)
+    try:
+        assert con.execute("SELECT Score FROM scores WHERE Event = 'AA' ORDER BY Score").fetchall() == [(37.525,), (53.1,)]
+    finally:
+        con.close()